@@ -0,0 +1,219 @@
+'''
+Двоичный архив задач судоку (.sdb) с доступом к задаче по номеру без чтения остальных.
+Значения ячеек записываются цифрами одного числа по основанию size + 1
+(для 9x9 - 34 байта на задачу, примерно 3.3 бита на ячейку).
+Формат (числа little-endian):
+    заголовок: "SUDA", версия (1 байт), размер квадрата n (1 байт), резерв (2 байта),
+               число задач (8 байт), смещение индекса (8 байт);
+    записи:    флаги (1 байт, бит 0 - есть решение), задача, решение (если есть),
+               длина пометки (1 байт) и пометка в UTF-8 (например, сложность);
+    индекс:    смещения записей по 8 байт.
+convert переводит задачи между архивом, файлами задач по одной в строке и каталогами .sud
+(в текстовые форматы решения не переносятся); дополнительные ограничения задач (строка variant файла .sud)
+сохраняются только в файлах .sud, задачи с ними в архив и файл по строкам не записываются.
+'''
+import mmap
+import struct
+from collections import namedtuple
+from pathlib import Path
+
+from sudoku_core import Board, Sudoku, SOLVERS, F_EXT, A_EXT, SIZES, SYMBOLS
+from sudoku_io import iter_records
+
+MAGIC = b'SUDA'
+VERSION = 1
+HEADER = struct.Struct('<4sBBHQQ')
+OFFSET = struct.Struct('<Q')
+HAS_SOLUTION = 1
+
+# размер квадрата -> байт на задачу
+PACKED = {n: (((n * n + 1) ** (n ** 4) - 1).bit_length() + 7) // 8 for n in SIZES}
+
+Record = namedtuple('Record', 'puzzle solution meta variant', defaults=('',)) # variant - ограничения задачи .sud
+
+def pack(line, n = 3):
+    # строка задачи -> байты: значения ячеек - цифры числа по основанию size + 1
+    digits = line.replace('.', '0')
+    value = int(digits) if n == 3 else int(digits, n * n + 1)
+    return value.to_bytes(PACKED[n], 'big')
+
+def unpack(data, n = 3):
+    # байты -> строка задачи, пустые ячейки - '0'
+    value = int.from_bytes(data, 'big')
+    if n == 3:
+        return str(value).zfill(81)
+    base = n * n + 1
+    digits = []
+    for _ in range(n ** 4):
+        value, digit = divmod(value, base)
+        digits.append(SYMBOLS[digit])
+    return ''.join(reversed(digits))
+
+class ArchiveWriter():
+    ''' запись архива: add добавляет задачу, close дописывает индекс и заголовок '''
+
+    def __init__(self, filename, n = 3):
+        self.n = n
+        self.cells = n ** 4
+        self.file = open(filename, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, n, 0, 0, 0))
+        self.position = HEADER.size
+        self.offsets = []
+
+    def add(self, puzzle, solution = None, meta = ''):
+        if len(puzzle) != self.cells or (solution and len(solution) != self.cells):
+            raise ValueError(f"задача не для поля {self.n * self.n}x{self.n * self.n}")
+        # пометка ограничена 255 байтами; обрезается по границе символа, чтобы запись читалась без ошибки декодирования
+        meta = meta.encode('utf-8')[:255].decode('utf-8', 'ignore').encode('utf-8')
+        record = (bytes([HAS_SOLUTION if solution else 0]) + pack(puzzle, self.n)
+                    + (pack(solution, self.n) if solution else b'') + bytes([len(meta)]) + meta)
+        self.offsets.append(self.position)
+        self.file.write(record)
+        self.position += len(record)
+
+    def close(self):
+        if self.file is None:
+            return
+        self.file.write(struct.pack(f'<{len(self.offsets)}Q', *self.offsets))
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.n, 0, len(self.offsets), self.position))
+        self.file.close()
+        self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class PuzzleArchive():
+    ''' чтение архива через mmap: archive[number] - запись Record(задача, решение или None, пометка),
+        len(archive) - число задач; ValueError - если файл не архив, обрезан или запись повреждена '''
+
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, n, _, self.count, self.index = HEADER.unpack_from(self.data)
+        except (ValueError, struct.error):
+            self.file.close()
+            raise ValueError("файл не является архивом задач")
+        if magic != MAGIC or version != VERSION or n not in SIZES:
+            self.close()
+            raise ValueError("файл не является архивом задач или версия не поддерживается")
+        if not HEADER.size <= self.index <= len(self.data) - self.count * OFFSET.size:
+            self.close()
+            raise ValueError("архив поврежден: индекс за концом файла")
+        self.n = n
+        self.size = PACKED[n]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, number):
+        if not 0 <= number < self.count:
+            raise IndexError(number)
+        data, size, end = self.data, self.size, self.index # записи лежат между заголовком и индексом
+        offset, = OFFSET.unpack_from(data, self.index + number * OFFSET.size)
+        if not HEADER.size <= offset < end or offset + 2 + size * (1 + (data[offset] & HAS_SOLUTION)) > end:
+            raise ValueError(f"архив поврежден: запись {number + 1} за пределами данных")
+        flags = data[offset]
+        position = offset + 1
+        puzzle = unpack(data[position:position + size], self.n)
+        position += size
+        solution = None
+        if flags & HAS_SOLUTION:
+            solution = unpack(data[position:position + size], self.n)
+            position += size
+        length = data[position]
+        if position + 1 + length > end or len(puzzle) != self.n ** 4 or solution and len(solution) != self.n ** 4:
+            raise ValueError(f"архив поврежден: запись {number + 1}")
+        return Record(puzzle, solution, data[position + 1:position + 1 + length].decode('utf-8'))
+
+    def __iter__(self):
+        for number in range(self.count):
+            yield self[number]
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def read_records(path, errors):
+    # генератор (источник, Record) из архива, каталога с файлами .sud, файла .sud или файла задач по строкам
+    path = Path(path)
+    if path.suffix == f".{A_EXT}":
+        try:
+            with PuzzleArchive(path) as archive:
+                for number, record in enumerate(archive, 1):
+                    yield f"{path}#{number}", record
+        except (OSError, ValueError) as error:
+            errors.write(f"{path}: {error}\n")
+        return
+    if path.is_dir() or path.suffix == f".{F_EXT}":
+        for filename in sorted(path.rglob(f"*.{F_EXT}")) if path.is_dir() else [path]:
+            sudoku = Sudoku()
+            error_message = sudoku.open(filename)
+            if error_message:
+                errors.write(f"{filename}: {error_message}\n")
+            else:
+                yield str(filename), Record(Sudoku.table_to_line(sudoku.table), None, '', sudoku.variant)
+        return
+    try:
+        for number, line, meta in iter_records(path):
+            if line is None:
+                errors.write(f"{path}:{number}: неверная строка задачи\n")
+            else:
+                yield f"{path}:{number}", Record(line.upper(), None, meta)
+    except OSError:
+        errors.write(f"{path}: ошибка чтения файла!\n")
+
+def convert(records, target, errors, method = None):
+    # запись записей (источник, Record) в архив .sdb, каталог файлов .sud или файл задач по строкам;
+    # при заданном method недостающие решения находятся этим методом; возвращает число записанных задач
+    target = Path(target)
+    solver = SOLVERS[method]() if method else None
+    count = 0
+    writer = None
+    output = None
+    try:
+        for source, record in records:
+            if record.variant and target.suffix:
+                errors.write(f"{source}: дополнительные ограничения сохраняются только в файлах .{F_EXT}, задача пропущена\n")
+                continue
+            if solver and record.solution is None:
+                board = Board.from_variant(record.puzzle, record.variant)
+                if board is not None and solver.solve(board):
+                    record = record._replace(solution=board.to_line())
+            if target.suffix == f".{A_EXT}":
+                n = round(len(record.puzzle) ** 0.25)
+                if writer is None:
+                    writer = ArchiveWriter(target, n)
+                if n != writer.n:
+                    errors.write(f"{source}: размер поля отличается от первой задачи архива\n")
+                    continue
+                writer.add(record.puzzle, record.solution, record.meta)
+            elif not target.suffix:
+                target.mkdir(parents=True, exist_ok=True)
+                sudoku = Sudoku(n = round(len(record.puzzle) ** 0.25))
+                sudoku.table = Sudoku.table_from_line(record.puzzle)
+                error_message = sudoku.set_variant(record.variant) or sudoku.save(target / f"{count + 1:06d}.{F_EXT}")
+                if error_message:
+                    errors.write(f"{error_message}\n")
+                    break
+            else:
+                if output is None:
+                    output = open(target, 'w', buffering=1 << 20)
+                output.write(f"{record.puzzle}\t{record.meta}\n" if record.meta else f"{record.puzzle}\n")
+            count += 1
+    finally:
+        if writer is not None:
+            writer.close()
+        if output is not None:
+            output.close()
+    return count
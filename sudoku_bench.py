@@ -0,0 +1,409 @@
+'''
+Замеры производительности решателя судоку.
+import - время импорта модулей в свежем процессе интерпретатора
+(за вычетом запуска самого интерпретатора): ядро решателя без интерфейса
+против прежнего модуля вместе с tkinter и PIL.
+solve - решение наборов задач из каталога benchmarks (easy, hard, 17clue)
+каждым методом: время по задачам и в сумме, число узлов поиска (Sudoku.counter),
+пиковая и оставшаяся после решения память по tracemalloc.
+Результаты пишутся в JSON и сравниваются с сохраненной базой: рост времени
+больше допуска или любой рост числа узлов считается регрессией.
+Там же - скорость оценки сложности (sudoku_grader.py) в задачах в секунду и уровни задач наборов.
+tune - каждая стратегия ветвления (BRANCHINGS) с каждым методом поиска по графу на наборах задач
+или файлах: число узлов и время, лучшая стратегия по узлам и по времени.
+Пример: python sudoku_bench.py tune puzzles.txt
+Пример: python sudoku_bench.py solve -o results.json --baseline benchmarks/baseline.json
+io - байт на задачу и скорость загрузки задач из файла по одной в строке,
+из файлов .sud и из архива .sdb (подряд и по случайным номерам).
+Пример: python sudoku_bench.py io puzzles.txt
+gui - нагрузочная проверка холста интерфейса (нужен дисплей): нажатия клавиш и изменения
+размера окна на полях 9x9, 16x16 и 25x25, время одной операции и число элементов холста
+до и после - оно не должно расти.
+load - нагрузочная проверка службы решения (sudoku_server.py): одновременные клиенты по HTTP,
+запросов и задач в секунду, перцентили задержки, число и размер пачек службы.
+Пример: python sudoku_bench.py load -c 16 -r 2000
+'''
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+from sudoku_core import Board, Sudoku, GraphSolver, SOLVERS, BRANCHINGS, F_EXT, A_EXT
+from sudoku_io import read_lines, write_lines
+import sudoku_archive
+from sudoku_grader import Grader
+
+HERE = Path(__file__).resolve().parent
+BENCHMARKS = HERE / 'benchmarks'
+SETS = ['easy', 'hard', '17clue']
+IMPORT_MODULES = ['sudoku_core', 'sudoku', 'sudoku_cli', 'sudoku_gui']
+TOLERANCE = 0.25 # допустимый рост времени относительно базы
+
+def import_time(module, repeat = 10):
+    # медиана времени импорта модуля в милисекундах
+    code = ("import time; start = time.perf_counter(); import {}; "
+            "print((time.perf_counter() - start) * 1000)").format(module)
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', code], cwd=HERE, capture_output=True, text=True)
+        if result.returncode:
+            return None
+        times.append(float(result.stdout))
+    return statistics.median(times)
+
+def command_import(args):
+    for module in args.modules:
+        elapsed = import_time(module, args.repeat)
+        if elapsed is None:
+            print(f"{module:12} ошибка импорта")
+        else:
+            print(f"{module:12} {elapsed:8.2f} мс")
+    return 0
+
+def load_set(name):
+    return [line for _, line in read_lines(BENCHMARKS / f"{name}.txt", sys.stderr)]
+
+def measure(solver, line, repeat):
+    # лучшее из repeat время решения (мс), число узлов и память одного решения (байт)
+    best = None
+    for _ in range(repeat):
+        board = Board.from_line(line)
+        start = time.perf_counter_ns()
+        solved = solver.solve(board)
+        elapsed = (time.perf_counter_ns() - start) / 1000000
+        best = elapsed if best is None else min(best, elapsed)
+    board = Board.from_line(line)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    solver.solve(board)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'puzzle': line, 'solved': bool(solved), 'time_ms': best, 'nodes': solver.counter,
+            'peak_bytes': peak, 'retained_bytes': retained}
+
+def run(sets, methods, repeat):
+    results = {}
+    for name in sets:
+        puzzles = load_set(name)
+        for method in methods:
+            solver = SOLVERS[method]()
+            measured = [measure(solver, line, repeat) for line in puzzles]
+            times = [item['time_ms'] for item in measured]
+            results.setdefault(name, {})[method] = {
+                'count': len(measured),
+                'solved': sum(item['solved'] for item in measured),
+                'total_ms': sum(times),
+                'mean_ms': statistics.mean(times),
+                'median_ms': statistics.median(times),
+                'max_ms': max(times),
+                'nodes': sum(item['nodes'] for item in measured),
+                'peak_bytes': max(item['peak_bytes'] for item in measured),
+                'puzzles': measured,
+            }
+    return results
+
+def run_grade(sets, repeat):
+    # скорость оценки сложности по наборам (лучшая из repeat) и число задач каждого уровня
+    results = {}
+    grader = Grader()
+    for name in sets:
+        puzzles = load_set(name)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            grades = [grader.grade_line(line) for line in puzzles]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        levels = {}
+        for grade in grades:
+            level = grade.level if grade else '-'
+            levels[level] = levels.get(level, 0) + 1
+        results[name] = {'count': len(puzzles), 'per_second': len(puzzles) / best, 'levels': levels}
+    return results
+
+def compare(results, baseline, tolerance = TOLERANCE):
+    # список регрессий относительно базы
+    regressions = []
+    for name, methods in results.items():
+        for method, current in methods.items():
+            base = baseline.get(name, {}).get(method)
+            if base is None:
+                continue
+            if current['total_ms'] > base['total_ms'] * (1 + tolerance):
+                regressions.append(f"{name}/{method}: время {current['total_ms']:.1f} мс против {base['total_ms']:.1f} мс")
+            if current['nodes'] > base['nodes']:
+                regressions.append(f"{name}/{method}: узлов {current['nodes']} против {base['nodes']}")
+            if current['solved'] < base['solved']:
+                regressions.append(f"{name}/{method}: решено {current['solved']} против {base['solved']}")
+    return regressions
+
+def command_solve(args):
+    results = run(args.sets, args.methods, args.repeat)
+    print(f"{'набор':8} {'метод':6} {'задач':>5} {'всего, мс':>10} {'медиана':>8} {'макс':>8} {'узлов':>7} {'пик, КБ':>8}")
+    for name, methods in results.items():
+        for method, result in methods.items():
+            print(f"{name:8} {method:6} {result['count']:5} {result['total_ms']:10.2f} {result['median_ms']:8.3f} "
+                    f"{result['max_ms']:8.2f} {result['nodes']:7} {result['peak_bytes'] / 1024:8.1f}")
+    grades = run_grade(args.sets, args.repeat)
+    print(f"{'набор':8} {'задач':>5} {'оценок/с':>10}  уровни")
+    for name, result in grades.items():
+        print(f"{name:8} {result['count']:5} {result['per_second']:10.1f}  "
+                + ", ".join(f"{level} {count}" for level, count in result['levels'].items()))
+    report = {'python': platform.python_version(), 'platform': platform.platform(), 'repeat': args.repeat,
+                'results': results, 'grade': grades}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"РЕГРЕССИЯ {regression}")
+        if regressions:
+            return 1
+        print("Регрессий относительно базы нет")
+    return 0
+
+def command_tune(args):
+    # подбор стратегии ветвления: узлы и лучшее из repeat время решения всех задач
+    puzzles = [line for path in args.paths for _, line in read_lines(path, sys.stderr)] if args.paths \
+                else [line for name in SETS for line in load_set(name)]
+    methods = [method for method in args.methods if issubclass(SOLVERS[method], GraphSolver)]
+    print(f"задач {len(puzzles)}")
+    print(f"{'метод':6} {'стратегия':10} {'решено':>6} {'узлов':>9} {'время, мс':>10}")
+    for method in methods:
+        results = {}
+        for branching in args.branchings:
+            solver = SOLVERS[method](branching = branching)
+            best = None
+            for _ in range(args.repeat):
+                nodes = solved = 0
+                start = time.perf_counter()
+                for line in puzzles:
+                    board = Board.from_line(line)
+                    solved += bool(board is not None and solver.solve(board))
+                    nodes += solver.counter
+                elapsed = (time.perf_counter() - start) * 1000
+                best = elapsed if best is None else min(best, elapsed)
+            results[branching] = (nodes, best)
+            print(f"{method:6} {branching:10} {solved:6} {nodes:9} {best:10.1f}")
+        by_nodes = min(results, key=lambda branching: results[branching][0])
+        by_time = min(results, key=lambda branching: results[branching][1])
+        print(f"{method}: меньше всего узлов - {by_nodes}, быстрее всего - {by_time}")
+    return 0
+
+def load_rate(load):
+    # (задач в секунду, число загруженных задач) для генератора задач load()
+    start = time.perf_counter()
+    loaded = sum(1 for _ in load())
+    return loaded / (time.perf_counter() - start), loaded
+
+def command_io(args):
+    lines = [line for _, line in read_lines(args.path, sys.stderr)]
+    if not lines:
+        return 1
+    count = len(lines)
+    n = round(len(lines[0]) ** 0.25)
+    lines = [line for line in lines if len(line) == n ** 4]
+    with tempfile.TemporaryDirectory() as work:
+        work = Path(work)
+        text = work / 'puzzles.txt'
+        write_lines(text, lines)
+        archive = work / f"puzzles.{A_EXT}"
+        with sudoku_archive.ArchiveWriter(archive, n) as writer:
+            for line in lines:
+                writer.add(line.replace('.', '0').upper())
+        sud = work / 'sud'
+        sud.mkdir()
+        sudoku = Sudoku(n = n)
+        for number, line in enumerate(lines[:args.sud], 1):
+            sudoku.table = Sudoku.table_from_line(line)
+            sudoku.save(sud / f"{number:06d}.{F_EXT}")
+        sud_files = sorted(sud.iterdir())
+        numbers = [random.randrange(len(lines)) for _ in range(args.random)]
+
+        def load_sud():
+            for filename in sud_files:
+                sudoku.open(filename)
+                yield Sudoku.table_to_line(sudoku.table)
+
+        def load_archive():
+            with sudoku_archive.PuzzleArchive(archive) as puzzles:
+                yield from puzzles
+
+        def load_random():
+            with sudoku_archive.PuzzleArchive(archive) as puzzles:
+                for number in numbers:
+                    yield puzzles[number]
+
+        rows = [
+            ('строки', text.stat().st_size / len(lines), load_rate(lambda: read_lines(text, sys.stderr))),
+            (f".{F_EXT}", sum(f.stat().st_size for f in sud_files) / len(sud_files), load_rate(load_sud)),
+            (f".{A_EXT}", archive.stat().st_size / len(lines), load_rate(load_archive)),
+            (f".{A_EXT} #", archive.stat().st_size / len(lines), load_rate(load_random)),
+        ]
+    print(f"задач {len(lines)} из {count}, поле {n * n}x{n * n}")
+    print(f"{'формат':8} {'байт/задачу':>12} {'задач':>8} {'задач/с':>10}")
+    for name, size, (rate, loaded) in rows:
+        print(f"{name:8} {size:12.1f} {loaded:8} {rate:10.0f}")
+    return 0
+
+# нажатия клавиш: стрелки (App.key_pressed) и пробел
+KEYS = [SimpleNamespace(keycode=keycode, char='') for keycode in (39, 40, 37, 38, 32)]
+
+def command_gui(args):
+    import sudoku_gui
+    app = sudoku_gui.App()
+    try:
+        print(f"{'поле':7} {'операция':8} {'число':>6} {'мкс/оп':>8} {'элементов до':>13} {'после':>6}")
+        for n in (3, 4, 5):
+            app.create(n)
+            app.update_idletasks()
+            screen = app.screen
+            size = app.sudoku.size
+            # стрелки и пробел вперемешку с вводом значений
+            events = KEYS + [SimpleNamespace(keycode=0, char=symbol) for symbol in sudoku_gui.SYMBOLS[1:size + 1]]
+            for name, count, operation in (
+                    ('клавиши', args.keys, lambda k: app.key_pressed(events[k % len(events)])),
+                    ('размер', args.resizes, lambda k: screen.on_resize(SimpleNamespace(width=400 + k % 300, height=400 + k % 200)))):
+                before = len(screen.find_all())
+                start = time.perf_counter()
+                for k in range(count):
+                    operation(k)
+                app.update_idletasks()
+                elapsed = (time.perf_counter() - start) / count * 1000000
+                after = len(screen.find_all())
+                print(f"{size:2}x{size:<4} {name:8} {count:6} {elapsed:8.1f} {before:13} {after:6}")
+                if after != before:
+                    print(f"РЕГРЕССИЯ: число элементов холста выросло с {before} до {after}")
+                    return 1
+    finally:
+        app.worker.close() # кэш закрывает поток решения
+        app.destroy()
+    return 0
+
+def load_client(host, port, path, bodies, latencies, errors):
+    # один клиент: запросы по одному соединению, задержки в мс
+    import http.client
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            connection.request('POST', path, body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            data = response.read()
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status != 200 or b'"timeout"' in data:
+                errors.append(response.status)
+    finally:
+        connection.close()
+
+def command_load(args):
+    import threading
+    from urllib.parse import urlsplit
+    import sudoku_server
+    puzzles = [line for path in args.paths for _, line in read_lines(path, sys.stderr)] if args.paths \
+                else [line for name in SETS for line in load_set(name)]
+    if not puzzles:
+        return 1
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        # служба в этом же процессе на свободном порту
+        server = sudoku_server.make_server(port=0, jobs=args.jobs)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    tasks = [puzzles[k % len(puzzles)] for k in range(args.requests * args.batch)]
+    bodies = [json.dumps({'puzzles': tasks[k:k + args.batch], 'method': args.method, 'timeout': args.timeout})
+                for k in range(0, len(tasks), args.batch)]
+    latencies, errors = [], []
+    clients = [threading.Thread(target=load_client, args=(host, port, f"/{args.operation}", bodies[k::args.clients], latencies, errors))
+                for k in range(args.clients)]
+    try:
+        start = time.perf_counter()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        elapsed = time.perf_counter() - start
+        if server is not None:
+            metrics = server.service.metrics()
+        else:
+            import urllib.request
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+                metrics = json.load(response)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            server.service.close()
+    latencies.sort()
+    print(f"клиентов {args.clients}, запросов {len(latencies)} по {args.batch} задач, ошибок и таймаутов {len(errors)}")
+    print(f"запросов/с {len(latencies) / elapsed:10.1f}   задач/с {len(latencies) * args.batch / elapsed:10.1f}")
+    print("задержка, мс: " + "  ".join(f"p{p} {latencies[min(len(latencies) - 1, len(latencies) * p // 100)]:.2f}"
+                                        for p in (50, 90, 99)))
+    print(f"служба: процессов {metrics['jobs']}, пачек {metrics['batches']}, задач в пачке {metrics['mean_batch']}, "
+            f"очередь {metrics['queue_depth']}")
+    return 1 if errors else 0
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog="sudoku_bench", description="Замеры производительности решателя судоку")
+    commands = parser.add_subparsers(dest="command", required=True)
+    imports = commands.add_parser("import", help="время импорта модулей")
+    imports.add_argument("modules", nargs="*", default=IMPORT_MODULES, help="модули для замера")
+    imports.add_argument("-n", "--repeat", type=int, default=10, help="число запусков")
+    imports.set_defaults(handler=command_import)
+    solve = commands.add_parser("solve", help="время, узлы и память решения наборов задач")
+    solve.add_argument("-s", "--sets", nargs="+", choices=SETS, default=SETS, help="наборы задач")
+    solve.add_argument("-m", "--methods", nargs="+", choices=sorted(SOLVERS), default=list(SOLVERS), help="методы решения")
+    solve.add_argument("-n", "--repeat", type=int, default=3, help="решений каждой задачи, берется лучшее время")
+    solve.add_argument("-o", "--output", help="файл результатов JSON")
+    solve.add_argument("--baseline", help="файл базы JSON для поиска регрессий")
+    solve.add_argument("--tolerance", type=float, default=TOLERANCE, help="допустимый рост времени, доля")
+    solve.set_defaults(handler=command_solve)
+    tune = commands.add_parser("tune", help="сравнить стратегии ветвления по узлам и времени")
+    tune.add_argument("paths", nargs="*", help="файлы задач по одной в строке (по умолчанию - наборы benchmarks)")
+    tune.add_argument("-m", "--methods", nargs="+", choices=sorted(name for name in SOLVERS if issubclass(SOLVERS[name], GraphSolver)),
+                        default=[name for name in SOLVERS if issubclass(SOLVERS[name], GraphSolver)], help="методы поиска по графу")
+    tune.add_argument("-b", "--branchings", nargs="+", choices=list(BRANCHINGS), default=list(BRANCHINGS), help="стратегии ветвления")
+    tune.add_argument("-n", "--repeat", type=int, default=3, help="прогонов, берется лучшее время")
+    tune.set_defaults(handler=command_tune)
+    io = commands.add_parser("io", help="размер и скорость загрузки задач в разных форматах")
+    io.add_argument("path", help="файл задач по одной в строке")
+    io.add_argument("--sud", type=int, default=1000, help=f"задач для замера файлов .{F_EXT}")
+    io.add_argument("--random", type=int, default=10000, help=f"задач для замера чтения архива .{A_EXT} по номерам")
+    io.set_defaults(handler=command_io)
+    gui = commands.add_parser("gui", help="нагрузочная проверка холста интерфейса: число элементов не растет")
+    gui.add_argument("--keys", type=int, default=5000, help="нажатий клавиш на каждом поле")
+    gui.add_argument("--resizes", type=int, default=200, help="изменений размера окна на каждом поле")
+    gui.set_defaults(handler=command_gui)
+    load = commands.add_parser("load", help="нагрузочная проверка службы решения (sudoku_server.py)")
+    load.add_argument("paths", nargs="*", help="файлы задач по одной в строке (по умолчанию - наборы benchmarks)")
+    load.add_argument("--url", help="адрес работающей службы (по умолчанию служба запускается здесь же)")
+    load.add_argument("-o", "--operation", choices=["solve", "count", "validate"], default="solve", help="операция")
+    load.add_argument("-m", "--method", choices=list(SOLVERS), default="graph", help="метод решения")
+    load.add_argument("-c", "--clients", type=int, default=8, help="одновременных клиентов")
+    load.add_argument("-r", "--requests", type=int, default=1000, help="всего запросов")
+    load.add_argument("-b", "--batch", type=int, default=1, help="задач в запросе")
+    load.add_argument("-j", "--jobs", type=int, default=None, help="процессов службы, запущенной здесь")
+    load.add_argument("--timeout", type=float, default=10.0, help="секунд на запрос")
+    load.set_defaults(handler=command_load)
+    return parser
+
+def main(argv = None):
+    args = make_parser().parse_args(argv)
+    return args.handler(args)
+
+if (__name__ == "__main__"):
+    sys.exit(main())
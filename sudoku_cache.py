@@ -0,0 +1,129 @@
+'''
+Кэш решений судоку по канонической форме задачи.
+Задачи, переходящие друг в друга перестановкой значений, перестановкой полос строк
+и столбцов, транспонированием, поворотами и отражениями поля, имеют одну каноническую
+форму: лексикографически наименьшую строку из 288 расположений поля с нумерацией
+значений в порядке первого появления. Перестановки строк внутри полосы не учитываются:
+они увеличили бы число расположений в 6^6 раз.
+Решение хранится в канонической форме и переводится обратно через сохраненное
+преобразование. В памяти - не больше size задач с вытеснением давно не использованных,
+на диске (dbm) - без ограничения.
+'''
+import dbm
+from collections import OrderedDict
+from itertools import permutations
+from operator import itemgetter
+
+CACHE_FILE = 'sudoku_cache' # рядом с sudoku.ini
+CACHE_SIZE = 4096
+NO_SOLUTION = '-'
+DIGITS = b'123456789'
+
+def arrangements():
+    # номера ячеек исходного поля для каждой ячейки расположения
+    result = []
+    for transpose in (False, True):
+        for bands in permutations(range(3)):
+            for stacks in permutations(range(3)):
+                for reverse_rows in (False, True):
+                    for reverse_columns in (False, True):
+                        rows = [band * 3 + (2 - k if reverse_rows else k) for band in bands for k in range(3)]
+                        columns = [stack * 3 + (2 - k if reverse_columns else k) for stack in stacks for k in range(3)]
+                        if transpose:
+                            result.append(tuple(columns[j] * 9 + rows[i] for i in range(9) for j in range(9)))
+                        else:
+                            result.append(tuple(rows[i] * 9 + columns[j] for i in range(9) for j in range(9)))
+    return result
+
+ARRANGEMENTS = arrangements()
+GETTERS = [itemgetter(*arrangement) for arrangement in ARRANGEMENTS]
+
+def canonical(cells):
+    # каноническая форма задачи (строка из 81 символа), расположение и порядок значений:
+    # канонический символ ячейки k - номер значения cells[arrangement[k]] в order
+    cells = bytes(cells)
+    # пустые ячейки меньше любых значений, поэтому сначала отбираются расположения
+    # с наименьшим рисунком заполненных ячеек, и только среди них сравниваются значения
+    pattern = bytes(1 if value else 0 for value in cells)
+    best_pattern, candidates = None, []
+    for number, getter in enumerate(GETTERS):
+        arranged = bytes(getter(pattern))
+        if best_pattern is None or arranged < best_pattern:
+            best_pattern, candidates = arranged, [number]
+        elif arranged == best_pattern:
+            candidates.append(number)
+    best = None
+    for number in candidates:
+        arranged = bytes(GETTERS[number](cells))
+        order = bytes(value for value in dict.fromkeys(arranged) if value)
+        key = arranged.translate(bytes.maketrans(order + b'\0', DIGITS[:len(order)] + b'0'))
+        if best is None or key < best:
+            best, best_number, best_order = key, number, order
+    # значения, которых нет среди подсказок, нумеруются следом по возрастанию
+    best_order += bytes(value for value in range(1, 10) if value not in best_order)
+    return best.decode('ascii'), ARRANGEMENTS[best_number], best_order
+
+class SolutionCache():
+    ''' кэш решений по канонической форме: LRU в памяти и, если задан filename, хранилище dbm на диске;
+        hits и misses - число попаданий и промахов '''
+    NO_SOLUTION = NO_SOLUTION
+
+    def __init__(self, size = CACHE_SIZE, filename = None):
+        self.size = size
+        self.memory = OrderedDict()
+        self.store = None
+        if filename:
+            try:
+                self.store = dbm.open(filename, 'c')
+            except dbm.error:
+                pass # файл недоступен - кэш только в памяти
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        if self.store is not None and key in self.store:
+            value = self.store[key].decode('ascii')
+            self.remember(key, value)
+            return value
+        return None
+
+    def remember(self, key, value):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.size:
+            self.memory.popitem(last=False)
+
+    def get(self, cells):
+        # решение задачи cells (список 81 значения) из кэша: список значений, NO_SOLUTION или None
+        key, arrangement, order = canonical(cells)
+        value = self.lookup(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if value == NO_SOLUTION:
+            return NO_SOLUTION
+        solution = [0] * 81
+        for k, label in enumerate(value.encode('ascii')):
+            solution[arrangement[k]] = order[label - ord('1')]
+        return solution
+
+    def put(self, cells, solution):
+        # запоминание решения задачи cells, solution - список значений или None, если решения нет
+        key, arrangement, order = canonical(cells)
+        if solution is None:
+            value = NO_SOLUTION
+        else:
+            labels = {number: str(label) for label, number in enumerate(order, 1)}
+            value = ''.join(labels[solution[idx]] for idx in arrangement)
+        self.remember(key, value)
+        if self.store is not None:
+            self.store[key] = value
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
@@ -0,0 +1,465 @@
+'''
+Пакетный решатель судоку без графического интерфейса.
+Принимает файлы задач .sud, каталоги с ними и файлы задач по одной в строке
+(81 знак, для полей 16x16 и 25x25 - 256 и 625 знаков 1-9, A-P; пустые ячейки - '.' или '0',
+дальше через пробел могут идти другие поля),
+решает их параллельно в пуле процессов и выводит результаты в порядке входных данных:
+источник, решение (или '-' если решения нет), число итераций, время в милисекундах,
+с ключом --unique - ещё число решений (0, 1 или 2 - решение не единственное).
+Пример: python sudoku_cli.py solve puzzles.txt tasks/ -j 4 -o solutions.txt
+С ключом --numpy задачи решаются пачками в одном процессе (sudoku_numpy.py),
+с ключом --split каждая задача решается всеми процессами с разбиением дерева ветвлений (sudoku_split.py).
+validate - проверка согласованности задач без решения.
+profile - статистика поиска по каждой задаче (глубина, ветвления, откаты, время по этапам),
+с ключом --events - поток событий поиска в файл JSON по одному событию в строке.
+generate - генерация задач с единственным решением (sudoku_generator.py)
+в файл по одной в строке или в каталог файлами .sud.
+Задачи читаются и из двоичных архивов .sdb (sudoku_archive.py), источник - "архив#номер";
+convert - перевод задач между архивом .sdb, файлом по одной в строке и каталогом файлов .sud,
+с ключом --solve в архив записываются и решения.
+render - решение задач и запись картинок с решениями в каталог (sudoku_render.py, нужен PIL).
+С ключом --variant задачи решаются с дополнительными ограничениями (диагонали, окна, клетки-суммы):
+python sudoku_cli.py solve killer.txt --variant "cages=15@0.1.9,7@2.3,..."
+Ограничения из строки variant файла .sud действуют для задачи этого файла вместо --variant.
+grade - оценка сложности задач (sudoku_grader.py): задача, уровень, оценка, самый трудный приём, узлы перебора
+в файл по одной в строке или в архив .sdb (оценка - в пометке задачи).
+'''
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from sudoku_core import Board, Sudoku, GraphSolver, Propagator, SOLVERS, DEFAULT_SOLVER, BRANCHINGS, F_EXT, A_EXT, SYMBOLS
+from sudoku_core import SIZES, parse_variant
+from sudoku_core import EventLog, SolverStats, TracerGroup
+import sudoku_generator
+from sudoku_io import read_lines
+
+CHUNKSIZE = 64 # задач в одной порции для процесса: решение занимает микросекунды, пересылка по одной дороже
+NO_SOLUTION = '-'
+
+_sudoku = None # решатель процесса-исполнителя, создается один раз на процесс
+_unique = False # подсчитывать решения до двух вместо поиска первого
+
+def init_worker(method, techniques = None, unique = False, branching = None):
+    # techniques - логические приёмы, branching - стратегия ветвления (BRANCHINGS) для методов поиска по графу,
+    # None - по умолчанию метода
+    global _sudoku, _unique
+    _sudoku = Sudoku(method)
+    _unique = unique
+    if techniques is not None:
+        _sudoku.get_solver().set_techniques(techniques)
+    if branching is not None:
+        _sudoku.get_solver().set_branching(branching)
+
+def solve_task(task):
+    # решение одной задачи в процессе-исполнителе:
+    # (источник, строка, ограничения) -> (источник, решение, итерации, время, срабатывания приёмов или None,
+    #                                     число решений или None без --unique)
+    source, line, variant = task
+    solver = _sudoku.get_solver()
+    start = time.perf_counter_ns()
+    board = Board.from_variant(line, variant)
+    if board is None:
+        found = 0
+    elif _unique:
+        found = solver.count_solutions(board, 2)
+    else:
+        found = int(solver.solve(board))
+    end = time.perf_counter_ns()
+    counter = solver.counter if board is not None else 0
+    propagator = getattr(solver, 'propagator', None)
+    hits = dict(propagator.hits) if propagator and board is not None else None
+    solution = ''.join(SYMBOLS[number] for number in solver.solution) if found else NO_SOLUTION
+    return source, solution, counter, (end - start) / 1000000, hits, found if _unique else None
+
+def read_tasks(paths, errors, variant = ''):
+    # генератор задач (источник, строка, ограничения) по списку путей, ошибки чтения пишутся в errors;
+    # variant - ограничения задач, у которых нет своих (строки variant файла .sud);
+    # задачи, к размеру которых ограничения не подходят (номера ячеек за полем), пропускаются с сообщением
+    for source, line, task_variant in read_paths(paths, errors, variant):
+        n = round(len(line) ** 0.25)
+        error = variant_error(task_variant, n) if task_variant and n in SIZES else None
+        if error:
+            errors.write(f"{source}: ограничения не подходят к полю {n * n}x{n * n}: {error}\n")
+        else:
+            yield source, line, task_variant
+
+@lru_cache(maxsize=None)
+def variant_error(variant, n):
+    # текст ошибки, если описание ограничений не подходит к полю с квадратами n x n, иначе None
+    try:
+        parse_variant(variant, n)
+    except ValueError as error:
+        return str(error)
+    return None
+
+def read_paths(paths, errors, variant = ''):
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            for filename in sorted(path.rglob("*.{}".format(F_EXT))):
+                yield from read_sud(filename, errors, variant)
+        elif path.suffix == ".{}".format(F_EXT):
+            yield from read_sud(path, errors, variant)
+        elif path.suffix == ".{}".format(A_EXT):
+            yield from read_archive(path, errors, variant)
+        else:
+            for source, line in read_lines(path, errors):
+                yield source, line, variant
+
+def read_sud(filename, errors, variant = ''):
+    sudoku = Sudoku()
+    error_message = sudoku.open(filename)
+    if error_message:
+        errors.write(f"{filename}: {error_message}\n")
+    else:
+        yield str(filename), Sudoku.table_to_line(sudoku.table), sudoku.variant or variant
+
+def read_archive(filename, errors, variant = ''):
+    import sudoku_archive
+    for source, record in sudoku_archive.read_records(filename, errors):
+        yield source, record.puzzle, variant
+
+def solve_all(tasks, method = DEFAULT_SOLVER, jobs = None, chunksize = CHUNKSIZE, techniques = None, unique = False, branching = None):
+    # генератор результатов в порядке задач, при jobs == 1 решение в текущем процессе
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        init_worker(method, techniques, unique, branching)
+        yield from map(solve_task, tasks)
+        return
+    with multiprocessing.Pool(jobs, initializer=init_worker, initargs=(method, techniques, unique, branching)) as pool:
+        yield from pool.imap(solve_task, tasks, chunksize)
+
+def solve_split_all(tasks, method = DEFAULT_SOLVER, jobs = None, unique = False, report = None):
+    # генератор результатов: задачи решаются по одной, каждая - в пуле процессов (sudoku_split.py);
+    # отчеты о разбиении передаются в report(source, отчет); задачи с ограничениями решаются без разбиения
+    import sudoku_split
+    init_worker(method, None, unique)
+    for source, line, variant in tasks:
+        if variant:
+            yield solve_task((source, line, variant))
+            continue
+        start = time.perf_counter_ns()
+        found, solution, split_report = sudoku_split.solve_split(line, method, jobs, 2 if unique else 1)
+        end = time.perf_counter_ns()
+        counter = split_report['split_nodes'] + sum(worker['nodes'] for worker in split_report['workers'].values())
+        if report:
+            report(source, split_report)
+        yield source, solution or NO_SOLUTION, counter, (end - start) / 1000000, None, found if unique else None
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+def solve_numpy(tasks, method = DEFAULT_SOLVER):
+    # генератор результатов пакетного решателя, время - среднее по пачке;
+    # пакетный решатель - только для классических полей 9x9, остальные задачи решаются обычным решателем
+    import sudoku_numpy
+    init_worker(method)
+    for chunk in chunked(tasks, sudoku_numpy.CHUNK):
+        lines = [line for _, line, variant in chunk if len(line) == 81 and not variant]
+        start = time.perf_counter_ns()
+        solutions, state, counters = sudoku_numpy.solve_batch(sudoku_numpy.from_lines(lines), method)
+        elapsed = (time.perf_counter_ns() - start) / 1000000 / max(len(lines), 1)
+        results = zip(sudoku_numpy.to_lines(solutions), state, counters)
+        for source, line, variant in chunk:
+            if len(line) != 81 or variant:
+                yield solve_task((source, line, variant))
+                continue
+            solution, solved, counter = next(results)
+            yield source, solution if solved > 0 else NO_SOLUTION, int(counter), elapsed, None, None
+
+def command_solve(args):
+    if args.techniques is not None and not issubclass(SOLVERS[args.method], GraphSolver):
+        sys.stderr.write(f"Метод {args.method} не использует логические приёмы\n")
+        return 2
+    if args.branching is not None and (not issubclass(SOLVERS[args.method], GraphSolver) or args.numpy or args.split):
+        sys.stderr.write("Стратегия ветвления (--branching) - только для поиска по графу без --numpy и --split\n")
+        return 2
+    if args.unique and args.numpy:
+        sys.stderr.write("Проверка единственности (--unique) не поддерживается с --numpy\n")
+        return 2
+    if args.variant and (args.numpy or args.split):
+        sys.stderr.write("Дополнительные ограничения (--variant) не сочетаются с --numpy и --split\n")
+        return 2
+    if args.split and (args.numpy or args.techniques is not None):
+        sys.stderr.write("Разбиение дерева ветвлений (--split) не сочетается с --numpy и --techniques\n")
+        return 2
+    total = solved = not_unique = 0
+    statistics = {}
+    start = time.perf_counter()
+    tasks = read_tasks(args.paths, sys.stderr, args.variant)
+    if args.numpy:
+        results = solve_numpy(tasks, args.method)
+    elif args.split:
+        results = solve_split_all(tasks, args.method, args.jobs, args.unique, print_split_report if args.stats else None)
+    else:
+        results = solve_all(tasks, args.method, args.jobs, args.chunksize, args.techniques, args.unique, args.branching)
+    # файл результатов открывается после проверки ключей, чтобы ошибка в них не стирала прежний файл
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for source, solution, counter, elapsed, hits, found in results:
+            if found is None:
+                output.write(f"{source}\t{solution}\t{counter}\t{elapsed:.3f}\n")
+            else:
+                output.write(f"{source}\t{solution}\t{counter}\t{elapsed:.3f}\t{found}\n")
+                not_unique += found > 1
+            total += 1
+            solved += solution != NO_SOLUTION
+            for name, count in (hits or {}).items():
+                statistics[name] = statistics.get(name, 0) + count
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    end = time.perf_counter()
+    sys.stderr.write(f"Решено {solved} из {total} задач за {end - start:.3f} с\n")
+    if args.unique:
+        sys.stderr.write(f"С неединственным решением {not_unique} задач\n")
+    if args.stats and statistics:
+        sys.stderr.write("Срабатывания приёмов: " + ", ".join(f"{name} {count}" for name, count in statistics.items()) + "\n")
+    return 0 if solved == total else 1
+
+def print_split_report(source, report):
+    sys.stderr.write(f"{source}: подзадач {report['subproblems']}, глубина разбиения {report['depth']}, "
+                        f"узлов разбиения {report['split_nodes']}\n")
+    for pid, worker in sorted(report['workers'].items()):
+        sys.stderr.write(f"  процесс {pid}: подзадач {worker['tasks']}, узлов {worker['nodes']}\n")
+
+def command_validate(args):
+    # вывод источников задач с повторениями в строках, столбцах, квадратах или дополнительных группах
+    # и с нарушением сумм клеток
+    try:
+        import sudoku_numpy
+    except ImportError:
+        sudoku_numpy = None
+    total = invalid = 0
+    for chunk in chunked(read_tasks(args.paths, sys.stderr, args.variant), 65536):
+        if sudoku_numpy and all(len(line) == 81 and not variant for _, line, variant in chunk):
+            consistent = sudoku_numpy.data_consistency(sudoku_numpy.from_lines(line for _, line, _ in chunk))
+        else:
+            consistent = [Board.from_variant(line, variant) is not None for _, line, variant in chunk]
+        for (source, _, _), ok in zip(chunk, consistent):
+            if not ok:
+                print(f"{source}\tнесогласованные данные")
+                invalid += 1
+        total += len(chunk)
+    sys.stderr.write(f"Проверено {total} задач, несогласованных {invalid}\n")
+    return 0 if invalid == 0 else 1
+
+def command_profile(args):
+    # решение задач в текущем процессе со сбором статистики поиска
+    solver = Sudoku(args.method).get_solver()
+    events = open(args.events, 'w') if args.events else None
+    try:
+        for source, line, variant in read_tasks(args.paths, sys.stderr):
+            stats = SolverStats()
+            solver.tracer = stats
+            if events:
+                def write(name, depth, data, source = source):
+                    events.write(json.dumps({'source': source, 'event': name, 'depth': depth, **data}) + "\n")
+                solver.tracer = TracerGroup(stats, EventLog(write))
+            board = Board.from_variant(line, variant)
+            solved = board is not None and solver.solve(board)
+            print(json.dumps({'source': source, 'solved': bool(solved), **stats.as_dict()}, ensure_ascii=False))
+    finally:
+        solver.tracer = None
+        if events:
+            events.close()
+    return 0
+
+def command_generate(args):
+    if args.sud and not args.output:
+        sys.stderr.write("Для --sud нужен каталог -o\n")
+        return 2
+    jobs = args.jobs or os.cpu_count() or 1
+    output = None
+    levels = {}
+    start = time.perf_counter()
+    try:
+        if args.sud:
+            Path(args.output).mkdir(parents=True, exist_ok=True)
+        else:
+            output = open(args.output, 'w') if args.output else sys.stdout
+        for number, line, level, elapsed in sudoku_generator.generate_many(args.count, args.difficulty, jobs, args.seed, args.method):
+            levels[level] = levels.get(level, 0) + 1
+            if output:
+                output.write(f"{line}\t{level}\n")
+            else:
+                sudoku = Sudoku()
+                sudoku.table = Sudoku.table_from_line(line)
+                error_message = sudoku.save(Path(args.output) / f"{number:06d}.{F_EXT}")
+                if error_message:
+                    sys.stderr.write(f"{error_message}\n")
+                    return 1
+    finally:
+        if output and output is not sys.stdout:
+            output.close()
+    end = time.perf_counter()
+    rate = args.count / (end - start)
+    sys.stderr.write(f"Сгенерировано {args.count} задач за {end - start:.3f} с: {rate:.2f} задач/с, "
+                        f"{rate / jobs:.2f} задач/с на процесс; " + ", ".join(f"{level} {count}" for level, count in levels.items()) + "\n")
+    return 0
+
+def command_convert(args):
+    import sudoku_archive
+    records = itertools.chain.from_iterable(sudoku_archive.read_records(path, sys.stderr) for path in args.paths)
+    start = time.perf_counter()
+    count = sudoku_archive.convert(records, args.output, sys.stderr, args.method if args.solve else None)
+    end = time.perf_counter()
+    sys.stderr.write(f"Записано {count} задач в {args.output} за {end - start:.3f} с\n")
+    return 0 if count else 1
+
+def command_render(args):
+    import sudoku_render
+    # формат проверяется до решения, чтобы ошибка не прерывала пачку на середине
+    if sudoku_render.save_format(args.format) is None:
+        sys.stderr.write(f"Формат картинок {args.format} не поддерживается\n")
+        return 2
+    options = {'cell': args.cell, 'empty_color': args.empty_color, 'data_color': args.data_color, 'font': args.font}
+    count = unsolved = 0
+    start = time.perf_counter()
+    for source, filename, solved in sudoku_render.render_all(read_tasks(args.paths, sys.stderr), args.output,
+                                                                args.method, args.jobs, args.format, **options):
+        count += 1
+        if not solved:
+            unsolved += 1
+            sys.stderr.write(f"{source}: нет решения, {filename} - без решения\n")
+    end = time.perf_counter()
+    sys.stderr.write(f"Нарисовано {count} задач за {end - start:.3f} с, {count / max(end - start, 1e-9):.1f} задач/с\n")
+    return 0 if count and not unsolved else 1
+
+def command_grade(args):
+    import sudoku_grader
+    import sudoku_archive
+    archive = args.output and args.output.endswith(f".{A_EXT}")
+    output = None
+    writer = None
+    levels = {}
+    count = 0
+    start = time.perf_counter()
+    try:
+        if not archive:
+            output = open(args.output, 'w', buffering=1 << 20) if args.output else sys.stdout
+        for source, line, variant, grade in sudoku_grader.grade_all(read_tasks(args.paths, sys.stderr), args.jobs, args.chunksize):
+            count += 1
+            level = grade.level if grade else NO_SOLUTION
+            levels[level] = levels.get(level, 0) + 1
+            fields = f"{level}\t{grade.score}\t{grade.technique}\t{grade.nodes}" if grade else NO_SOLUTION
+            if not archive:
+                output.write(f"{line}\t{fields}\n")
+                continue
+            if variant:
+                sys.stderr.write(f"{source}: в архиве .{A_EXT} не сохраняются дополнительные ограничения, задача пропущена\n")
+                continue
+            n = round(len(line) ** 0.25)
+            if writer is None:
+                writer = sudoku_archive.ArchiveWriter(args.output, n)
+            if n != writer.n:
+                sys.stderr.write(f"{source}: размер поля отличается от первой задачи архива\n")
+                continue
+            writer.add(line.replace('.', Sudoku.PUSTO).upper(), None, fields.replace('\t', ' '))
+    finally:
+        if writer is not None:
+            writer.close()
+        if output and output is not sys.stdout:
+            output.close()
+    end = time.perf_counter()
+    sys.stderr.write(f"Оценено {count} задач за {end - start:.3f} с: {count / max(end - start, 1e-9):.1f} задач/с; "
+                        + ", ".join(f"{level} {number}" for level, number in levels.items()) + "\n")
+    return 0 if count else 1
+
+def parse_techniques(text):
+    techniques = [name for name in text.split(',') if name]
+    for name in techniques:
+        if name not in Propagator.TECHNIQUES:
+            raise argparse.ArgumentTypeError(f"неизвестный приём {name}")
+    return techniques
+
+def check_variant(text):
+    # проверка описания ограничений для самого большого поля, точная проверка - по размеру каждой задачи (read_tasks)
+    try:
+        parse_variant(text, max(SIZES))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+    return text
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog="sudoku", description="Пакетный решатель судоку")
+    commands = parser.add_subparsers(dest="command", required=True)
+    solve = commands.add_parser("solve", help="решить задачи из файлов и каталогов")
+    solve.add_argument("paths", nargs="+", help=f"файлы .{F_EXT}, каталоги или файлы задач по одной в строке")
+    solve.add_argument("-o", "--output", help="файл результатов (по умолчанию - стандартный вывод)")
+    solve.add_argument("-m", "--method", choices=sorted(SOLVERS), default=DEFAULT_SOLVER, help="метод решения")
+    solve.add_argument("-j", "--jobs", type=int, default=None, help="число процессов (по умолчанию - все ядра)")
+    solve.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="задач в порции для процесса")
+    solve.add_argument("--numpy", action="store_true", help="решать пачками на NumPy в одном процессе")
+    solve.add_argument("-t", "--techniques", type=parse_techniques, default=None,
+                        help="логические приёмы через запятую ({}), '' - без приёмов".format(",".join(Propagator.TECHNIQUES)))
+    solve.add_argument("-b", "--branching", choices=sorted(BRANCHINGS), default=None,
+                        help="стратегия ветвления для поиска по графу (сравнение стратегий - sudoku_bench.py tune)")
+    solve.add_argument("--split", action="store_true",
+                        help="решать каждую задачу всеми процессами, разбивая дерево ветвлений (для единичных трудных задач)")
+    solve.add_argument("--stats", action="store_true", help="вывести число срабатываний логических приёмов (с --split - узлы по процессам)")
+    solve.add_argument("-u", "--unique", action="store_true", help="проверить единственность решения (подсчет до двух решений)")
+    solve.add_argument("--variant", type=check_variant, default='',
+                        help=f"дополнительные ограничения задач через ';': diagonal, windoku, cages=сумма@ячейка.ячейка...,... "
+                                f"(у файлов .{F_EXT} со строкой variant - свои)")
+    solve.set_defaults(handler=command_solve)
+    profile = commands.add_parser("profile", help="статистика поиска по каждой задаче")
+    profile.add_argument("paths", nargs="+", help=f"файлы .{F_EXT}, каталоги или файлы задач по одной в строке")
+    profile.add_argument("-m", "--method", choices=sorted(SOLVERS), default=DEFAULT_SOLVER, help="метод решения")
+    profile.add_argument("--events", help="файл для потока событий поиска (JSON по строкам)")
+    profile.set_defaults(handler=command_profile)
+    generate = commands.add_parser("generate", help="сгенерировать задачи с единственным решением")
+    generate.add_argument("-n", "--count", type=int, default=1, help="число задач")
+    generate.add_argument("-d", "--difficulty", choices=sudoku_generator.DIFFICULTIES, default=None, help="сложность задач")
+    generate.add_argument("-o", "--output", help="файл задач по одной в строке (по умолчанию - стандартный вывод) или каталог для --sud")
+    generate.add_argument("--sud", action="store_true", help=f"записать каждую задачу в каталог -o отдельным файлом .{F_EXT}")
+    generate.add_argument("-j", "--jobs", type=int, default=None, help="число процессов (по умолчанию - все ядра)")
+    generate.add_argument("-m", "--method", choices=sorted(SOLVERS), default=DEFAULT_SOLVER, help="метод проверки единственности")
+    generate.add_argument("--seed", type=int, default=None, help="начальное значение генератора случайных чисел")
+    generate.set_defaults(handler=command_generate)
+    validate = commands.add_parser("validate", help="проверить согласованность задач")
+    validate.add_argument("paths", nargs="+", help=f"файлы .{F_EXT}, каталоги или файлы задач по одной в строке")
+    validate.add_argument("--variant", type=check_variant, default='',
+                        help=f"дополнительные ограничения задач без строки variant в файле .{F_EXT} (как у solve)")
+    validate.set_defaults(handler=command_validate)
+    convert = commands.add_parser("convert", help=f"перевести задачи в архив .{A_EXT}, файл по одной в строке или каталог файлов .{F_EXT}")
+    convert.add_argument("paths", nargs="+", help=f"архивы .{A_EXT}, файлы .{F_EXT}, каталоги или файлы задач по одной в строке")
+    convert.add_argument("-o", "--output", required=True,
+                        help=f"архив .{A_EXT}, файл задач по одной в строке или каталог (путь без расширения) для файлов .{F_EXT}")
+    convert.add_argument("--solve", action="store_true", help=f"решить задачи и записать решения в архив .{A_EXT}")
+    convert.add_argument("-m", "--method", choices=sorted(SOLVERS), default=DEFAULT_SOLVER, help="метод решения для --solve")
+    convert.set_defaults(handler=command_convert)
+    render = commands.add_parser("render", help="решить задачи и нарисовать решения картинками")
+    render.add_argument("paths", nargs="+", help=f"файлы .{F_EXT}, архивы .{A_EXT}, каталоги или файлы задач по одной в строке")
+    render.add_argument("-o", "--output", required=True, help="каталог для картинок")
+    render.add_argument("-m", "--method", choices=sorted(SOLVERS), default=DEFAULT_SOLVER, help="метод решения")
+    render.add_argument("-j", "--jobs", type=int, default=None, help="число процессов (по умолчанию - все ядра)")
+    render.add_argument("--format", default="png", help="формат картинок (расширение файла: png, jpg, ...), проверяется до решения")
+    render.add_argument("--cell", type=int, default=48, help="сторона ячейки в пикселях")
+    render.add_argument("--font", default="Lucida Console", help="семейство шрифта")
+    render.add_argument("--empty-color", default="White", help="цвет пустых ячеек")
+    render.add_argument("--data-color", default="Light Sky Blue", help="цвет ячеек с исходными значениями")
+    render.set_defaults(handler=command_render)
+    grade = commands.add_parser("grade", help="оценить сложность задач")
+    grade.add_argument("paths", nargs="+", help=f"файлы .{F_EXT}, архивы .{A_EXT}, каталоги или файлы задач по одной в строке")
+    grade.add_argument("-o", "--output", help=f"файл задач с оценками (по умолчанию - стандартный вывод) или архив .{A_EXT}")
+    grade.add_argument("-j", "--jobs", type=int, default=None, help="число процессов (по умолчанию - все ядра)")
+    grade.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="задач в порции для процесса")
+    grade.set_defaults(handler=command_grade)
+    return parser
+
+def main(argv = None):
+    args = make_parser().parse_args(argv)
+    return args.handler(args)
+
+if (__name__ == "__main__"):
+    sys.exit(main())
@@ -0,0 +1,1714 @@
+'''
+Ядро решателя судоку без графического интерфейса: данные таблицы (Excel, Sudoku),
+поле на битовых масках (Board), методы решения (SOLVERS) и чтение/запись файлов задач.
+Не зависит от tkinter и PIL, поэтому быстро импортируется процессами-исполнителями.
+'''
+
+import queue
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations
+from time import perf_counter_ns
+
+F_EXT = "sud"
+A_EXT = "sdb" # архив задач (sudoku_archive)
+SIZES = (3, 4, 5) # размеры квадрата: поля 9x9, 16x16 и 25x25
+SYMBOLS = '0123456789ABCDEFGHIJKLMNOP' # знак значения 0..25, 0 - пустая ячейка
+VALUES = {char: value for value, char in enumerate(SYMBOLS)}
+VALUES.update({char.lower(): value for char, value in VALUES.items()})
+VALUES['.'] = 0
+
+class Excel():
+    ''' класс для хранения данных ячайки таблицы '''
+    
+    def __init__(self, number, constant = False):
+        self.number = number
+        self.constant = constant
+        self.possible=[]
+    
+    def __repr__(self):
+        return str(self.number)
+
+def geometry(n):
+    # таблицы поля с квадратами n x n (сторона n * n): размер квадрата, сторона, число ячеек, маска всех значений,
+    # номера строки, столбца и квадрата каждой ячейки, ячейки групп в порядке строки, столбцы, квадраты,
+    # пересечения строк и столбцов с квадратами: (ячейки пересечения, остаток линии, остаток квадрата)
+    size = n * n
+    cells = size * size
+    row = [idx // size for idx in range(cells)]
+    col = [idx % size for idx in range(cells)]
+    box = [(idx // (size * n)) * n + (idx % size) // n for idx in range(cells)]
+    units = ([[r * size + c for c in range(size)] for r in range(size)]
+                + [[r * size + c for r in range(size)] for c in range(size)]
+                + [[(b // n) * size * n + (b % n) * n + (k // n) * size + k % n for k in range(size)] for b in range(size)])
+    segments = []
+    for line in units[:2 * size]:
+        for square in units[2 * size:]:
+            square_set = set(square)
+            common = [idx for idx in line if idx in square_set]
+            if common:
+                segments.append((common, [idx for idx in line if idx not in square_set],
+                                    [idx for idx in square if idx not in common]))
+    cell_groups, peers = constraint_graph(units, cells)
+    return n, size, cells, (1 << size) - 1, row, col, box, units, segments, units, cell_groups, peers
+
+def constraint_graph(groups, cells):
+    # таблицы графа ограничений: номера групп каждой ячейки и её соседи (ячейки общих групп, без неё самой)
+    cell_groups = [[] for _ in range(cells)]
+    for number, group in enumerate(groups):
+        for idx in group:
+            cell_groups[idx].append(number)
+    peers = [tuple(sorted(set().union(*(groups[number] for number in cell_groups[idx])) - {idx})) for idx in range(cells)]
+    return [tuple(numbers) for numbers in cell_groups], peers
+
+class Board():
+    ''' компактное поле для решателя: плоский список значений и битовые маски
+        занятых значений строк, столбцов и квадратов (бит k-1 - значение k),
+        allowed - маски значений, не исключенных логическими приёмами;
+        Board - поле 9x9, поля 16x16 и 25x25 - классы Board.of_size(4) и Board.of_size(5),
+        поля с дополнительными ограничениями - классы Board.variant(описание, n) (см. VariantBoard);
+        граф ограничений: UNITS - группы, где каждое значение стоит ровно один раз,
+        GROUPS - все группы без повторений значений (UNITS и клетки-суммы),
+        CELL_GROUPS - номера групп каждой ячейки, PEERS - соседи каждой ячейки '''
+    N, SIZE, CELLS, ALL, ROW, COL, BOX, UNITS, SEGMENTS, GROUPS, CELL_GROUPS, PEERS = geometry(3)
+    GEOMETRY = ('N', 'SIZE', 'CELLS', 'ALL', 'ROW', 'COL', 'BOX', 'UNITS', 'SEGMENTS', 'GROUPS', 'CELL_GROUPS', 'PEERS')
+    VARIANT = '' # описание дополнительных ограничений (parse_variant), '' - классическое поле
+    HOUSES = () # дополнительные группы с каждым значением ровно один раз (диагонали, окна)
+    CAGES = () # клетки-суммы: (ячейки, сумма)
+    EXTRA = () # дополнительные группы: сначала HOUSES, затем ячейки клеток CAGES
+    _sizes = {} # размер квадрата -> класс поля
+    _variants = {} # (размер квадрата, описание) -> класс поля
+
+    __slots__ = ('cells', 'rows', 'columns', 'squares', 'allowed', 'trail')
+
+    def __init__(self):
+        self.cells = [0] * self.CELLS
+        self.rows = [0] * self.SIZE
+        self.columns = [0] * self.SIZE
+        self.squares = [0] * self.SIZE
+        self.allowed = [self.ALL] * self.CELLS
+        self.trail = [] # стек заполненных ячеек и исключений (ячейка, прежняя маска) для отката
+
+    @staticmethod
+    def of_size(n):
+        # класс поля с квадратами n x n, таблицы строятся один раз на размер
+        if n == Board.N:
+            return Board
+        if n not in Board._sizes:
+            Board._sizes[n] = type(f"Board{n * n}", (Board,), dict(zip(Board.GEOMETRY, geometry(n)), __slots__ = ()))
+        return Board._sizes[n]
+
+    @staticmethod
+    def variant(spec, n = 3):
+        # класс поля с квадратами n x n и ограничениями описания spec (строка или Variant), таблицы графа
+        # ограничений строятся один раз на описание; для пустого описания - класс классического поля;
+        # ValueError - если описание неверно
+        variant = parse_variant(spec, n) if isinstance(spec, str) else spec
+        base = Board.of_size(n)
+        if not (variant.diagonal or variant.windoku or variant.cages):
+            return base
+        key = (n, format_variant(variant))
+        if key not in Board._variants:
+            Board._variants[key] = type(f"Board{n * n}V", (VariantBoard,),
+                                        dict({name: getattr(base, name) for name in Board.GEOMETRY}, **compile_variant(base, variant),
+                                                VARIANT = key[1], __slots__ = ()))
+        return Board._variants[key]
+
+    @staticmethod
+    def from_variant(line, spec = ''):
+        # поле задачи-строки с ограничениями spec (см. variant), None - если размер поля не из SIZES,
+        # описание неверно или не подходит к размеру, либо данные несогласованы (с учетом сумм клеток)
+        if not spec:
+            return Board.from_line(line)
+        n = round(len(line) ** 0.25)
+        if n not in SIZES or n ** 4 != len(line):
+            return None
+        try:
+            board = Board.variant(spec, n).from_line(line)
+        except ValueError:
+            return None
+        return board if board is None or not board.CAGES or board.cages_valid() else None
+
+    @classmethod
+    def empty(cls, count):
+        # пустое поле из count ячеек, None - если такого размера нет (у поля с ограничениями размер один)
+        if count != cls.CELLS:
+            n = round(count ** 0.25)
+            if n not in SIZES or n ** 4 != count or cls.VARIANT:
+                return None
+            cls = Board.of_size(n)
+        return cls()
+
+    @classmethod
+    def from_table(cls, table):
+        # построение поля по таблице Excel, None - если данные несогласованы
+        board = cls.empty(len(table) ** 2)
+        if board is None:
+            return None
+        size = board.SIZE
+        for i in range(size):
+            for j in range(size):
+                number = VALUES.get(table[i][j].number, size + 1)
+                if number:
+                    if number > size or not board.candidates(i * size + j) & (1 << (number - 1)):
+                        return None
+                    board.place(i * size + j, number)
+        return board
+
+    @classmethod
+    def from_cells(cls, cells):
+        # построение поля по списку значений, None - если данные несогласованы
+        board = cls.empty(len(cells))
+        if board is None:
+            return None
+        for idx, number in enumerate(cells):
+            if number:
+                if number > board.SIZE or not board.candidates(idx) & (1 << (number - 1)):
+                    return None
+                board.place(idx, number)
+        return board
+
+    @classmethod
+    def from_line(cls, line):
+        # построение поля по строке знаков SYMBOLS (81, 256 или 625), пустые ячейки - '0' или '.'
+        # None - если данные несогласованы
+        board = cls.empty(len(line))
+        if board is None:
+            return None
+        size = board.SIZE
+        for idx, char in enumerate(line):
+            number = VALUES.get(char, size + 1)
+            if number:
+                if number > size or not board.candidates(idx) & (1 << (number - 1)):
+                    return None
+                board.place(idx, number)
+        return board
+
+    def to_line(self):
+        return ''.join([SYMBOLS[number] for number in self.cells])
+
+    def to_table(self, table = None):
+        # представление поля таблицей Excel для интерфейса, признак исходного значения берется из table
+        size = self.SIZE
+        return list(list(Excel(SYMBOLS[self.cells[i * size + j]], bool(table and table[i][j].constant))
+                            for j in range(size)) for i in range(size))
+
+    def candidates(self, idx):
+        # битовая маска возможных значений ячейки
+        return self.allowed[idx] & ~(self.rows[self.ROW[idx]] | self.columns[self.COL[idx]] | self.squares[self.BOX[idx]])
+
+    def units_used(self):
+        # маски занятых значений групп в порядке UNITS
+        return self.rows + self.columns + self.squares
+
+    def place(self, idx, number):
+        bit = 1 << (number - 1)
+        self.cells[idx] = number
+        self.rows[self.ROW[idx]] |= bit
+        self.columns[self.COL[idx]] |= bit
+        self.squares[self.BOX[idx]] |= bit
+        self.trail.append(idx)
+
+    def eliminate(self, idx, mask):
+        # исключение значений mask из возможных для ячейки
+        old = self.allowed[idx]
+        if old & mask:
+            self.trail.append((idx, old))
+            self.allowed[idx] = old & ~mask
+
+    def undo(self, mark):
+        # откат заполнения ячеек и исключений до длины стека mark
+        trail = self.trail
+        while len(trail) > mark:
+            idx = trail.pop()
+            if idx.__class__ is tuple:
+                self.allowed[idx[0]] = idx[1]
+                continue
+            bit = ~(1 << (self.cells[idx] - 1))
+            self.cells[idx] = 0
+            self.rows[self.ROW[idx]] &= bit
+            self.columns[self.COL[idx]] &= bit
+            self.squares[self.BOX[idx]] &= bit
+
+    @staticmethod
+    def digits(mask):
+        # значения, соответствующие битам маски (кортеж); для масок поля 9x9 - из готовой таблицы
+        if mask < DIGITS_TABLE_SIZE:
+            return DIGITS_TABLE[mask]
+        result = []
+        while mask:
+            bit = mask & -mask
+            result.append(bit.bit_length())
+            mask ^= bit
+        return tuple(result)
+
+DIGITS_TABLE_SIZE = 1 << 9
+DIGITS_TABLE = [tuple(k + 1 for k in range(9) if mask >> k & 1) for mask in range(DIGITS_TABLE_SIZE)]
+
+# дополнительные ограничения: диагонали, окна (windoku) и клетки-суммы (killer) - кортежи (ячейки, сумма)
+Variant = namedtuple('Variant', 'diagonal windoku cages')
+
+def parse_variant(spec, n = 3):
+    # описание ограничений через ';': diagonal - обе диагонали, windoku - окна n x n между квадратами,
+    # cages=сумма@ячейка.ячейка...,... - клетки-суммы (ячейки - номера от 0 по строкам), например
+    # "diagonal;cages=15@0.1.9,7@2.3"; значения в клетке не повторяются; ValueError - если описание неверно
+    size = n * n
+    diagonal = windoku = False
+    cages = []
+    for part in (part.strip() for part in spec.split(';')):
+        if part == 'diagonal':
+            diagonal = True
+        elif part == 'windoku':
+            windoku = True
+        elif part.startswith('cages='):
+            for cage in filter(None, part[6:].split(',')):
+                try:
+                    total, cells = cage.split('@')
+                    cages.append((tuple(sorted(int(idx) for idx in cells.split('.'))), int(total)))
+                except ValueError:
+                    raise ValueError(f"неверная клетка {cage}, нужно сумма@ячейка.ячейка...")
+        elif part:
+            raise ValueError(f"неизвестное ограничение {part}, допустимы: diagonal, windoku, cages=...")
+    used = set()
+    for cells, total in cages:
+        if not 0 < len(cells) <= size or cells[0] < 0 or cells[-1] >= size * size or used & set(cells) or len(set(cells)) < len(cells):
+            raise ValueError(f"неверные ячейки клетки {total}@{'.'.join(map(str, cells))}")
+        if not len(cells) * (len(cells) + 1) // 2 <= total <= len(cells) * (2 * size - len(cells) + 1) // 2:
+            raise ValueError(f"сумму {total} нельзя набрать в клетке из {len(cells)} ячеек")
+        used.update(cells)
+    return Variant(diagonal, windoku, tuple(sorted(cages)))
+
+def format_variant(variant):
+    # описание ограничений строкой в виде parse_variant
+    parts = [name for name in ('diagonal', 'windoku') if getattr(variant, name)]
+    if variant.cages:
+        parts.append('cages=' + ','.join(f"{total}@{'.'.join(map(str, cells))}" for cells, total in variant.cages))
+    return ';'.join(parts)
+
+@lru_cache(maxsize=None)
+def cage_combos(size, count, total):
+    # маски наборов из count различных значений 1..size с суммой total; перебор сочетаний строится один раз
+    # на (count, total), но на полях 16x16 и 25x25 он быстрый только для небольших клеток
+    if not 0 < count <= size or not count * (count + 1) // 2 <= total <= count * (2 * size - count + 1) // 2:
+        return ()
+    return tuple(sum(1 << (number - 1) for number in combo) for combo in combinations(range(1, size + 1), count)
+                    if sum(combo) == total)
+
+def compile_variant(base, variant):
+    # таблицы поля с ограничениями variant для классического поля base: дополнительные группы и граф ограничений с ними
+    n, size, cells, units = base.N, base.SIZE, base.CELLS, base.UNITS
+    houses = []
+    if variant.diagonal:
+        houses.append([k * size + k for k in range(size)])
+        houses.append([k * size + size - 1 - k for k in range(size)])
+    if variant.windoku:
+        starts = [1 + k * (n + 1) for k in range(n - 1)]
+        houses.extend([(top + k // n) * size + left + k % n for k in range(size)] for top in starts for left in starts)
+    extra = houses + [list(group) for group, _ in variant.cages]
+    cell_extra, _ = constraint_graph(extra, cells)
+    cell_groups, peers = constraint_graph(units + extra, cells)
+    return {'UNITS': units + houses, 'HOUSES': houses, 'CAGES': variant.cages, 'EXTRA': extra, 'CELL_EXTRA': cell_extra,
+            # соседи только по дополнительным группам, с ними значение исключается через allowed
+            'EXTRA_PEERS': [tuple(sorted(set(peers[idx]) - set(base.PEERS[idx]))) for idx in range(cells)],
+            'GROUPS': units + extra, 'CELL_GROUPS': cell_groups, 'PEERS': peers}
+
+class VariantBoard(Board):
+    ''' поле с дополнительными ограничениями (классы строит Board.variant): extras - маски занятых значений
+        дополнительных групп EXTRA; значение, размещенное в ячейке, исключается через allowed из её соседей
+        по дополнительным группам (EXTRA_PEERS), поэтому candidates, решатели и откат по trail работают
+        как с классическим полем; prune - отсечение кандидатов по суммам клеток '''
+    CELL_EXTRA = () # номера дополнительных групп ячейки (в EXTRA)
+    EXTRA_PEERS = ()
+
+    __slots__ = ('extras',)
+
+    def __init__(self):
+        super().__init__()
+        self.extras = [0] * len(self.EXTRA)
+
+    def units_used(self):
+        return self.rows + self.columns + self.squares + self.extras[:len(self.HOUSES)]
+
+    def place(self, idx, number):
+        super().place(idx, number)
+        bit = 1 << (number - 1)
+        extras, cells = self.extras, self.cells
+        for group in self.CELL_EXTRA[idx]:
+            extras[group] |= bit
+        for peer in self.EXTRA_PEERS[idx]:
+            if not cells[peer]:
+                self.eliminate(peer, bit)
+
+    def undo(self, mark):
+        # как Board.undo, дополнительно снимаются значения из масок дополнительных групп
+        trail, extras = self.trail, self.extras
+        while len(trail) > mark:
+            idx = trail.pop()
+            if idx.__class__ is tuple:
+                self.allowed[idx[0]] = idx[1]
+                continue
+            bit = ~(1 << (self.cells[idx] - 1))
+            self.cells[idx] = 0
+            self.rows[self.ROW[idx]] &= bit
+            self.columns[self.COL[idx]] &= bit
+            self.squares[self.BOX[idx]] &= bit
+            for group in self.CELL_EXTRA[idx]:
+                extras[group] &= bit
+
+    def cages_valid(self):
+        # суммы значений клеток не больше сумм клеток, у заполненных клеток - равны (как LiveBoard.valid)
+        cells = self.cells
+        for group, total in self.CAGES:
+            values = [cells[idx] for idx in group]
+            placed = sum(values)
+            if placed > total or placed != total and all(values):
+                return False
+        return True
+
+    def prune(self):
+        # из кандидатов пустых ячеек клетки исключаются значения, не входящие ни в один набор различных значений
+        # с недостающей суммой; возвращает число измененных ячеек, Propagator.CONTRADICTION - если набора нет
+        cells, extras = self.cells, self.extras
+        offset = len(self.HOUSES)
+        changed = 0
+        for number, (group, total) in enumerate(self.CAGES):
+            used = extras[offset + number]
+            rest = total - sum(Board.digits(used))
+            empty = [(idx, self.candidates(idx)) for idx in group if not cells[idx]]
+            if not empty:
+                if rest:
+                    return Propagator.CONTRADICTION
+                continue
+            union = 0
+            for _, mask in empty:
+                union |= mask
+            feasible = 0
+            for combo in cage_combos(self.SIZE, len(empty), rest):
+                if not combo & ~union:
+                    feasible |= combo
+            if not feasible:
+                return Propagator.CONTRADICTION
+            for idx, mask in empty:
+                if mask & ~feasible:
+                    self.eliminate(idx, mask & ~feasible)
+                    changed += 1
+        return changed
+
+class LiveBoard():
+    ''' поле ручного ввода с пошаговым обновлением: для каждой группы графа ограничений (Board.GROUPS) хранится
+        число ячеек с каждым значением, поэтому set за O(1) поддерживает маски занятых значений,
+        повторения значений в группах (конфликты) и кандидатов пустых ячеек без пересчета всего поля;
+        для клеток-сумм - сумма и число заполненных ячеек, клетка с превышением суммы или полная клетка
+        с другой суммой - тоже конфликт; to_board - поле решателя из этих же масок без повторного заполнения '''
+
+    def __init__(self, n = 3, variant = ''):
+        # variant - описание дополнительных ограничений (parse_variant)
+        self.board_class = Board.variant(variant, n)
+        board_class = self.board_class
+        groups = len(board_class.GROUPS)
+        self.stride = board_class.SIZE + 1
+        self.cells = [0] * board_class.CELLS
+        self.counts = [0] * (groups * self.stride) # группа * stride + значение -> число ячеек
+        self.masks = [0] * groups # маски занятых значений групп, для классического поля - как Board.units_used()
+        self.unit_ids = board_class.CELL_GROUPS
+        self.duplicates = 0 # лишние повторения значений во всех группах
+        # клетки-суммы по номерам групп (после UNITS): [сумма, заполнено ячеек, нужная сумма, ячеек в клетке]
+        first = len(board_class.UNITS)
+        self.cages = {first + number: [0, 0, total, len(cells)] for number, (cells, total) in enumerate(board_class.CAGES)}
+        self.bad_cages = 0
+
+    @classmethod
+    def from_table(cls, table, variant = ''):
+        # поле по таблице Excel, знаки вне набора значений считаются пустыми ячейками
+        live = cls(Sudoku.box_size(table), variant)
+        size = len(table)
+        for i in range(size):
+            for j in range(size):
+                number = VALUES.get(table[i][j].number, 0)
+                if number <= size:
+                    live.set(i * size + j, number)
+        return live
+
+    @property
+    def valid(self):
+        return self.duplicates == 0 and self.bad_cages == 0
+
+    def set(self, idx, number):
+        # запись значения number (0 - очистка) в ячейку idx
+        old = self.cells[idx]
+        if old == number:
+            return
+        self.cells[idx] = number
+        counts, masks, stride = self.counts, self.masks, self.stride
+        for unit in self.unit_ids[idx]:
+            if old:
+                k = unit * stride + old
+                counts[k] -= 1
+                if counts[k]:
+                    self.duplicates -= 1
+                else:
+                    masks[unit] &= ~(1 << (old - 1))
+            if number:
+                k = unit * stride + number
+                if counts[k]:
+                    self.duplicates += 1
+                else:
+                    masks[unit] |= 1 << (number - 1)
+                counts[k] += 1
+            if unit in self.cages:
+                cage = self.cages[unit]
+                self.bad_cages -= self.bad_cage(cage)
+                cage[0] += number - old
+                cage[1] += bool(number) - bool(old)
+                self.bad_cages += self.bad_cage(cage)
+
+    @staticmethod
+    def bad_cage(cage):
+        total, filled, target, cells = cage
+        return total > target or (filled == cells and total != target)
+
+    def conflict(self, idx):
+        # значение ячейки повторяется в её группах или нарушена сумма её клетки
+        number = self.cells[idx]
+        return bool(number) and any(self.counts[unit * self.stride + number] > 1
+                                    or (unit in self.cages and self.bad_cage(self.cages[unit])) for unit in self.unit_ids[idx])
+
+    def candidates(self, idx):
+        # битовая маска значений, которых нет в группах ячейки
+        used = 0
+        for unit in self.unit_ids[idx]:
+            used |= self.masks[unit]
+        return self.board_class.ALL & ~used
+
+    def peers(self, idx):
+        # ячейки групп ячейки idx (включая её саму)
+        return set(self.board_class.PEERS[idx]) | {idx}
+
+    def to_board(self):
+        # поле решателя с теми же значениями, None - если есть конфликты
+        if not self.valid:
+            return None
+        if self.board_class.VARIANT:
+            return self.board_class.from_cells(self.cells) # исключения у соседей по дополнительным группам
+        board = self.board_class()
+        size = board.SIZE
+        board.cells = self.cells[:]
+        board.rows = self.masks[:size]
+        board.columns = self.masks[size:2 * size]
+        board.squares = self.masks[2 * size:]
+        board.trail = [idx for idx, number in enumerate(self.cells) if number]
+        return board
+
+class Tracer():
+    ''' приёмник событий поиска решателя, подключается через solver.tracer;
+        все события передаются в event(name, depth, **data), который по умолчанию ничего не делает '''
+
+    def event(self, name, depth, **data):
+        pass
+
+    def node(self, depth):
+        self.event('node', depth)
+
+    def singles(self, depth, count):
+        self.event('singles', depth, count=count)
+
+    def contradiction(self, depth):
+        self.event('contradiction', depth)
+
+    def branch(self, depth, idx, values):
+        # ветвление поиска по графу: idx - ячейка, values - её значения
+        self.event('branch', depth, cell=idx, values=list(values))
+
+    def branch_column(self, depth, column, options):
+        # ветвление DLX: column - номер ограничения, options - варианты (ячейка, значение)
+        self.event('branch', depth, column=column, options=list(options))
+
+    def try_value(self, depth, idx, number):
+        self.event('try', depth, cell=idx, number=number)
+
+    def backtrack(self, depth, idx, number):
+        self.event('backtrack', depth, cell=idx, number=number)
+
+    def solution(self, depth):
+        self.event('solution', depth)
+
+    def timing(self, stage, elapsed):
+        # elapsed - наносекунды, затраченные на этап stage
+        pass
+
+class EventLog(Tracer):
+    ''' поток событий: в callback(name, depth, data) или в список events '''
+
+    def __init__(self, callback = None):
+        self.callback = callback
+        self.events = []
+
+    def event(self, name, depth, **data):
+        if self.callback:
+            self.callback(name, depth, data)
+        else:
+            self.events.append((name, depth, data))
+
+class TracerGroup(Tracer):
+    ''' передача событий сразу нескольким приёмникам '''
+
+    def __init__(self, *tracers):
+        self.tracers = tracers
+
+    def node(self, depth):
+        for tracer in self.tracers:
+            tracer.node(depth)
+
+    def singles(self, depth, count):
+        for tracer in self.tracers:
+            tracer.singles(depth, count)
+
+    def contradiction(self, depth):
+        for tracer in self.tracers:
+            tracer.contradiction(depth)
+
+    def branch(self, depth, idx, values):
+        for tracer in self.tracers:
+            tracer.branch(depth, idx, values)
+
+    def branch_column(self, depth, column, options):
+        for tracer in self.tracers:
+            tracer.branch_column(depth, column, options)
+
+    def try_value(self, depth, idx, number):
+        for tracer in self.tracers:
+            tracer.try_value(depth, idx, number)
+
+    def backtrack(self, depth, idx, number):
+        for tracer in self.tracers:
+            tracer.backtrack(depth, idx, number)
+
+    def solution(self, depth):
+        for tracer in self.tracers:
+            tracer.solution(depth)
+
+    def timing(self, stage, elapsed):
+        for tracer in self.tracers:
+            tracer.timing(stage, elapsed)
+
+class SolverStats(Tracer):
+    ''' сводная статистика поиска: глубина, ширина ветвлений, откаты, время по этапам '''
+
+    def __init__(self):
+        self.nodes = 0
+        self.max_depth = 0
+        self.branching = {} # число вариантов в ветвлении -> число ветвлений
+        self.tried = 0
+        self.backtracks = 0
+        self.contradictions = 0
+        self.filled = 0 # заполнено однозначных ячеек
+        self.solutions = 0
+        self.times = {} # этап -> наносекунды
+
+    def node(self, depth):
+        self.nodes += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def singles(self, depth, count):
+        self.filled += count
+
+    def contradiction(self, depth):
+        self.contradictions += 1
+
+    def branch(self, depth, idx, values):
+        self.branching[len(values)] = self.branching.get(len(values), 0) + 1
+
+    def branch_column(self, depth, column, options):
+        self.branch(depth, None, options)
+
+    def try_value(self, depth, idx, number):
+        self.tried += 1
+
+    def backtrack(self, depth, idx, number):
+        self.backtracks += 1
+
+    def solution(self, depth):
+        self.solutions += 1
+
+    def timing(self, stage, elapsed):
+        self.times[stage] = self.times.get(stage, 0) + elapsed
+
+    def as_dict(self):
+        return {'nodes': self.nodes, 'max_depth': self.max_depth, 'branching': dict(sorted(self.branching.items())),
+                'tried': self.tried, 'backtracks': self.backtracks, 'contradictions': self.contradictions,
+                'singles': self.filled, 'solutions': self.solutions,
+                'times_ms': {stage: elapsed / 1000000 for stage, elapsed in self.times.items()}}
+
+class Interrupt(Exception):
+    ''' прерывание поиска, args[0] - причина: Stopper.CANCELLED или Stopper.TIMEOUT '''
+
+class Stopper(Tracer):
+    ''' прерывание поиска исключением Interrupt в очередном узле: по событию cancelled (threading.Event)
+        или по истечении deadline (perf_counter_ns); после прерывания состояние решателя не восстанавливается '''
+    CANCELLED = 'cancelled'
+    TIMEOUT = 'timeout'
+
+    def __init__(self, cancelled, deadline = None):
+        self.cancelled = cancelled
+        self.deadline = deadline
+
+    def node(self, depth):
+        if self.cancelled.is_set():
+            raise Interrupt(Stopper.CANCELLED)
+        if self.deadline and perf_counter_ns() > self.deadline:
+            raise Interrupt(Stopper.TIMEOUT)
+
+class Solver():
+    ''' общий интерфейс решателей: solve(board) дописывает решение в board и возвращает True,
+        либо возвращает False, оставляя board без изменений; counter - число узлов поиска;
+        count_solutions(board, limit) - число решений, не больше limit, board не изменяется '''
+    name = ''
+
+    def __init__(self):
+        self.counter = 0
+        self.tracer = None # приёмник событий поиска (Tracer), None - без затрат на учет
+        self.found = 0 # найдено решений
+        self.limit = 1 # поиск прекращается после limit решений
+        self.solution = None # значения 81 ячейки первого найденного решения
+
+    def start(self, limit):
+        self.counter = 0
+        self.found = 0
+        self.limit = limit
+        self.solution = None
+
+    def solve(self, board):
+        raise NotImplementedError
+
+    def count_solutions(self, board, limit = 2):
+        raise NotImplementedError
+
+class Propagator():
+    ''' логические приёмы, применяемые к полю до неподвижной точки перед ветвлением;
+        hits - число срабатываний каждого приёма (заполненных ячеек или исключений) '''
+    TECHNIQUES = ('hidden_single', 'naked_pair', 'hidden_pair', 'pointing', 'claiming')
+    CONTRADICTION = -1
+
+    def __init__(self, techniques = TECHNIQUES):
+        self.techniques = list(techniques)
+        self.hits = {}
+        self.reset()
+
+    def reset(self):
+        self.hits = dict.fromkeys(('naked_single',) + Propagator.TECHNIQUES, 0)
+
+    def apply(self, board):
+        # первый сработавший приём по порядку: число изменений, 0 - нет изменений, CONTRADICTION - противоречие
+        cells = board.cells
+        cand = [0 if cells[idx] else board.candidates(idx) for idx in range(board.CELLS)]
+        for name in self.techniques:
+            result = getattr(self, name)(board, cand)
+            if result:
+                if result > 0:
+                    self.hits[name] += result
+                return result
+        return 0
+
+    @staticmethod
+    def exclude(board, cand, cells, mask):
+        # исключение значений mask из ячеек cells, возвращает число измененных ячеек
+        changed = 0
+        for idx in cells:
+            if cand[idx] & mask:
+                board.eliminate(idx, mask)
+                cand[idx] &= ~mask
+                changed += 1
+        return changed
+
+    @staticmethod
+    def hidden_single(board, cand):
+        # значение возможно только в одной ячейке группы
+        cells = board.cells
+        hits = 0
+        for unit, used in zip(board.UNITS, board.units_used()):
+            once = twice = 0
+            for idx in unit:
+                twice |= once & cand[idx]
+                once |= cand[idx]
+            if (once | used) != board.ALL:
+                return Propagator.CONTRADICTION # значению негде стоять
+            singles = once & ~twice
+            if not singles:
+                continue
+            for idx in unit:
+                bit = cand[idx] & singles
+                if not bit:
+                    continue
+                number = bit.bit_length()
+                if bit & (bit - 1) or (cells[idx] and cells[idx] != number):
+                    return Propagator.CONTRADICTION # ячейке нужны два значения
+                if cells[idx]:
+                    continue
+                if not board.candidates(idx) & bit:
+                    return Propagator.CONTRADICTION
+                board.place(idx, number)
+                hits += 1
+        return hits
+
+    @staticmethod
+    def naked_pair(board, cand):
+        # две ячейки группы с одинаковой парой значений: пара исключается из остальных ячеек
+        hits = 0
+        for unit in board.UNITS:
+            pairs = {}
+            for idx in unit:
+                mask = cand[idx]
+                if mask.bit_count() == 2:
+                    if mask in pairs:
+                        hits += Propagator.exclude(board, cand, [other for other in unit if other != idx and other != pairs[mask]], mask)
+                    else:
+                        pairs[mask] = idx
+        return hits
+
+    @staticmethod
+    def hidden_pair(board, cand):
+        # два значения возможны только в одних и тех же двух ячейках группы: прочие значения этих ячеек исключаются
+        hits = 0
+        size = board.SIZE
+        for unit in board.UNITS:
+            places = [0] * (size + 1) # битовые маски позиций значения в группе
+            for position, idx in enumerate(unit):
+                for number in Board.digits(cand[idx]):
+                    places[number] |= 1 << position
+            pairs = {}
+            for number in range(1, size + 1):
+                if places[number].bit_count() == 2:
+                    if places[number] in pairs:
+                        mask = (1 << (number - 1)) | (1 << (pairs[places[number]] - 1))
+                        pair_cells = [idx for position, idx in enumerate(unit) if places[number] >> position & 1]
+                        hits += Propagator.exclude(board, cand, pair_cells, board.ALL & ~mask)
+                    else:
+                        pairs[places[number]] = number
+        return hits
+
+    @staticmethod
+    def pointing(board, cand):
+        # значение в квадрате возможно только на одной линии: исключается из остатка линии
+        hits = 0
+        for cells, line_rest, square_rest in board.SEGMENTS:
+            segment = rest = 0
+            for idx in cells:
+                segment |= cand[idx]
+            for idx in square_rest:
+                rest |= cand[idx]
+            if segment & ~rest:
+                hits += Propagator.exclude(board, cand, line_rest, segment & ~rest)
+        return hits
+
+    @staticmethod
+    def claiming(board, cand):
+        # значение на линии возможно только в одном квадрате: исключается из остатка квадрата
+        hits = 0
+        for cells, line_rest, square_rest in board.SEGMENTS:
+            segment = rest = 0
+            for idx in cells:
+                segment |= cand[idx]
+            for idx in line_rest:
+                rest |= cand[idx]
+            if segment & ~rest:
+                hits += Propagator.exclude(board, cand, square_rest, segment & ~rest)
+        return hits
+
+class Branching():
+    ''' стратегия ветвления поиска по графу: choose(board, multivalue_cells) -> (ячейка, значения в порядке перебора);
+        multivalue_cells - многозначные ячейки наименьшего ранга [(ячейка, маска)], то есть отбор по наименьшему
+        числу кандидатов (MRV) уже сделан в GraphSolver.propagate; стратегия выбирает среди них ячейку и порядок значений '''
+    name = ''
+
+    def choose(self, board, multivalue_cells):
+        raise NotImplementedError
+
+    @staticmethod
+    def degree(board, idx):
+        # число пустых ячеек в строке, столбце и квадрате ячейки по маскам занятых значений поля,
+        # которые поле и так поддерживает при каждом размещении и откате (пересечения считаются дважды)
+        return 3 * board.SIZE - (board.rows[board.ROW[idx]].bit_count() + board.columns[board.COL[idx]].bit_count()
+                                    + board.squares[board.BOX[idx]].bit_count())
+
+class FrequencyBranching(Branching):
+    ''' ячейка с самым частым значением среди многозначных ячеек, значения по убыванию частоты '''
+    name = 'самое частое значение'
+
+    def choose(self, board, multivalue_cells):
+        size = board.SIZE
+        frequency = [0] * (size + 1)
+        digits = Board.digits
+        for idx, mask in multivalue_cells:
+            for number in digits(mask):
+                frequency[number] += 1
+        max_frequency_value = max(range(1, size + 1), key=frequency.__getitem__)
+        bit = 1 << (max_frequency_value - 1)
+        for idx, mask in multivalue_cells:
+            if mask & bit:
+                return idx, sorted(digits(mask), key=frequency.__getitem__, reverse=True)
+
+class MRVBranching(Branching):
+    ''' первая ячейка с наименьшим числом кандидатов, значения по возрастанию '''
+    name = 'наименьшее число кандидатов'
+
+    def choose(self, board, multivalue_cells):
+        idx, mask = multivalue_cells[0]
+        return idx, list(Board.digits(mask))
+
+class DegreeBranching(Branching):
+    ''' среди ячеек с наименьшим числом кандидатов - связанная с наибольшим числом пустых ячеек,
+        значения по возрастанию '''
+    name = 'наибольшая степень'
+
+    def choose(self, board, multivalue_cells):
+        idx, mask = max(multivalue_cells, key=lambda cell: Branching.degree(board, cell[0]))
+        return idx, list(Board.digits(mask))
+
+class LCVBranching(DegreeBranching):
+    ''' ячейка как у DegreeBranching, значения в порядке наименьшего ограничения:
+        сначала значение, которое исключается из кандидатов меньшего числа соседних ячеек '''
+    name = 'наименее ограничивающее значение'
+
+    def choose(self, board, multivalue_cells):
+        idx, values = super().choose(board, multivalue_cells)
+        cells = board.cells
+        counts = [0] * (board.SIZE + 1)
+        for peer in board.PEERS[idx]:
+            if not cells[peer]:
+                for number in Board.digits(board.candidates(peer)):
+                    counts[number] += 1
+        return idx, sorted(values, key=counts.__getitem__)
+
+BRANCHINGS = {'frequency': FrequencyBranching, 'mrv': MRVBranching, 'degree': DegreeBranching, 'lcv': LCVBranching}
+DEFAULT_BRANCHING = 'frequency'
+
+class GraphSolver(Solver):
+    ''' поиск заполнения по графу с отбором самого частого значения на явном стеке (см. Search),
+        перед каждым ветвлением - заполнение однозначных ячеек и логические приёмы techniques '''
+    name = 'поиск по графу'
+    TECHNIQUES = ()
+    SLICE = 256 # узлов между обновлениями counter во время поиска
+
+    def __init__(self, techniques = None, branching = DEFAULT_BRANCHING):
+        super().__init__()
+        self.set_techniques(self.TECHNIQUES if techniques is None else techniques)
+        self.set_branching(branching)
+
+    def set_techniques(self, techniques):
+        # включение логических приёмов из Propagator.TECHNIQUES, пустой список - только однозначные ячейки
+        self.propagator = Propagator(techniques) if techniques else None
+
+    def set_branching(self, branching):
+        # стратегия ветвления по имени из BRANCHINGS
+        self.branching = BRANCHINGS[branching]()
+
+    def start(self, limit):
+        super().start(limit)
+        if self.propagator:
+            self.propagator.reset()
+
+    def solve(self, board):
+        self.start(1)
+        return self.run(Search(self, board, 1)) > 0
+
+    def count_solutions(self, board, limit = 2):
+        self.start(limit)
+        mark = len(board.trail)
+        self.run(Search(self, board, limit))
+        board.undo(mark)
+        return self.found
+
+    def run(self, search):
+        # поиск до конца, counter обновляется каждые SLICE узлов, чтобы его можно было наблюдать из другого потока
+        while not search.step(self.SLICE):
+            self.counter = search.counter
+        self.counter, self.found, self.solution = search.counter, search.found, search.solution
+        return search.found
+
+    def propagate(self, board, depth = 0):
+        # заполнение однозначных ячеек и логические приёмы до неподвижной точки;
+        # возвращает многозначные ячейки наименьшего ранга [(ячейка, маска)], пустой список - поле заполнено,
+        # None - противоречие; откат изменений при противоречии - за вызывающим
+        cells, rows, columns, squares = board.cells, board.rows, board.columns, board.squares
+        allowed = board.allowed
+        ROW, COL, BOX = board.ROW, board.COL, board.BOX
+        tracer = self.tracer
+        if tracer:
+            tracer.node(depth)
+        while True:
+            # заполняем однозначные ячейки до тех пор, пока они появляются
+            singles = 0
+            rank = board.SIZE + 1
+            multivalue_cells = []
+            if tracer:
+                started = perf_counter_ns()
+            for idx in range(board.CELLS):
+                if cells[idx]:
+                    continue
+                mask = allowed[idx] & ~(rows[ROW[idx]] | columns[COL[idx]] | squares[BOX[idx]])
+                if not mask:
+                    # нет решения!
+                    if tracer:
+                        tracer.timing('candidates', perf_counter_ns() - started)
+                        tracer.contradiction(depth)
+                    return None
+                count = mask.bit_count()
+                if count == 1:
+                    board.place(idx, mask.bit_length())
+                    singles += 1
+                elif not singles:
+                    if count < rank:
+                        rank = count
+                        multivalue_cells = [(idx, mask)]
+                    elif count == rank:
+                        multivalue_cells.append((idx, mask))
+            if tracer:
+                tracer.timing('candidates', perf_counter_ns() - started)
+            if singles:
+                if tracer:
+                    tracer.singles(depth, singles)
+                if self.propagator:
+                    self.propagator.hits['naked_single'] += singles
+                continue
+            if board.CAGES:
+                # отсечение по суммам клеток, после исключений - снова однозначные ячейки
+                progress = board.prune()
+                if progress < 0:
+                    if tracer:
+                        tracer.contradiction(depth)
+                    return None
+                if progress:
+                    continue
+            if not self.propagator:
+                return multivalue_cells
+            # логические приёмы, после успешного - снова однозначные ячейки
+            if tracer:
+                started = perf_counter_ns()
+            progress = self.propagator.apply(board)
+            if tracer:
+                tracer.timing('propagation', perf_counter_ns() - started)
+            if progress < 0:
+                if tracer:
+                    tracer.contradiction(depth)
+                return None
+            if not progress:
+                return multivalue_cells
+
+    def branch(self, board, multivalue_cells, depth = 0):
+        # ячейка ветвления и порядок её значений
+        tracer = self.tracer
+        if tracer:
+            started = perf_counter_ns()
+        idx, values = self.branching.choose(board, multivalue_cells)
+        if tracer:
+            tracer.timing('choice', perf_counter_ns() - started)
+            tracer.branch(depth, idx, values)
+        return idx, values
+
+class Search():
+    ''' поиск решателя GraphSolver на явном стеке вместо рекурсии Python:
+        step(nodes) продвигает поиск не больше чем на nodes узлов и возвращает True, когда поиск закончен,
+        между вызовами поиск приостановлен, поэтому несколько поисков можно чередовать;
+        state() - состояние из строк и чисел (для json или pickle), Search.resume(solver, state) продолжает поиск.
+        После limit решений оставляет board заполненным,
+        иначе откатывает board к исходному состоянию '''
+
+    def __init__(self, solver, board, limit = 1):
+        self.solver = solver
+        self.board = board
+        self.limit = limit
+        self.root = board.to_line() # исходные значения для сериализации
+        self.frames = [] # ветвления: [метка узла, метка ветвления, ячейка, значения, число испробованных значений]
+        self.counter = 0
+        self.found = 0
+        self.solution = None
+        self.done = False
+
+    def step(self, nodes = 1):
+        board, frames, solver = self.board, self.frames, self.solver
+        tracer = solver.tracer
+        while nodes > 0 and not self.done:
+            # раскрытие очередного узла: поле в нем уже получено размещением значения ветвления
+            nodes -= 1
+            self.counter += 1
+            depth = len(frames)
+            mark = len(board.trail)
+            multivalue_cells = solver.propagate(board, depth)
+            if multivalue_cells is None:
+                board.undo(mark)
+            elif not multivalue_cells:
+                # поле заполнено - найдено решение
+                if tracer:
+                    tracer.solution(depth)
+                self.found += 1
+                if self.solution is None:
+                    self.solution = board.cells[:]
+                if self.found >= self.limit:
+                    self.done = True
+                    break
+                board.undo(mark)
+            else:
+                idx, values = solver.branch(board, multivalue_cells, depth)
+                frames.append([mark, len(board.trail), idx, values, 0])
+            self.next_value()
+        return self.done
+
+    def next_value(self):
+        # размещение следующего значения верхнего ветвления, исчерпанные ветвления снимаются со стека
+        board, frames, tracer = self.board, self.frames, self.solver.tracer
+        while frames:
+            frame = frames[-1]
+            mark, branch_mark, idx, values, tried = frame
+            depth = len(frames) - 1
+            if tried:
+                if tracer:
+                    tracer.backtrack(depth, idx, values[tried - 1])
+                board.undo(branch_mark)
+            if tried < len(values):
+                if tracer:
+                    tracer.try_value(depth, idx, values[tried])
+                board.place(idx, values[tried])
+                frame[4] = tried + 1
+                return
+            board.undo(mark)
+            frames.pop()
+        self.done = True # перебраны все ветви корня
+
+    def state(self):
+        return {'cells': self.root, 'variant': self.board.VARIANT, 'limit': self.limit, 'counter': self.counter,
+                'found': self.found, 'solution': ''.join(SYMBOLS[number] for number in self.solution) if self.solution else None,
+                'done': self.done, 'path': [[idx, values, tried] for _, _, idx, values, tried in self.frames]}
+
+    @staticmethod
+    def resume(solver, state):
+        # восстановление поиска: от исходного поля повторяются заполнение однозначных ячеек
+        # и размещения значений пути, без событий и учета срабатываний приёмов
+        board = Board.variant(state.get('variant', ''), round(len(state['cells']) ** 0.25)).from_line(state['cells'])
+        search = Search(solver, board, state['limit'])
+        search.counter, search.found, search.done = state['counter'], state['found'], state['done']
+        if state['solution']:
+            search.solution = [VALUES[char] for char in state['solution']]
+        tracer, solver.tracer = solver.tracer, None
+        hits = dict(solver.propagator.hits) if solver.propagator else None
+        try:
+            for idx, values, tried in state['path']:
+                mark = len(board.trail)
+                solver.propagate(board)
+                search.frames.append([mark, len(board.trail), idx, values, tried])
+                board.place(idx, values[tried - 1])
+            if search.done and search.solution and search.found >= search.limit:
+                solver.propagate(board) # поле с решением
+        finally:
+            solver.tracer = tracer
+            if hits is not None:
+                solver.propagator.hits = hits
+        return search
+
+class LogicSolver(GraphSolver):
+    ''' поиск по графу с логическими приёмами перед каждым ветвлением '''
+    name = 'логика и поиск по графу'
+    TECHNIQUES = Propagator.TECHNIQUES
+
+class DLXSolver(Solver):
+    ''' алгоритм X Кнута на танцующих ссылках (Dancing Links): точное покрытие ограничений
+        (ячейка, значение в строке, в столбце, в квадрате) вариантами "значение в ячейке",
+        для поля 9x9 - 324 ограничения и 729 вариантов; у поля с дополнительными ограничениями
+        диагонали и окна - такие же столбцы, клетки-суммы - необязательные столбцы (значение не больше
+        одного раза), варианты с недостижимой суммой клетки отсекаются при переборе '''
+    name = 'алгоритм X (DLX)'
+    _templates = {} # матрица ограничений строится один раз на класс поля и копируется решателями
+
+    def __init__(self):
+        super().__init__()
+        self.rows = [] # стек выбранных вариантов
+        self.givens = None # значения ячеек исходного поля
+        self.load(Board)
+
+    def load(self, board_class):
+        # матрица ограничений для полей класса board_class
+        if board_class not in DLXSolver._templates:
+            DLXSolver._templates[board_class] = DLXSolver.build(board_class)
+        (left, right, up, down, column, size, rowof, rowstart) = DLXSolver._templates[board_class]
+        self.L, self.R, self.U, self.D = list(left), list(right), list(up), list(down)
+        self.C, self.S = column, list(size)
+        self.rowof, self.rowstart = rowof, rowstart
+        self.size = board_class.SIZE
+        self.board_class = board_class
+        self.cages = board_class.CAGES
+        self.cage_of = None # для клеток-сумм - состояние клетки каждой ячейки (см. count_solutions)
+
+    @staticmethod
+    def build(board_class = Board):
+        # узел 0 - корень, 1..4 * CELLS - заголовки столбцов, затем заголовки столбцов дополнительных групп
+        # (не связанные с корнем для клеток-сумм), далее по узлу на каждый столбец каждого варианта
+        cells, side = board_class.CELLS, board_class.SIZE
+        primary = 4 * cells + len(board_class.HOUSES) * side
+        n = 4 * cells + len(board_class.EXTRA) * side + 1
+        left = [i - 1 for i in range(primary + 1)] + list(range(primary + 1, n))
+        right = [i + 1 for i in range(primary + 1)] + list(range(primary + 1, n))
+        left[0], right[primary] = primary, 0
+        up = list(range(n))
+        down = list(range(n))
+        column = list(range(n))
+        size = [0] * n
+        rowof = [-1] * n
+        rowstart = []
+        for idx in range(cells):
+            for number in range(1, side + 1):
+                row = idx * side + number - 1
+                first = len(column)
+                rowstart.append(first)
+                columns = (idx, cells + board_class.ROW[idx] * side + number - 1,
+                            2 * cells + board_class.COL[idx] * side + number - 1,
+                            3 * cells + board_class.BOX[idx] * side + number - 1)
+                if board_class.VARIANT:
+                    columns += tuple(4 * cells + group * side + number - 1 for group in board_class.CELL_EXTRA[idx])
+                count = len(columns)
+                for k, col in enumerate(columns):
+                    head = col + 1
+                    node = first + k
+                    left.append(first + (k - 1) % count)
+                    right.append(first + (k + 1) % count)
+                    up.append(up[head])
+                    down.append(head)
+                    down[up[head]] = node
+                    up[head] = node
+                    column.append(head)
+                    rowof.append(row)
+                    size[head] += 1
+        return left, right, up, down, column, size, rowof, rowstart
+
+    def cover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[c]] = L[c]
+        R[L[c]] = R[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[c]] = c
+        R[L[c]] = c
+
+    def column_nodes(self, c):
+        # узлы вариантов, покрывающих столбец c
+        nodes = []
+        node = self.D[c]
+        while node != c:
+            nodes.append(node)
+            node = self.D[node]
+        return nodes
+
+    def select(self, node):
+        # включение варианта в решение: покрытие всех его столбцов
+        j = node
+        while True:
+            self.cover(self.C[j])
+            j = self.R[j]
+            if j == node:
+                break
+
+    def deselect(self, node):
+        j = self.L[node]
+        while True:
+            self.uncover(self.C[j])
+            if j == node:
+                break
+            j = self.L[j]
+
+    def solve(self, board):
+        if not self.count_solutions(board, 1):
+            return False
+        for idx in range(board.CELLS):
+            if not board.cells[idx]:
+                board.place(idx, self.solution[idx])
+        return True
+
+    def count_solutions(self, board, limit = 2):
+        # после поиска матрица возвращается в исходное состояние для следующего вызова
+        self.start(limit)
+        self.rows = []
+        self.givens = board.cells
+        if board.__class__ is not self.board_class:
+            self.load(board.__class__)
+        size = self.size
+        givens = [self.rowstart[idx * size + number - 1] for idx, number in enumerate(board.cells) if number]
+        hidden = []
+        if self.cages:
+            # состояние клеток-сумм по ячейкам: [недостающая сумма, пустых ячеек], общее для ячеек клетки;
+            # варианты со значениями, которых нет ни в одном наборе с нужной суммой, убираются из матрицы
+            self.cage_of = [None] * board.CELLS
+            for group, total in self.cages:
+                used = sum(1 << (board.cells[idx] - 1) for idx in group if board.cells[idx])
+                cage = [total - sum(board.cells[idx] for idx in group), sum(not board.cells[idx] for idx in group)]
+                feasible = 0
+                for combo in cage_combos(size, cage[1], cage[0]):
+                    if not combo & used:
+                        feasible |= combo
+                if cage[1] and not feasible or not cage[1] and cage[0]:
+                    return 0
+                for idx in group:
+                    self.cage_of[idx] = cage
+                    if not board.cells[idx]:
+                        hidden.extend(self.rowstart[idx * size + number - 1] for number in range(1, size + 1)
+                                        if not feasible >> (number - 1) & 1)
+        for node in hidden:
+            self.hide(node)
+        for node in givens:
+            self.select(node)
+        self.search()
+        for node in reversed(givens):
+            self.deselect(node)
+        for node in reversed(hidden):
+            self.unhide(node)
+        return self.found
+
+    def hide(self, node):
+        # удаление варианта из столбцов матрицы без включения в решение
+        U, D, C, S = self.U, self.D, self.C, self.S
+        j = node
+        while True:
+            U[D[j]] = U[j]
+            D[U[j]] = D[j]
+            S[C[j]] -= 1
+            j = self.R[j]
+            if j == node:
+                break
+
+    def unhide(self, node):
+        U, D, C, S = self.U, self.D, self.C, self.S
+        j = self.L[node]
+        while True:
+            S[C[j]] += 1
+            U[D[j]] = j
+            D[U[j]] = j
+            if j == node:
+                break
+            j = self.L[j]
+
+    def cage_fits(self, rest, left):
+        # недостающую сумму rest можно набрать различными значениями в left пустых ячейках клетки
+        # (суммы наборов различных значений заполняют весь промежуток от наименьшей до наибольшей)
+        return left * (left + 1) // 2 <= rest <= left * (2 * self.size - left + 1) // 2
+
+    def search(self, depth = 0): #рекурсивная функция поиска точного покрытия
+        self.counter += 1
+        R, D, S = self.R, self.D, self.S
+        tracer = self.tracer
+        if tracer:
+            tracer.node(depth)
+            started = perf_counter_ns()
+        c = R[0]
+        if c == 0:
+            # все ограничения покрыты - найдено решение
+            if tracer:
+                tracer.solution(depth)
+            self.found += 1
+            if self.solution is None:
+                self.solution = list(self.givens)
+                for row in self.rows:
+                    self.solution[row // self.size] = row % self.size + 1
+            return self.found >= self.limit
+        # столбец с наименьшим числом вариантов
+        best, size = c, S[c]
+        while c and size > 1:
+            if S[c] < size:
+                best, size = c, S[c]
+            c = R[c]
+        if tracer:
+            tracer.timing('choice', perf_counter_ns() - started)
+        if size == 0:
+            if tracer:
+                tracer.contradiction(depth)
+            return False
+        self.cover(best)
+        node = D[best]
+        if tracer:
+            options = (self.rowof[node] for node in self.column_nodes(best))
+            tracer.branch_column(depth, best - 1, [(row // self.size, row % self.size + 1) for row in options])
+        done = False
+        cage_of = self.cage_of
+        while node != best:
+            row = self.rowof[node]
+            cage = cage_of[row // self.size] if cage_of else None
+            if cage:
+                # отсечение по сумме клетки: [недостающая сумма, пустых ячеек]
+                number = row % self.size + 1
+                if not self.cage_fits(cage[0] - number, cage[1] - 1):
+                    node = D[node]
+                    continue
+                cage[0] -= number
+                cage[1] -= 1
+            if tracer:
+                tracer.try_value(depth, row // self.size, row % self.size + 1)
+            self.rows.append(row)
+            j = R[node]
+            while j != node:
+                self.cover(self.C[j])
+                j = R[j]
+            done = self.search(depth + 1) # достигнут предел числа решений
+            j = self.L[node]
+            while j != node:
+                self.uncover(self.C[j])
+                j = self.L[j]
+            if cage:
+                cage[0] += number
+                cage[1] += 1
+            if done:
+                break
+            if tracer:
+                tracer.backtrack(depth, row // self.size, row % self.size + 1)
+            self.rows.pop()
+            node = D[node]
+        self.uncover(best)
+        return done
+
+# доступные методы решения
+SOLVERS = {'graph': GraphSolver, 'logic': LogicSolver, 'dlx': DLXSolver}
+DEFAULT_SOLVER = 'graph'
+
+class Sudoku():
+    #значения
+    BASESET = {'1', '2', '3', '4', '5', '6', '7', '8', '9'}
+    PUSTO = '0'
+
+    def __init__(self, method = DEFAULT_SOLVER, cache = None, n = 3):
+        # n - размер квадрата: 3 - поле 9x9, 4 - 16x16, 5 - 25x25
+        self.set_size(n)
+        self.counter = 0
+        self.method = method
+        self.solvers = {} # созданные решатели по методам
+        self.cache = cache # кэш решений (sudoku_cache.SolutionCache) или None
+
+    def set_size(self, n):
+        # пустая таблица со стороной n * n и набор значений для неё
+        self.n = n
+        self.size = n * n
+        self.baseset = set(SYMBOLS[1:self.size + 1])
+        self.table = list(list(Excel(Sudoku.PUSTO) for i in range(self.size)) for l in range(self.size))
+        self.variant = '' # дополнительные ограничения (parse_variant)
+        self.board_class = Board.of_size(n) # класс поля решателя с этими ограничениями
+
+    def set_variant(self, spec):
+        # дополнительные ограничения для поля текущего размера, при ошибке в описании - сообщение
+        try:
+            self.board_class = Board.variant(spec, self.n)
+        except ValueError as error:
+            return f"Неверное описание ограничений: {error}!"
+        self.variant = self.board_class.VARIANT
+
+    @staticmethod
+    def box_size(table):
+        # размер квадрата для таблицы
+        return round(len(table) ** 0.5)
+
+    @staticmethod
+    def list_wo_repeats(a):
+        # проверка отсутствия повторений в списке
+        b = set(a)
+        if len(a) != len(b):
+            return False
+        else:
+            return True
+
+    @staticmethod
+    def getrowlist(table, i): 
+        #получение списка значений в строке
+        return [table[i][j].number for j in range(len(table)) if table[i][j].number != Sudoku.PUSTO]
+
+    @staticmethod
+    def getcolumnlist(table, j):
+        #получение списка значений в столбце
+        return [table[i][j].number for i in range(len(table)) if table[i][j].number != Sudoku.PUSTO]
+
+    @staticmethod
+    def getsquarelist(table, row, column):
+        #получение списка значений в подквадрате n x n, где row и column от 0 до n-1
+        a=[]
+        size = Sudoku.box_size(table)
+        for n in range(size):
+            for k in range(size):
+                if table[row*size+n][column*size+k].number != Sudoku.PUSTO:
+                    a.append(table[row*size+n][column*size+k].number)
+        return a
+
+    @staticmethod
+    def data_consistency(table, variant = ''): 
+        # проверка согласованности данных, variant - дополнительные ограничения (parse_variant)
+        # проверка по строкам
+        for i in range(len(table)):
+            a = Sudoku.getrowlist(table, i)
+            if  not Sudoku.list_wo_repeats(a):
+                return False
+        # проверка по столбцам
+        for j in range(len(table)):
+            a = Sudoku.getcolumnlist(table, j)
+            if not Sudoku.list_wo_repeats(a):
+                return False
+        # проверка по квадратам
+        for i in range(Sudoku.box_size(table)):
+            for j in range(Sudoku.box_size(table)):
+                a = Sudoku.getsquarelist(table, i, j)
+                if not Sudoku.list_wo_repeats(a):
+                    return False
+        # дополнительные группы и суммы клеток
+        if variant:
+            return Board.from_variant(Sudoku.table_to_line(table), variant) is not None
+        return True
+    
+    @staticmethod
+    def getfreecells(table):
+        # получения списка пустых ячеек в таблице
+        freecells=[]
+        for i in range(len(table)):
+            for j in range(len(table)):
+                if table[i][j].number == Sudoku.PUSTO:
+                    freecells.append((i, j))
+        return freecells
+    
+    def get_solver(self, method = None):
+        # решатель выбранного метода, создается один раз и переиспользуется
+        method = method or self.method
+        if method not in self.solvers:
+            self.solvers[method] = SOLVERS[method]()
+        return self.solvers[method]
+
+    def solve_sudoku(self, table, method = None, board = None):
+        # поиск решения выбранным методом (см. SOLVERS), table не изменяется;
+        # board - готовое поле решателя для table (например, LiveBoard.to_board()), иначе строится по table
+        solver = self.get_solver(method)
+        self.counter = 0
+        if board is None:
+            board = self.board_class.from_table(table)
+        if board is None:
+            return False
+        cache = self.cache if board.__class__ is Board else None # кэш - только для классических полей 9x9
+        if cache is not None:
+            # при попадании в кэш перебора нет, counter остается 0
+            solution = cache.get(board.cells)
+            if solution is not None:
+                if solution == cache.NO_SOLUTION:
+                    return False
+                return Board.from_cells(solution).to_table(table)
+            cells = board.cells[:]
+        solved = solver.solve(board)
+        self.counter = solver.counter
+        if cache is not None:
+            cache.put(cells, board.cells if solved else None)
+        if not solved:
+            return False
+        return board.to_table(table)
+
+    def count_solutions(self, table, limit = 2, method = None, board = None):
+        # число решений задачи, но не больше limit: 0 - нет решения, 1 - единственное
+        solver = self.get_solver(method)
+        self.counter = 0
+        if board is None:
+            board = self.board_class.from_table(table)
+        if board is None:
+            return 0
+        found = solver.count_solutions(board, limit)
+        self.counter = solver.counter
+        return found
+
+    def open(self, filename, number = 0):
+        # размер поля определяется по числу значений в первой строке: 9, 16 или 25,
+        # значения - знаками SYMBOLS или числами; в сообщении об ошибке - номер строки файла;
+        # необязательная строка "variant описание" - дополнительные ограничения (parse_variant);
+        # из архива .sdb читается задача с номером number (от 0)
+        if str(filename).endswith(f".{A_EXT}"):
+            return self.open_archive(filename, number)
+        counter = 0
+        variant = ''
+        try:
+            with open(filename,'r') as f:
+                for line_number, line in enumerate(f, 1):
+                    data = line.split()
+                    if data and data[0] == 'variant':
+                        variant = ''.join(data[1:])
+                        continue
+                    if counter == 0 and len(data) != self.size and len(data) in (n * n for n in SIZES):
+                        self.set_size(round(len(data) ** 0.5))
+                    if len(data) == self.size:
+                        if counter<self.size:
+                            for i in range(self.size):
+                                number = int(data[i]) if data[i].isdigit() else VALUES.get(data[i], -1)
+                                if 0 <= number <= self.size:
+                                    self.table[counter][i]=Excel(SYMBOLS[number], True)
+                                else:
+                                    return f"Неверные значения в строке {line_number}! Исправьте данные!"
+                            counter += 1
+                        else:
+                            return f"Неверное количестов строк (строка {line_number})! Исправьте данные!"
+                    else:
+                        return f"Неверный размер строки {line_number}! Исправьте данные!"
+        except (OSError, UnicodeDecodeError):
+            return "Ошибка чтения файла! Неверный формат или файл не существует!"
+        return self.set_variant(variant)
+
+    def open_archive(self, filename, number = 0):
+        # задача из архива по номеру через индекс, остальные задачи не читаются
+        import sudoku_archive
+        try:
+            with sudoku_archive.PuzzleArchive(filename) as archive:
+                record = archive[number]
+        except (OSError, ValueError):
+            return "Ошибка чтения архива! Неверный формат или файл не существует!"
+        except IndexError:
+            return f"В архиве нет задачи с номером {number + 1}!"
+        self.set_size(archive.n)
+        self.table = Sudoku.table_from_line(record.puzzle)
+        
+    @staticmethod
+    def table_to_line(table):
+        # запись таблицы строкой из 81 (256, 625) знака
+        return ''.join(table[i][j].number for i in range(len(table)) for j in range(len(table)))
+
+    @staticmethod
+    def table_from_line(line):
+        # таблица по строке из 81 (256, 625) знака, заполненные ячейки - исходные значения
+        line = line.replace('.', Sudoku.PUSTO).upper()
+        size = round(len(line) ** 0.5)
+        return list(list(Excel(line[i * size + j], line[i * size + j] != Sudoku.PUSTO) for j in range(size)) for i in range(size))
+
+    def save(self, filename):
+        try:
+            with open(filename,'w') as f:
+                for i in range(self.size):
+                    for j in range(self.size):
+                        f.write(f"{self.table[i][j].number} ")
+                #f.write("test")
+                    f.write("\n")
+                if self.variant:
+                    f.write(f"variant {self.variant}\n")
+        except:
+            return "Ошибка записи файла!"
+
+class SolveWorker():
+    ''' решение в фоновом потоке, чтобы не блокировать интерфейс: один поток обслуживает
+        все запросы по очереди; submit ставит задачу решения, count - подсчета решений, poll возвращает
+        результат последней задачи или None, пока она решается; counter - число узлов текущего поиска;
+        кэш решений создает make_cache() в самом потоке (хранилище dbm нельзя использовать из другого потока),
+        cache - этот кэш или None '''
+    SOLVED = 'solved'
+    NO_SOLUTION = 'no_solution'
+    COUNTED = 'counted'
+    ERROR = 'error'
+    CANCELLED = Stopper.CANCELLED
+    TIMEOUT = Stopper.TIMEOUT
+
+    def __init__(self, make_cache = None):
+        self.make_cache = make_cache
+        self.cache = None
+        self.ready = threading.Event() # кэш создан, поток принимает задачи
+        self.sudoku = Sudoku()
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.cancelled = threading.Event() # флаг прерывания последней задачи, у каждой задачи свой
+        self.number = 0 # номер последней поставленной задачи
+        self.solver = None # решатель текущей задачи
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        self.ready.wait()
+
+    @property
+    def counter(self):
+        solver = self.solver
+        return solver.counter if solver else 0
+
+    def submit(self, table, method = DEFAULT_SOLVER, timeout = None, board = None):
+        # постановка задачи: копия table решается методом method не дольше timeout секунд (None - без ограничения);
+        # board - новое поле решателя для table (LiveBoard.to_board()), передается потоку без копирования
+        return self.put(table, method, timeout, board, None)
+
+    def count(self, table, limit = 2, method = DEFAULT_SOLVER, timeout = None, board = None):
+        # постановка задачи подсчета решений table, но не больше limit; в результате poll вместо таблицы - число решений
+        return self.put(table, method, timeout, board, limit)
+
+    def put(self, table, method, timeout, board, limit):
+        # новый флаг прерывания не дает прежней задаче потерять отмену, пришедшую до постановки новой
+        self.number += 1
+        self.cancelled = threading.Event()
+        table = list(list(Excel(cell.number, cell.constant) for cell in row) for row in table)
+        self.jobs.put((self.number, table, method, timeout, board, limit, self.cancelled))
+        return self.number
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def poll(self):
+        # (таблица решения или None, состояние, число узлов, время в милисекундах) или None, пока идет решение;
+        # для задачи count - (число решений или None, COUNTED или состояние прерывания, ...);
+        # при ошибке решателя - (текст ошибки, ERROR, ...), поток продолжает принимать задачи
+        while True:
+            try:
+                number, *result = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if number == self.number: # результаты прежних задач пропускаются
+                return result
+
+    def close(self, timeout = 1):
+        self.cancel()
+        self.jobs.put(None)
+        self.thread.join(timeout)
+
+    def run(self):
+        try:
+            if self.make_cache:
+                self.cache = self.sudoku.cache = self.make_cache()
+        except Exception:
+            self.cache = self.sudoku.cache = None # без кэша решение все равно возможно
+        self.ready.set()
+        try:
+            self.serve()
+        finally:
+            if self.cache is not None:
+                self.cache.close()
+
+    def serve(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            number, table, method, timeout, board, limit, cancelled = job
+            start = perf_counter_ns()
+            solver = None
+            try:
+                solver = self.solver = self.sudoku.get_solver(method)
+                solver.tracer = Stopper(cancelled, start + int(timeout * 1000000000) if timeout else None)
+                if limit:
+                    solution = self.sudoku.count_solutions(table, limit, method, board)
+                    state = SolveWorker.COUNTED
+                else:
+                    solution = self.sudoku.solve_sudoku(table, method, board)
+                    state = SolveWorker.SOLVED if solution else SolveWorker.NO_SOLUTION
+                counter = self.sudoku.counter
+            except Interrupt as interrupt:
+                solution, state, counter = None, interrupt.args[0], solver.counter
+                del self.sudoku.solvers[method] # решатель мог остаться в промежуточном состоянии
+            except Exception as error:
+                solution, state, counter = f"{error.__class__.__name__}: {error}", SolveWorker.ERROR, solver.counter if solver else 0
+                self.sudoku.solvers.pop(method, None)
+            finally:
+                if solver:
+                    solver.tracer = None
+            self.results.put((number, solution, state, counter, (perf_counter_ns() - start) / 1000000))
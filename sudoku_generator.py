@@ -0,0 +1,92 @@
+'''
+Генератор задач судоку с единственным решением.
+Строится случайное заполненное поле, из него в случайном порядке удаляются
+подсказки, пока решение остается единственным (и сложность не выше заданной).
+Сложность оценивается лестницей логических приёмов (sudoku_grader.py):
+easy - хватает однозначных ячеек, medium - нужны пары и пересечения групп,
+hard - нужен перебор.
+'''
+import multiprocessing
+import os
+import random
+import time
+
+from sudoku_core import Board, Sudoku, DEFAULT_SOLVER
+from sudoku_grader import Grader
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+ATTEMPTS = 100 # попыток получить задачу заданной сложности
+CHUNKSIZE = 4
+
+class Generator():
+    ''' генератор задач с единственным решением, seed - для воспроизводимости '''
+
+    def __init__(self, seed = None, method = DEFAULT_SOLVER):
+        self.random = random.Random(seed)
+        self.solver = Sudoku(method).get_solver()
+        self.grader = Grader()
+
+    def full_grid(self):
+        # случайное заполненное поле: квадраты на диагонали независимы, заполняем их перестановками,
+        # дорешиваем и перемешиваем преобразованиями, сохраняющими правила
+        board = Board()
+        for square in Board.UNITS[18::4]:
+            for idx, number in zip(square, self.random.sample(range(1, 10), 9)):
+                board.place(idx, number)
+        self.solver.solve(board)
+        return self.shuffle(board.cells)
+
+    def shuffle(self, cells):
+        # перестановка значений, строк внутри полос, полос и транспонирование
+        digits = [0] + self.random.sample(range(1, 10), 9)
+        def order():
+            bands = self.random.sample(range(3), 3)
+            return [band * 3 + line for band in bands for line in self.random.sample(range(3), 3)]
+        rows, columns = order(), order()
+        if self.random.random() < 0.5:
+            return [digits[cells[columns[j] * 9 + rows[i]]] for i in range(9) for j in range(9)]
+        return [digits[cells[rows[i] * 9 + columns[j]]] for i in range(9) for j in range(9)]
+
+    def difficulty(self, cells):
+        return self.grader.grade(Board.from_cells(cells)).level
+
+    def puzzle(self, difficulty = None, attempts = ATTEMPTS):
+        # задача в виде списка 81 значения и её сложность
+        for _ in range(attempts):
+            cells = self.full_grid()
+            for idx in self.random.sample(range(81), 81):
+                number, cells[idx] = cells[idx], 0
+                if self.solver.count_solutions(Board.from_cells(cells), 2) != 1 \
+                        or (difficulty and DIFFICULTIES.index(self.difficulty(cells)) > DIFFICULTIES.index(difficulty)):
+                    cells[idx] = number
+            level = self.difficulty(cells)
+            if difficulty is None or level == difficulty:
+                break
+        return cells, level
+
+_generator = None # генератор процесса-исполнителя
+
+def init_worker(method):
+    global _generator
+    _generator = Generator(method = method)
+
+def generate_task(task):
+    # (номер, seed, сложность) -> (номер, строка задачи, сложность, время в милисекундах)
+    number, seed, difficulty = task
+    if seed is not None:
+        _generator.random.seed(f"{seed}:{number}")
+    start = time.perf_counter_ns()
+    cells, level = _generator.puzzle(difficulty)
+    end = time.perf_counter_ns()
+    return number, ''.join(map(str, cells)), level, (end - start) / 1000000
+
+def generate_many(count, difficulty = None, jobs = None, seed = None, method = DEFAULT_SOLVER):
+    # генератор задач в порядке номеров, в пуле процессов при jobs > 1
+    jobs = jobs or os.cpu_count() or 1
+    tasks = ((number, seed, difficulty) for number in range(count))
+    if jobs == 1:
+        init_worker(method)
+        yield from map(generate_task, tasks)
+        return
+    with multiprocessing.Pool(jobs, initializer=init_worker, initargs=(method,)) as pool:
+        yield from pool.imap(generate_task, tasks, CHUNKSIZE)
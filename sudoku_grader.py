@@ -0,0 +1,86 @@
+'''
+Оценка сложности задач судоку, не зависящая от эвристики ветвления.
+Задача решается лестницей приёмов: однозначные ячейки, затем каждый раз самый простой
+из сработавших логических приёмов (WEIGHTS); оценка - вес самого трудного понадобившегося приёма.
+Если приёмов не хватает, задача дорешивается перебором с приёмами (LogicSolver),
+к оценке SEARCH добавляется log2 числа узлов перебора.
+Уровни - как у генератора (sudoku_generator.DIFFICULTIES): easy - хватает одиночек,
+medium - нужны пары и пересечения групп, hard - нужен перебор.
+grade_all оценивает задачи пачкой в пуле процессов.
+'''
+import math
+import multiprocessing
+import os
+from collections import namedtuple
+
+from sudoku_core import Board, GraphSolver, LogicSolver, Propagator
+
+# вес приёма: чем больше, тем труднее найти его применение вручную
+WEIGHTS = {'naked_single': 1.0, 'hidden_single': 1.5, 'pointing': 2.6, 'claiming': 2.8, 'naked_pair': 3.0, 'hidden_pair': 3.4}
+SEARCH = 5.0 # оценка задачи, которой не хватает приёмов, без учета числа узлов
+LEVELS = ((2.0, 'easy'), (SEARCH, 'medium'), (math.inf, 'hard')) # (верхняя граница оценки, уровень)
+CHUNKSIZE = 64
+
+Grade = namedtuple('Grade', 'level score technique steps nodes')
+
+class Grader():
+    ''' оценка сложности: grade(board) -> Grade(уровень, оценка, самый трудный приём,
+        число применений приёмов, узлы перебора) или None, если у задачи нет решения; board дорешивается '''
+
+    def __init__(self):
+        self.singles = GraphSolver() # только однозначные ячейки
+        self.propagator = Propagator(sorted(Propagator.TECHNIQUES, key=WEIGHTS.get))
+        self.solver = LogicSolver()
+
+    def grade(self, board):
+        self.propagator.reset()
+        technique = 'naked_single'
+        steps = nodes = 0
+        while True:
+            multivalue_cells = self.singles.propagate(board)
+            if multivalue_cells is None:
+                return None
+            if not multivalue_cells:
+                break
+            progress = self.propagator.apply(board) # самый простой сработавший приём
+            if progress < 0:
+                return None
+            if not progress:
+                # приёмов не хватает - перебор
+                if not self.solver.solve(board):
+                    return None
+                nodes = self.solver.counter
+                break
+            steps += 1
+        for name, count in self.propagator.hits.items():
+            if count and WEIGHTS[name] > WEIGHTS[technique]:
+                technique = name
+        score = SEARCH + math.log2(nodes) if nodes else WEIGHTS[technique]
+        level = next(level for bound, level in LEVELS if score < bound)
+        return Grade(level, round(score, 2), technique, steps, nodes)
+
+    def grade_line(self, line, variant = ''):
+        # оценка задачи в виде строки с ограничениями variant, None - если задача неверна или не имеет решения
+        board = Board.from_variant(line, variant)
+        return self.grade(board) if board is not None else None
+
+_grader = None # оценщик процесса-исполнителя
+
+def init_worker():
+    global _grader
+    _grader = Grader()
+
+def grade_task(task):
+    # (источник, задача, ограничения) -> (источник, задача, ограничения, Grade или None)
+    source, line, variant = task
+    return source, line, variant, _grader.grade_line(line, variant)
+
+def grade_all(tasks, jobs = None, chunksize = CHUNKSIZE):
+    # генератор результатов grade_task в порядке задач, при jobs == 1 - в текущем процессе
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        init_worker()
+        yield from map(grade_task, tasks)
+        return
+    with multiprocessing.Pool(jobs, initializer=init_worker) as pool:
+        yield from pool.imap(grade_task, tasks, chunksize)
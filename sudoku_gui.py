@@ -0,0 +1,654 @@
+'''
+Программа решения классического Судоку.
+Управление:
+перемещение курсора по полю стрелками,
+ввод числа - клавишами от 1 до 9 (на полях 16x16 и 25x25 - ещё буквами A-P),
+стирание - пробел,
+прерывание решения - Esc.
+Решение судоку - поиском заполнения по графу
+с отбором самого частого значения при неоднозначно возможном значении в ячейке
+или алгоритмом X Кнута - см. https://habr.com/ru/articles/462411/
+'''
+VERSION_INFO = "Версия 1.0\n (C)&(P) Ванюков Е.Е.\n\t 2024"
+
+from tkinter import filedialog, messagebox, colorchooser, font, simpledialog
+from tkinter.ttk import Combobox
+from tkinter import *
+import json
+from pathlib import *
+from sudoku_core import *
+from sudoku_generator import Generator
+from sudoku_cache import SolutionCache, CACHE_FILE
+from sudoku_render import render
+
+#Системные параметры
+ICON_NAME = 'sudoku_logo.ico'
+INI_FILE = 'sudoku.ini'
+SOL_EXT = "jpg"
+DEFAULT_NAME = '' #'noname.' + F_EXT
+PROGRAM_NAME = ' Решатель СУДОКУ'
+TIME_LIMIT = 30 # ограничение времени решения по умолчанию, секунд (0 - без ограничения)
+POLL_INTERVAL = 100 # период опроса фонового решения, милисекунд
+
+# Меню
+M_NEW_GAME = 'Игра'
+M_CREATE = 'Новая игра'
+M_CREATE_16 = 'Новая игра 16x16'
+M_CREATE_25 = 'Новая игра 25x25'
+M_GENERATE = 'Сгенерировать'
+M_OPEN = 'Открыть...'
+M_SAVE = 'Сохранить'
+M_SAVE_AS = 'Сохранить как...'
+M_SAVE_SOLUTION = 'Сохранить решение'
+M_QUIT = "Выйти"
+M_SOLVE = "Решить"
+M_SOLVE_GRAPH = "Поиском по графу"
+M_SOLVE_LOGIC = "Логикой и поиском по графу"
+M_SOLVE_DLX = "Алгоритмом X (DLX)"
+M_CHECK_UNIQUE = "Проверить единственность"
+M_CANCEL = "Прервать решение"
+M_TIME_LIMIT = "Ограничение времени..."
+M_OPTIONS = "Настройки"
+M_COLORS = "Цвета"
+M_FONT = "Шрифт"
+M_CANDIDATES = "Показывать кандидатов"
+M_HELP = "Помощь"
+M_ABOUT = 'О программе'
+M_VERSION = "Версия"
+BASE_MENU = {M_NEW_GAME: [M_CREATE, M_CREATE_16, M_CREATE_25, M_GENERATE, M_OPEN, M_SAVE, M_SAVE_AS, M_SAVE_SOLUTION, M_QUIT],
+                M_SOLVE : [M_SOLVE_GRAPH, M_SOLVE_LOGIC, M_SOLVE_DLX, M_CHECK_UNIQUE, M_CANCEL, M_TIME_LIMIT],
+                M_OPTIONS: [M_COLORS, M_FONT, M_CANDIDATES],
+                M_HELP: [M_ABOUT, M_VERSION],
+                }
+# размер квадрата для новой игры
+GAME_SIZES = {M_CREATE: 3, M_CREATE_16: 4, M_CREATE_25: 5}
+# методы решения в меню
+SOLVE_METHODS = {M_SOLVE_GRAPH: 'graph', M_SOLVE_LOGIC: 'logic', M_SOLVE_DLX: 'dlx'}
+# Цвета
+C_EMPTY_CELL = "Поле"
+С_DATA_CELL = "Значение"
+С_CURSOR_CELL = "Курсор"
+C_CONFLICT_CELL = "Повтор"
+
+def RGB(red,green,blue): return '#%02x%02x%02x' % (int(red), int(green) , int(blue))
+
+class ResizingCanvas(Canvas):
+    # Перестройка основного окна при изменении размера
+    def __init__(self,parent,**kwargs):
+        Canvas.__init__(self,parent,**kwargs)
+        self.bind("<Configure>", self.on_resize)
+        self.height = self.winfo_reqheight()
+        self.width = self.winfo_reqwidth()
+        self.parent = parent
+        self.x0 = 0
+        self.y0 = 0
+
+    def on_resize(self,event):
+        # determine the ratio of old width/height to new width/height
+        wscale = float(event.width)/self.width
+        hscale = float(event.height)/self.height
+
+        self.width = event.width 
+        self.height = event.height 
+
+        # resize the canvas 
+        self.config(width=self.width, height=self.height)
+        # rescale all the objects tagged with the "all" tag
+        # self.scale("all",0,0,wscale,hscale)
+        self.set_center()
+        self.parent.place_grid() # элементы поля только перемещаются, без перерисовки
+    
+    def get_center(self):
+        return self.width/2 + self.x0, self.height/2 - self.y0
+    
+    def set_center(self, *args):
+        if args == ():
+            self.x0 = 0
+            self.y0 = 0
+        else:
+            self.x0 = args[0]
+            self.y0 = args[1]
+
+class App(Tk):
+    global parameters
+    menuitem={}
+
+    def __init__(self):
+        super().__init__()
+        self.bind('<KeyPress>', self.key_pressed)
+        self.bind('<Escape>', lambda event: self.cancel_solve())
+        self.configure(bg='blue')
+        self.title( PROGRAM_NAME + " - " + DEFAULT_NAME)
+        if (Path(ICON_NAME).exists()):
+            #print(ICON_NAME)
+            #self.tk.call('wm', 'iconphoto', self._w, PhotoImage(file=ICON_NAME))
+            #self.iconphoto(False, PhotoImage(file = "reactor360.png"))
+            self.iconbitmap(ICON_NAME)
+        else:
+            print("No icon")
+            pass
+        screen_height=int(self.wm_maxsize()[1])  # получаем размер экрана и вычисляем размер окна приложения
+        self.start_position_askdialog="+{}+{}".format(int(screen_height/3), int(screen_height/3))
+        self.geometry('{}x{}+{}+{}'.format(int(screen_height*0.9), int(screen_height*0.9), 0, 0))
+        self.state("zoomed") #- окно на весь экран над панелью задач
+        self.minsize(400, 400)
+        # решение в фоновом потоке, кэш решений с хранилищем dbm открывается и используется только в нем
+        self.worker = SolveWorker(lambda: SolutionCache(filename = CACHE_FILE))
+        self.cache = self.worker.cache
+        self.sudoku = Sudoku()
+        self.polling = None # задание after() опроса фонового решения
+        self.counting = False # опрашивается подсчет решений (uniqueness), а не решение
+        self.time_limit = TIME_LIMIT
+        self.solution_table = None
+        self.scale = screen_height / (self.sudoku.size + 2)
+        self.colors = {C_EMPTY_CELL:"White",
+                        С_DATA_CELL:"Light Sky Blue", #Yellow
+                        С_CURSOR_CELL:"Green",
+                        C_CONFLICT_CELL:"Light Salmon"}
+        self.font_list = [f for f in font.families()]
+        self.font = "Lucida Console" #"Impact" "Lucida Console" "Times New Roman"
+        self.cell_font = font.Font(family = self.font, size = max(int(self.scale/2), 1)) # общий шрифт значений
+        self.pencil_font = font.Font(family = self.font, size = max(int(self.scale/5), 1)) # шрифт кандидатов
+        self.show_candidates = False
+        self.live = LiveBoard() # занятость строк, столбцов и квадратов, обновляется при каждом вводе
+        self.grid_size = None # размер поля, для которого созданы элементы холста (build_grid)
+        self.cell_items = []
+        self.box_items = []
+        self.filename = ''
+        self.status = "  Новая игра"
+        self.cursor_position = [0,0]
+        self.last_dir = Path.cwd()
+        self.menu_ = BASE_MENU
+        self.solve_method = DEFAULT_SOLVER
+        
+        self.screen = ResizingCanvas(self, bg='white')
+        self.statusbar = Label(self, text="  No data", bd=3, relief=SUNKEN, anchor=W, font="Arial 10")
+        self.statusbar.pack(side=BOTTOM, fill=X)
+        self.screen.pack(fill="both", expand=True)
+        self.load_ini()
+        # create menu
+        self.mainmenu = Menu(self, bd=3)
+        
+        for key in self.menu_:
+            App.menuitem[key] = Menu(self.mainmenu, tearoff=0, bd=1)
+            for tag in self.menu_[key]:
+                App.menuitem[key].add_command(label=tag, command=lambda x=tag: self.callback(x)) #https://webdevblog.ru/kak-ispolzovat-v-python-lyambda-funkcii/ - почему lambda надо писать так
+            self.mainmenu.add_cascade(label=key, menu=App.menuitem[key])
+        self.config(menu=self.mainmenu)
+    
+    def reset_data(self, n = 3):
+        self.stop_polling()
+        self.sudoku = Sudoku(n = n)
+        self.live = LiveBoard(n)
+        self.solution_table = None
+        self.cursor_position = [0,0]
+        self.status = "  Новая игра"
+        self.filename = ''
+
+    def update(self):
+        titlename = PROGRAM_NAME + " - " + self.filename
+        self.title(titlename)
+        self.statusbar['text'] = self.status
+        
+    def load_ini(self):
+        try:
+            with open(INI_FILE,'r') as f:
+                self.last_dir = f.readline().rstrip()
+                self.colors.update(json.loads(f.readline())) # в старом ini может не быть новых цветов
+                line = f.readline()
+                if line:
+                    self.time_limit = float(line)
+        except:
+            print("Ошибка чтения ini файла")
+        
+    def save_ini(self):
+        try:
+            with open(INI_FILE,'w') as f:
+                f.write("{}\n".format(self.last_dir))
+                f.write("{}\n".format(json.dumps(self.colors)))
+                f.write("{}".format(self.time_limit))
+        except:
+            pass
+        
+    def key_pressed(self, event):
+        old_position = self.cursor_position.copy()
+        #messagebox.showinfo('Нажато Enter',
+        #                f"Тип события {type(event)} \
+        #                событие {event} \
+        #                время события {event.time} \
+        #                координаты события {event.x_root, event.y_root}")
+        last = self.sudoku.size - 1
+        if event.keycode == 39:  # <Right> key
+            if old_position[0] < last:
+                self.cursor_position[0] += 1
+        if event.keycode == 37:  # <Left> key
+            if old_position[0] > 0:
+                self.cursor_position[0] -= 1
+        if event.keycode == 38:  # <Up> key
+            if old_position[1] > 0:
+                self.cursor_position[1] -= 1
+        if event.keycode == 40:  # <Down> key
+            if old_position[1] < last:
+                self.cursor_position[1] += 1
+        number = None
+        if not self.polling: # пока идет решение, задачу не меняем
+            if event.char.upper() in self.sudoku.baseset: # pressed digits from '1'to '9' or letters
+                number = event.char.upper()
+            if event.keycode == 32: # keycode of space
+                number = Sudoku.PUSTO
+        i, j = self.cursor_position
+        if number is not None and number != self.sudoku.table[i][j].number:
+            self.sudoku.table[i][j].number = number
+            idx = i * self.sudoku.size + j
+            self.live.set(idx, VALUES[number])
+            # конфликты и кандидаты могли измениться только в строке, столбце и квадрате ячейки
+            for peer in self.live.peers(idx):
+                self.draw_cell(*divmod(peer, self.sudoku.size))
+        self.draw_cell(*old_position)
+        self.draw_cell(i, j, cursor=True)
+      
+    def draw_cell(self, i, j, cursor = False):
+        # перекраска ячейки выделенным цветом, если это исходное значение, повтор значения или с цветом курсора;
+        # элементы ячейки уже есть на холсте (build_grid), новые не создаются
+        idx = i * self.sudoku.size + j
+        conflict = self.live.conflict(idx)
+        color = self.colors[C_EMPTY_CELL]
+        if cursor:
+            color = self.colors[С_CURSOR_CELL]
+        elif conflict:
+            color = self.colors[C_CONFLICT_CELL]
+        else:
+            if self.sudoku.table[i][j].number != Sudoku.PUSTO:
+                color = self.colors[С_DATA_CELL]
+        number = ''
+        pencil = ''
+        if self.sudoku.table[i][j].number != Sudoku.PUSTO:
+            number = self.sudoku.table[i][j].number
+        else:
+            if self.solution_table:
+                number = self.solution_table[i][j].number
+            elif self.show_candidates:
+                # кандидаты квадратом n x n, отсутствующие - пробелы
+                n = self.sudoku.n
+                mask = self.live.candidates(idx)
+                pencil = '\n'.join(' '.join(SYMBOLS[v] if mask >> (v - 1) & 1 else ' ' for v in range(r * n + 1, r * n + n + 1))
+                                        for r in range(n))
+        rectangle, text, candidates = self.cell_items[i][j]
+        self.screen.itemconfigure(rectangle, fill = color)
+        self.screen.itemconfigure(text, text = number, fill = 'red' if conflict else 'black')
+        self.screen.itemconfigure(candidates, text = pencil)
+
+    def build_grid(self):
+        # элементы поля создаются один раз для размера поля: рамка, ячейки со значениями
+        # и границы квадратов n x n поверх ячеек; дальше они только перемещаются (place_grid) и перекрашиваются
+        screen = self.screen
+        screen.delete("all")
+        size = self.sudoku.size
+        n = self.sudoku.n
+        self.frame_item = screen.create_rectangle(0, 0, 0, 0, fill = 'white', outline = 'black', width = 5, tags = "frame")
+        self.cell_items = [[(screen.create_rectangle(0, 0, 0, 0, outline = 'black', width = 1, tags = "cell"),
+                                screen.create_text(0, 0, text = '', font = self.cell_font, tags = "value"),
+                                screen.create_text(0, 0, text = '', font = self.pencil_font, fill = 'gray30', tags = "pencil"))
+                                for j in range(size)] for i in range(size)]
+        self.box_items = [(k, screen.create_line(0, 0, 0, 0, width = 3, tags = "box"), screen.create_line(0, 0, 0, 0, width = 3, tags = "box"))
+                                for k in range(n, size, n)]
+        self.grid_size = size
+
+    def place_grid(self):
+        # расстановка элементов поля по масштабу и центру холста; шрифт значений общий,
+        # поэтому размер текста меняется одной настройкой шрифта
+        if self.grid_size != self.sudoku.size:
+            return self.draw_table()
+        self.get_scale()
+        scale = self.scale
+        screen = self.screen
+        x0, y0 = screen.get_center()
+        size = self.sudoku.size
+        left_x = x0 - size/2*scale
+        left_y = y0 - size/2*scale
+        screen.coords(self.frame_item, left_x, left_y, left_x + size*scale, left_y + size*scale)
+        for i in range(size):
+            for j in range(size):
+                rectangle, text, candidates = self.cell_items[i][j]
+                screen.coords(rectangle, left_x + j*scale, left_y + i*scale, left_x + (j+1)*scale, left_y + (i+1)*scale)
+                screen.coords(text, left_x + (j+0.5)*scale, left_y + (i+0.5)*scale)
+                screen.coords(candidates, left_x + (j+0.5)*scale, left_y + (i+0.5)*scale)
+        for k, vertical, horizontal in self.box_items:
+            screen.coords(vertical, left_x + k*scale, left_y, left_x + k*scale, left_y + size*scale)
+            screen.coords(horizontal, left_x, left_y + k*scale, left_x + size*scale, left_y + k*scale)
+        self.cell_font.configure(family = self.font, size = max(int(scale/2), 1))
+        self.pencil_font.configure(family = self.font, size = max(int(scale / (2 * self.sudoku.n + 1)), 1))
+                            
+    def draw_table(self, table = None):
+        if self.grid_size != self.sudoku.size:
+            self.build_grid() # новый размер поля
+        self.place_grid() # размер окна мог измениться
+        for i in range(self.sudoku.size):
+            for j in range(self.sudoku.size):
+                self.draw_cell(i, j)
+        self.draw_cell(*self.cursor_position, cursor=True) # рисуем ячейку с курсором
+    
+    def get_scale(self):
+        self.scale = min(self.screen.width, self.screen.height) / (self.sudoku.size + 2)
+
+    def create(self, n = 3):
+        #messagebox.showinfo(M_CREATE, "Создать новую игру!")
+        self.reset_data(n)
+        self.draw_table()
+    
+    def generate(self):
+        # новая игра со сгенерированной задачей с единственным решением
+        self.reset_data()
+        cells, level = Generator().puzzle()
+        self.sudoku.table = Sudoku.table_from_line(''.join(map(str, cells)))
+        self.live = LiveBoard.from_table(self.sudoku.table)
+        self.status = f"  Сгенерирована задача, сложность {level}"
+        self.draw_table()
+
+    def open_file(self):
+        filename =  filedialog.askopenfilename(initialdir = self.last_dir, title = "Выберите файл",filetypes = (("sudoku files","*.{}".format(F_EXT)),
+                                                        ("sudoku archives","*.{}".format(A_EXT)),("all files","*.*")))
+        
+        if(filename):
+            archive = filename.endswith(".{}".format(A_EXT))
+            number = 1
+            if archive:
+                number = simpledialog.askinteger(M_OPEN, "Номер задачи в архиве:", initialvalue = 1, minvalue = 1, parent = self)
+                if number is None:
+                    return
+            self.reset_data()
+            error_message_opening_file = self.sudoku.open(filename, number - 1)
+            if error_message_opening_file:
+                messagebox.showinfo(M_OPEN, error_message_opening_file)
+                self.reset_data()
+            else:
+                # дополнительные ограничения файла (диагонали, окна, клетки-суммы) учитываются при проверке
+                # ввода и решении, но на поле не рисуются
+                self.live = LiveBoard.from_table(self.sudoku.table, self.sudoku.variant)
+                # задача из архива сохраняется в новый файл .sud, а не в архив
+                self.filename = '' if archive else filename
+                # на больших полях подсчет решений может быть долгим - только по команде меню
+                self.status = "  Задача загружена" + (" с дополнительными ограничениями" if self.sudoku.variant else "")
+                self.last_dir = Path(filename).parent  #https://python-scripts.com/pathlib
+                self.draw_table()
+                if self.sudoku.n == 3:
+                    self.uniqueness(self.status)
+
+    def save(self):
+        #messagebox.showinfo(title = M_SAVE, message = "Cохранение!") 
+        if self.filename:
+            error_message_saving_file = self.sudoku.save(self.filename)
+            if error_message_saving_file:
+                messagebox.showinfo(M_SAVE, error_message_saving_file)
+            else:
+                self.status = "  Задача сохранена"
+        else:
+            self.save_as_file()
+
+    def save_as_file(self):
+        filename =  filedialog.asksaveasfilename(initialdir = self.last_dir, title = "Выберите файл",
+                                                        filetypes = (("sudoku files","*.{}".format(F_EXT)),("all files","*.*")))
+        if filename:
+            if ".{}".format(F_EXT) not in filename:
+                filename +=".{}".format(F_EXT)
+            self.last_dir = Path(filename).parent
+            self.filename = filename
+            self.save()
+
+    def save_solution(self):
+        # картинка рисуется по таблице (sudoku_render), а не снимком экрана: окно может быть закрыто другими
+        if not self.filename:
+            self.save_as_file()
+        if not self.filename:
+            return
+        solution_name = self.filename.split(".")[0] + "." + SOL_EXT
+        solution = Sudoku.table_to_line(self.solution_table) if self.solution_table else None
+        try:
+            render(Sudoku.table_to_line(self.sudoku.table), solution, empty_color = self.colors[C_EMPTY_CELL],
+                    data_color = self.colors[С_DATA_CELL], font = self.font).save(solution_name)
+        except (OSError, ValueError):
+            messagebox.showinfo(M_SAVE_SOLUTION, "Ошибка записи файла!")
+            return
+        self.status = f"  Решение сохранено картинкой в формате {SOL_EXT}"
+
+    def quit(self):
+        answer = True
+        #if (self.arrange != None):
+        answer = messagebox.askokcancel("Выйти", "Вы точно хотите закончить работу программы?")
+        if answer:
+            self.save_ini()
+            self.worker.close() # кэш закрывает поток решения
+            self.destroy()
+
+    def solve(self, method = None):
+        # решение запускается в фоновом потоке, результат забирает poll_solve;
+        # идущий подсчет решений (например, после открытия файла) прерывается
+        if self.polling:
+            if not self.counting:
+                return
+            self.stop_polling()
+        if method:
+            self.solve_method = method
+        if not self.live.valid:
+            messagebox.showinfo(title = M_SOLVE, message = "Несогласованные данные! Есть повторения в строках, столбцах или квадратах!")
+            self.status = "  Введены некорректные данные! Повторите ввод..."  
+        else:
+            #self.solution_table = None
+            self.solve_hits = self.cache.hits if self.cache else 0
+            self.worker.submit(self.sudoku.table, self.solve_method, self.time_limit or None, self.live.to_board())
+            self.status = f"  Решение ({SOLVERS[self.solve_method].name})... Esc - прервать"
+            self.polling = self.after(POLL_INTERVAL, self.poll_solve)
+
+    def poll_solve(self):
+        result = self.worker.poll()
+        if result is None:
+            self.status = f"  Решение ({SOLVERS[self.solve_method].name}): {self.worker.counter} итераций... Esc - прервать"
+            self.polling = self.after(POLL_INTERVAL, self.poll_solve)
+            self.update()
+            return
+        self.polling = None
+        solution, state, counter, elapsed = result
+        if state == SolveWorker.SOLVED:
+            self.solution_table = solution
+            self.draw_table()
+            if self.cache and self.cache.hits > self.solve_hits:
+                self.status = f"  Судоку решена (из кэша), затрачено {elapsed} милисекунд"
+            else:
+                self.status = f"  Судоку решена ({SOLVERS[self.solve_method].name}) за {counter} итераций, затрачено {elapsed} милисекунд"
+                propagator = getattr(self.worker.sudoku.get_solver(self.solve_method), 'propagator', None)
+                if propagator:
+                    self.status += "; приёмы: " + ", ".join(f"{name} {count}" for name, count in propagator.hits.items() if count)
+            if self.cache:
+                self.status += f"; кэш: попаданий {self.cache.hits}, промахов {self.cache.misses}"
+        elif state == SolveWorker.NO_SOLUTION:
+            self.status = f"  Судоку не имеет решения, {counter} итераций"
+            messagebox.showerror(title = M_SOLVE, message = "Судоку не имеет решения!!!")
+        elif state == SolveWorker.TIMEOUT:
+            self.status = f"  Решение прервано: превышено ограничение {self.time_limit} с, {counter} итераций"
+        elif state == SolveWorker.ERROR:
+            self.status = f"  Ошибка решения: {solution}"
+            messagebox.showerror(title = M_SOLVE, message = f"Ошибка решения: {solution}")
+        else:
+            self.status = f"  Решение прервано, {counter} итераций"
+        self.update()
+
+    def stop_polling(self):
+        # прерывание фонового решения без вывода результата
+        if self.polling:
+            self.after_cancel(self.polling)
+            self.polling = None
+            self.counting = False
+            self.worker.cancel()
+
+    def cancel_solve(self):
+        # результат прерванного решения выводит poll_solve
+        if self.polling:
+            self.worker.cancel()
+
+    def set_time_limit(self):
+        limit = simpledialog.askfloat(M_TIME_LIMIT, "Ограничение времени решения, секунд (0 - без ограничения):",
+                                        initialvalue = self.time_limit, minvalue = 0, parent = self)
+        if limit is not None:
+            self.time_limit = limit
+            self.status = f"  Ограничение времени решения: {limit} с" if limit else "  Время решения не ограничено"
+
+    def uniqueness(self, prefix, report = False):
+        # подсчет решений в фоновом потоке, пометку о числе решений после prefix выводит poll_unique;
+        # report - показать итог сообщением
+        if self.polling:
+            return
+        if not self.live.valid:
+            self.show_unique(prefix + " (несогласованные данные)", report)
+            return
+        self.worker.count(self.sudoku.table, 2, self.solve_method, self.time_limit or None, self.live.to_board())
+        self.status = prefix + " (подсчет решений... Esc - прервать)"
+        self.counting = True
+        self.polling = self.after(POLL_INTERVAL, self.poll_unique, prefix, report)
+
+    def poll_unique(self, prefix, report):
+        result = self.worker.poll()
+        if result is None:
+            self.polling = self.after(POLL_INTERVAL, self.poll_unique, prefix, report)
+            return
+        self.polling = None
+        self.counting = False
+        found, state, counter, elapsed = result
+        if state == SolveWorker.ERROR:
+            mark = f" (ошибка подсчета решений: {found})"
+        elif state == SolveWorker.TIMEOUT:
+            mark = f" (подсчет решений прерван: превышено ограничение {self.time_limit} с)"
+        elif state != SolveWorker.COUNTED:
+            mark = " (подсчет решений прерван)"
+        elif found == 0:
+            mark = " (нет решения)"
+        elif found > 1:
+            mark = " (решение не единственное)"
+        else:
+            mark = " (решение единственное)"
+        self.show_unique(prefix + mark, report)
+
+    def show_unique(self, status, report):
+        self.status = status
+        self.update()
+        if report:
+            messagebox.showinfo(title = M_CHECK_UNIQUE, message = status.strip())
+
+    def check_unique(self):
+        self.uniqueness("  Задача", True)
+
+    def choose_colors(self):
+        def get_choice(event):
+            chosen = combo_choice.get()
+            #num = int(tvel_type[len(M_TVEL):])
+            color_tvel.config(bg=self.colors[chosen])
+            
+        def change_color():
+            chosen = combo_choice.get()
+            #num = int(tvel_type[len(M_TVEL):])
+            (rgb, hx) = colorchooser.askcolor(title = "Выберите цвет")
+            # print(rgb) 
+            if rgb != None:
+                self.colors[chosen] = RGB(*rgb)
+            color_tvel.config(bg=self.colors[chosen])
+            self.draw_table()
+        
+        def close(*args):
+            dialog.destroy()
+            #self.draw_arrange()
+
+        colors = list(self.colors.keys())
+
+        dialog = Toplevel(self, bd = 3 ) 
+        dialog.geometry('280x100'+self.start_position_askdialog)
+        dialog.title("Выбрать цвета")
+        dialog.focus_set()
+        if (Path(ICON_NAME).exists()):
+            dialog.iconbitmap(ICON_NAME)
+        dialog.grab_set()
+        dialog.protocol("WM_DELETE_WINDOW", close)
+        dialog.resizable(width = False, height= False)
+        color_tvel=Button(dialog, width = 1, height= 1, bg = self.colors[C_EMPTY_CELL], command = change_color)
+        color_tvel.place(relx=0.8, rely=0.18)
+        Button(dialog, text = "Ок", width= 10, command = close).place(relx=0.35, rely=0.65)
+        combo_choice = Combobox(dialog, values = colors, state = 'readonly')
+        combo_choice.current(0)
+        combo_choice.place(relx=0.1, rely=0.23)
+        combo_choice.bind("<<ComboboxSelected>>", get_choice)
+        dialog.bind("<Escape>", close)
+
+    def set_font(self):
+        def get_choice(event):
+            self.font = combo_choice.get()
+            self.draw_table()
+        
+        def close(*args):
+            dialog.destroy()
+            #self.draw_arrange()
+            
+        dialog = Toplevel(self, bd = 3 ) 
+        dialog.geometry('280x100'+self.start_position_askdialog)
+        dialog.title("Выбрать шрифт")
+        dialog.focus_set()
+        dialog.grab_set()
+        dialog.protocol("WM_DELETE_WINDOW", close)
+        dialog.resizable(width = False, height= False)
+        Button(dialog, text = "Ок", width= 10, command = close).place(relx=0.35, rely=0.65)        # https://question-it.com/questions/2758962/kak-sdelat-dialog-shrifta-v-tkinter
+        combo_choice = Combobox(dialog, values = self.font_list, state = 'readonly')
+        combo_choice.current(self.font_list.index(self.font))
+        combo_choice.place(relx=0.23, rely=0.23)
+        combo_choice.bind("<<ComboboxSelected>>", get_choice)
+        dialog.bind("<Escape>", close)               
+       
+    def show_version(self):
+        messagebox.showinfo(title = PROGRAM_NAME, message = VERSION_INFO)       
+    
+    def show_about(self):
+        messagebox.showinfo(title = PROGRAM_NAME, message = __doc__)       
+   
+    def callback(self, tag):
+        if tag in GAME_SIZES:
+            self.create(GAME_SIZES[tag])
+        if tag == M_GENERATE:
+            self.generate()
+        if tag == M_OPEN:
+            self.open_file()
+        if tag == M_SAVE:
+            self.save()
+        if tag == M_SAVE_AS:
+            self.save_as_file()
+        if tag == M_SAVE_SOLUTION:
+            self.save_solution()
+        if tag == M_QUIT:
+            return self.quit() # return, чтобы после уничтожения окна не вызывался self.update
+        if tag in SOLVE_METHODS:
+            self.solve(SOLVE_METHODS[tag])
+        if tag == M_CHECK_UNIQUE:
+            self.check_unique()
+        if tag == M_CANCEL:
+            self.cancel_solve()
+        if tag == M_TIME_LIMIT:
+            self.set_time_limit()
+        if tag == M_COLORS:
+            self.choose_colors()
+        if tag == M_FONT:
+            self.set_font()
+        if tag == M_CANDIDATES:
+            self.show_candidates = not self.show_candidates
+            App.menuitem[M_OPTIONS].entryconfigure(self.menu_[M_OPTIONS].index(M_CANDIDATES),
+                                                    label = "Скрыть кандидатов" if self.show_candidates else M_CANDIDATES)
+            self.draw_table()
+        if tag == M_VERSION:
+            self.show_version()
+        if tag == M_ABOUT:
+            self.show_about()
+        self.update()
+
+
+def main():
+    app=App()
+    app.protocol('WM_DELETE_WINDOW', app.quit)
+    app.mainloop()
+
+if (__name__ == "__main__"):
+    main()
+
@@ -0,0 +1,71 @@
+'''
+Потоковое чтение и запись задач судоку в формате "одна задача в строке":
+81 знак (256 и 625 для полей 16x16 и 25x25), пустые ячейки - '.' или '0',
+после задачи через пробел или табуляцию могут идти другие поля,
+пустые строки и строки, начинающиеся с '#', пропускаются.
+Файл читается через mmap генератором, поэтому расход памяти не зависит от размера файла;
+неверные строки сообщаются с номером строки и не прерывают чтение.
+'''
+import mmap
+import os
+
+from sudoku_core import SIZES, SYMBOLS
+
+# длина строки задачи -> допустимые знаки
+VALID = {n ** 4: (SYMBOLS[:n * n + 1] + SYMBOLS[10:n * n + 1].lower() + '.').encode('ascii') for n in SIZES}
+SKIP = '' # признак строки без задачи (пустой или комментария)
+
+def parse_line(raw):
+    # задача из строки файла (bytes): строка задачи, SKIP или None, если строка неверная
+    fields = raw.split(None, 1)
+    if not fields or fields[0].startswith(b'#'):
+        return SKIP
+    line = fields[0]
+    valid = VALID.get(len(line))
+    if valid is None or line.translate(None, valid):
+        return None
+    return line.decode('ascii')
+
+def mapped_lines(filename):
+    # генератор (номер строки, строка bytes) по файлу, отображенному в память
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from enumerate(iter(data.readline, b''), 1)
+
+def iter_lines(filename):
+    # генератор (номер строки, задача или None для неверной строки)
+    for number, raw in mapped_lines(filename):
+        line = parse_line(raw)
+        if line != SKIP:
+            yield number, line
+
+def iter_records(filename):
+    # генератор (номер строки, задача или None, остальные поля строки): задачи с пометками, например сложностью
+    for number, raw in mapped_lines(filename):
+        line = parse_line(raw)
+        if line != SKIP:
+            fields = raw.split(None, 1)
+            yield number, line, fields[1].strip().decode('utf-8', 'replace') if len(fields) > 1 else ''
+
+def read_lines(filename, errors):
+    # генератор задач (источник "файл:строка", задача), неверные строки и ошибки чтения пишутся в errors
+    try:
+        for number, line in iter_lines(filename):
+            if line is None:
+                errors.write(f"{filename}:{number}: неверная строка задачи\n")
+            else:
+                yield f"{filename}:{number}", line
+    except OSError:
+        errors.write(f"{filename}: ошибка чтения файла!\n")
+
+def write_lines(filename, lines):
+    # запись строк (задач или записей из полей через табуляцию) по мере поступления, возвращает их число
+    count = 0
+    with open(filename, 'w', buffering=1 << 20) as f:
+        for line in lines:
+            f.write(line if isinstance(line, str) else '\t'.join(map(str, line)))
+            f.write('\n')
+            count += 1
+    return count
@@ -0,0 +1,118 @@
+'''
+Пакетный решатель судоку на NumPy: N задач хранятся массивом (N, 81) uint8
+(0 - пустая ячейка), маски возможных значений, проверка согласованности
+и заполнение однозначных ячеек (naked и hidden singles) выполняются
+для всех задач сразу операциями над массивами.
+Задачи, которые не удалось дорешить логикой, решаются обычным решателем ядра.
+Требует numpy.
+'''
+import numpy as np
+
+from sudoku_core import Board, Sudoku, DEFAULT_SOLVER
+
+# состояния задач после решения
+NO_SOLUTION = -1 # противоречие в данных или решения нет
+UNSOLVED = 0 # заполнение однозначных ячеек остановилось, нужен перебор
+SOLVED = 1 # решена заполнением однозначных ячеек
+SEARCHED = 2 # решена перебором обычным решателем
+
+CHUNK = 65536 # задач в одном проходе, ограничивает размер промежуточных массивов
+
+# номера ячеек 27 групп: 9 строк, 9 столбцов, 9 квадратов 3x3
+UNITS = np.array([[r * 9 + c for c in range(9)] for r in range(9)]
+                    + [[r * 9 + c for r in range(9)] for c in range(9)]
+                    + [[(b // 3) * 27 + (b % 3) * 3 + (k // 3) * 9 + k % 3 for k in range(9)] for b in range(9)],
+                    dtype=np.intp)
+ROW = np.array(Board.ROW, dtype=np.intp)
+COL = np.array(Board.COL, dtype=np.intp) + 9
+BOX = np.array(Board.BOX, dtype=np.intp) + 18
+BITS = np.array([0] + [1 << k for k in range(9)], dtype=np.uint16) # маска значения 0..9
+SHIFTS = np.arange(9, dtype=np.uint16)
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(512)], dtype=np.uint8)
+DIGIT = np.zeros(512, dtype=np.uint8) # значение для маски из одного бита
+DIGIT[BITS[1:]] = np.arange(1, 10)
+TRANSLATE = bytes.maketrans(b'.', b'0')
+
+def from_lines(lines):
+    # массив (N, 81) из строк по 81 символу, пустые ячейки - '.' или '0'
+    data = ''.join(lines).encode('ascii').translate(TRANSLATE)
+    return (np.frombuffer(data, dtype=np.uint8) - ord('0')).reshape(-1, 81)
+
+def to_lines(grids):
+    data = (np.asarray(grids, dtype=np.uint8) + ord('0')).tobytes().decode('ascii')
+    return [data[start:start + 81] for start in range(0, len(data), 81)]
+
+def unit_masks(grids):
+    # маски занятых значений (N, 27) для каждой группы
+    return np.bitwise_or.reduce(BITS[grids][:, UNITS], axis=2)
+
+def candidates(grids):
+    # маски возможных значений (N, 81), у заполненных ячеек - 0
+    used = unit_masks(grids)
+    cand = Board.ALL & ~(used[:, ROW] | used[:, COL] | used[:, BOX])
+    cand[grids > 0] = 0
+    return cand
+
+def data_consistency(grids):
+    # пакетный аналог Sudoku.data_consistency: массив (N,) признаков отсутствия повторений
+    # в группе повторов нет, если сумма масок значений равна их объединению
+    grids = np.asarray(grids)
+    result = np.empty(len(grids), dtype=bool)
+    for start in range(0, len(grids), CHUNK):
+        bits = BITS[grids[start:start + CHUNK]][:, UNITS]
+        result[start:start + CHUNK] = (bits.sum(axis=2, dtype=np.uint16) == np.bitwise_or.reduce(bits, axis=2)).all(axis=1)
+    return result
+
+def propagate(grids, hidden = True):
+    # заполнение однозначных ячеек до неподвижной точки, возвращает (новые поля, состояния)
+    grids = np.array(grids, dtype=np.uint8)
+    state = np.full(len(grids), UNSOLVED, dtype=np.int8)
+    for start in range(0, len(grids), CHUNK):
+        propagate_chunk(grids[start:start + CHUNK], state[start:start + CHUNK], hidden)
+    return grids, state
+
+def propagate_chunk(grids, state, hidden):
+    # заполняет grids и state на месте, на каждом проходе обрабатываются только изменившиеся задачи
+    active = np.arange(len(grids))
+    while active.size:
+        g = grids[active]
+        unit_bits = BITS[g][:, UNITS]
+        used = np.bitwise_or.reduce(unit_bits, axis=2)
+        cand = Board.ALL & ~(used[:, ROW] | used[:, COL] | used[:, BOX])
+        empty = g == 0
+        cand[~empty] = 0
+        ok = ((unit_bits.sum(axis=2, dtype=np.uint16) == used).all(axis=1)
+                & ~(empty & (cand == 0)).any(axis=1))
+        # naked singles: у ячейки одно возможное значение
+        new = np.where(empty & (POPCOUNT[cand] == 1), DIGIT[cand], 0).astype(np.uint8)
+        if hidden:
+            # hidden singles: значение возможно только в одной ячейке группы
+            cand_bits = ((cand[:, :, None] >> SHIFTS) & 1).astype(np.uint8)[:, UNITS, :] # (n, 27, 9 ячеек, 9 значений)
+            counts = cand_bits.sum(axis=2, dtype=np.uint8)
+            placed = (used[:, :, None] >> SHIFTS) & 1
+            ok &= ~((counts == 0) & (placed == 0)).any(axis=(1, 2))
+            n, unit, value = np.nonzero(counts == 1)
+            position = cand_bits[n, unit, :, value].argmax(axis=1)
+            new[n, UNITS[unit, position]] = value + 1
+        new[~ok] = 0
+        state[active[~ok]] = NO_SOLUTION
+        state[active[ok & ~empty.any(axis=1)]] = SOLVED
+        changed = (new > 0).any(axis=1)
+        np.putmask(g, new > 0, new)
+        grids[active] = g
+        active = active[changed]
+
+def solve_batch(grids, method = DEFAULT_SOLVER, hidden = True):
+    # решение пачки задач: возвращает (решения, состояния, число итераций перебора по задачам)
+    solutions, state = propagate(grids, hidden)
+    counters = np.zeros(len(solutions), dtype=np.int64)
+    solver = Sudoku(method).get_solver()
+    for n in np.flatnonzero(state == UNSOLVED):
+        board = Board.from_line(''.join(map(str, solutions[n].tolist())))
+        if board is not None and solver.solve(board):
+            solutions[n] = board.cells
+            state[n] = SEARCHED
+        else:
+            state[n] = NO_SOLUTION
+        counters[n] = solver.counter
+    return solutions, state, counters
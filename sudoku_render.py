@@ -0,0 +1,134 @@
+'''
+Рисование задачи судоку и её решения в картинку средствами PIL, без окна и снимка экрана,
+поэтому работает и без дисплея. Поле выглядит как в интерфейсе (sudoku_gui.py):
+поля шириной в ячейку, рамка, исходные значения на цветном фоне, найденные - на фоне поля,
+границы квадратов n x n. Шрифт ищется по имени семейства, если его нет - шрифт PIL по умолчанию.
+render_all решает и рисует задачи пачкой в пуле процессов.
+'''
+import multiprocessing
+import os
+from functools import lru_cache
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from sudoku_core import Board, SOLVERS, DEFAULT_SOLVER, SYMBOLS
+
+CELL = 48 # сторона ячейки в пикселях
+FONT = "Lucida Console"
+EMPTY_COLOR = "White"
+DATA_COLOR = "Light Sky Blue"
+IMAGE_EXT = "png"
+CHUNKSIZE = 16 # задач в порции для процесса
+
+def save_format(image_ext):
+    # формат PIL для записи файлов с расширением image_ext, None - если PIL не умеет их записывать
+    name = Image.registered_extensions().get(f".{image_ext.lower()}")
+    return name if name in Image.SAVE else None
+
+def get_color(name):
+    # цвет по имени tkinter ("Light Sky Blue") или в виде #rrggbb
+    try:
+        return ImageColor.getrgb(name)
+    except ValueError:
+        return ImageColor.getrgb(name.replace(' ', '').lower())
+
+@lru_cache(maxsize=None)
+def get_font(family, size):
+    # шрифт семейства family размером size пикселей: по имени или файлу .ttf, иначе шрифт по умолчанию
+    for name in (family, f"{family}.ttf", f"{family.replace(' ', '')}.ttf", f"{family.replace(' ', '').lower()}.ttf",
+                    "DejaVuSansMono.ttf", "DejaVuSans.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+    try:
+        return ImageFont.load_default(size)
+    except TypeError: # PIL до 10.1 - шрифт без размера
+        return ImageFont.load_default()
+
+@lru_cache(maxsize=None)
+def get_glyphs(font, cell):
+    # маски значений 1..25 размером в ячейку с текстом по центру: текст рисуется один раз, дальше маска накладывается
+    text_font = get_font(font, max(cell // 2, 1))
+    glyphs = {}
+    for symbol in SYMBOLS[1:]:
+        mask = Image.new('L', (cell, cell), 0)
+        draw = ImageDraw.Draw(mask)
+        left, top, right, bottom = draw.textbbox((0, 0), symbol, font = text_font)
+        draw.text(((cell - right - left) / 2, (cell - bottom - top) / 2), symbol, fill = 255, font = text_font)
+        glyphs[symbol] = mask
+    return glyphs
+
+def draw_borders(draw, size, cell):
+    # границы квадратов n x n и рамка поверх ячеек
+    n = round(size ** 0.5)
+    edge = (size + 1) * cell
+    for k in range(n, size, n):
+        draw.line(((k + 1) * cell, cell, (k + 1) * cell, edge), fill = 'black', width = 3)
+        draw.line((cell, (k + 1) * cell, edge, (k + 1) * cell), fill = 'black', width = 3)
+    draw.rectangle((cell - 2, cell - 2, edge + 2, edge + 2), outline = 'black', width = 5)
+
+@lru_cache(maxsize=16)
+def get_blank(size, cell, empty_color):
+    # пустое поле: ячейки, границы квадратов и рамка
+    image = Image.new('RGB', ((size + 2) * cell, (size + 2) * cell), 'white')
+    draw = ImageDraw.Draw(image)
+    empty = get_color(empty_color)
+    for i in range(size):
+        for j in range(size):
+            x, y = (j + 1) * cell, (i + 1) * cell
+            draw.rectangle((x, y, x + cell, y + cell), fill = empty, outline = 'black', width = 1)
+    draw_borders(draw, size, cell)
+    return image
+
+def render(puzzle, solution = None, cell = CELL, empty_color = EMPTY_COLOR, data_color = DATA_COLOR, font = FONT):
+    # картинка задачи puzzle (строка из 81, 256 или 625 знаков) с решением solution (строка или None)
+    size = round(len(puzzle) ** 0.5)
+    puzzle = puzzle.upper()
+    image = get_blank(size, cell, empty_color).copy()
+    draw = ImageDraw.Draw(image)
+    glyphs = get_glyphs(font, cell)
+    data = get_color(data_color)
+    for i in range(size):
+        for j in range(size):
+            value = puzzle[i * size + j]
+            given = value not in '0.'
+            x, y = (j + 1) * cell, (i + 1) * cell
+            if given:
+                draw.rectangle((x + 1, y + 1, x + cell - 1, y + cell - 1), fill = data)
+            number = value if given else solution[i * size + j].upper() if solution else ''
+            if number in glyphs:
+                image.paste((0, 0, 0), (x, y), glyphs[number])
+    draw_borders(draw, size, cell) # заливка исходных значений могла задеть границы квадратов
+    return image
+
+_solver = None # решатель процесса-исполнителя
+_options = {} # параметры render
+
+def init_worker(method, options):
+    global _solver, _options
+    _solver = SOLVERS[method]()
+    _options = options
+
+def render_task(task):
+    # (источник, задача, ограничения, файл картинки) -> (источник, файл, решена ли задача);
+    # нерешенная рисуется без решения, дополнительные ограничения учитываются при решении, но не рисуются
+    source, line, variant, filename = task
+    board = Board.from_variant(line, variant)
+    solved = board is not None and _solver.solve(board)
+    render(line, board.to_line() if solved else None, **_options).save(filename)
+    return source, filename, bool(solved)
+
+def render_all(tasks, directory, method = DEFAULT_SOLVER, jobs = None, image_ext = IMAGE_EXT, **options):
+    # генератор результатов render_task в порядке задач (источник, задача, ограничения);
+    # файлы - directory/000001.png и т.д.
+    jobs = jobs or os.cpu_count() or 1
+    os.makedirs(directory, exist_ok=True)
+    tasks = ((source, line, variant, os.path.join(directory, f"{number:06d}.{image_ext}"))
+                for number, (source, line, variant) in enumerate(tasks, 1))
+    if jobs == 1:
+        init_worker(method, options)
+        yield from map(render_task, tasks)
+        return
+    with multiprocessing.Pool(jobs, initializer=init_worker, initargs=(method, options)) as pool:
+        yield from pool.imap(render_task, tasks, CHUNKSIZE)
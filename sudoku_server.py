@@ -0,0 +1,287 @@
+'''
+Локальная служба решения судоку по HTTP (только стандартная библиотека), чтобы другие программы
+могли решать задачи без интерфейса tkinter.
+POST /solve, /count, /validate - тело JSON: {"puzzle": "53..7...."} или {"puzzles": ["...", ...]},
+необязательные "method" (см. SOLVERS), "limit" (для count, по умолчанию 2), "timeout" (секунд на весь запрос)
+и "variant" - дополнительные ограничения (sudoku_core.parse_variant, например "diagonal").
+Ответ: {"result": {...}} для одной задачи или {"results": [...]} для списка; у каждого результата
+"status": solved, no_solution, ok (count, validate), invalid (неверная задача) или timeout.
+GET /metrics - число запросов и задач, глубина очереди, размер пачек, перцентили задержки запросов (мс);
+GET /health - проверка работы.
+Задачи одновременных запросов собираются в пачки (не больше BATCH_SIZE задач и не дольше BATCH_WINDOW)
+и решаются в заранее запущенном пуле процессов посылками по PART_SIZE задач; срок запроса передается
+процессам как время time.time(), задачи запроса с истекшим сроком не решаются;
+прерванный по времени решатель процесса создается заново.
+Пример: python sudoku_server.py --port 8765 -j 4
+        curl -d '{"puzzle": "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"}' localhost:8765/solve
+'''
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sudoku_core import Board, Interrupt, Stopper, SOLVERS, DEFAULT_SOLVER, SIZES
+
+HOST = '127.0.0.1'
+PORT = 8765
+BATCH_SIZE = 64 # задач в пачке
+BATCH_WINDOW = 0.002 # секунд ожидания остальных задач пачки после первой
+PART_SIZE = 8 # задач в одной посылке процессу: результаты возвращаются по мере решения, а не после всей пачки
+TIMEOUT = 10.0 # секунд на запрос по умолчанию, срок общий для всех задач запроса
+MAX_PUZZLES = 10000 # задач в одном запросе
+LATENCY_WINDOW = 10000 # запросов для перцентилей задержки
+OPERATIONS = ('solve', 'count', 'validate')
+
+_solvers = {} # решатели процесса-исполнителя по методам
+_never = threading.Event() # отмены нет, только ограничение времени
+_lengths = {n ** 4 for n in SIZES} # допустимые длины строки задачи
+
+def init_worker():
+    # решатели создаются заранее, чтобы первые запросы не ждали построения таблиц (матрица DLX и т.п.)
+    for method in SOLVERS:
+        _solvers[method] = SOLVERS[method]()
+
+def make_board(line, variant):
+    # поле задачи с ограничениями variant (Board.from_variant, с проверкой сумм клеток),
+    # None - если задача или описание ограничений неверны
+    # длина проверяется до построения таблиц поля, чтобы длинная строка не занимала процесс вне срока задачи
+    if not isinstance(line, str) or len(line) not in _lengths:
+        return None
+    return Board.from_variant(line, variant)
+
+def run_task(task):
+    # (операция, задача, метод, limit, ограничения, срок запроса по time.time()) -> результат;
+    # время на задачу - остаток до срока в момент её начала
+    operation, line, method, limit, variant, deadline = task
+    left = deadline - time.time()
+    if left <= 0:
+        return {'status': Stopper.TIMEOUT}
+    board = make_board(line, variant)
+    if operation == 'validate':
+        return {'status': 'ok', 'valid': board is not None}
+    if board is None:
+        return {'status': 'invalid'}
+    solver = _solvers[method]
+    start = time.perf_counter_ns()
+    solver.tracer = Stopper(_never, start + int(left * 1000000000))
+    try:
+        if operation == 'count':
+            found = solver.count_solutions(board, limit)
+            result = {'status': 'ok', 'count': found}
+        elif solver.solve(board):
+            result = {'status': 'solved', 'solution': board.to_line()}
+        else:
+            result = {'status': 'no_solution'}
+    except Interrupt as interrupt:
+        _solvers[method] = SOLVERS[method]() # решатель мог остаться в промежуточном состоянии
+        result = {'status': interrupt.args[0]}
+    finally:
+        solver.tracer = None
+    result['nodes'] = solver.counter
+    result['ms'] = round((time.perf_counter_ns() - start) / 1000000, 3)
+    return result
+
+def run_batch(tasks):
+    return [run_task(task) for task in tasks]
+
+class Request():
+    ''' задачи одного запроса: results заполняются по мере решения пачек, done - когда решены все '''
+
+    def __init__(self, count):
+        self.results = [None] * count
+        self.left = count
+        self.done = threading.Event()
+        if not count:
+            self.done.set()
+
+class SolveService():
+    ''' пул процессов с пачками задач: submit ставит задачи запроса в очередь и ждет результатов,
+        поток batcher собирает пачки и раздает их процессам; metrics - показатели для наблюдения '''
+
+    def __init__(self, jobs = None, batch_size = BATCH_SIZE, batch_window = BATCH_WINDOW):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.pool = multiprocessing.Pool(self.jobs, initializer=init_worker)
+        self.pool.map(run_batch, [[('validate', '', DEFAULT_SOLVER, 1, '', math.inf)]] * self.jobs) # процессы запущены и готовы
+        self.pending = queue.Queue() # (запрос, номер задачи, задача, срок) или None для остановки
+        self.lock = threading.Lock()
+        self.in_flight = 0 # задач, отданных процессам
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counters = {'requests': 0, 'puzzles': 0, 'batches': 0, 'timeouts': 0}
+        self.batcher = threading.Thread(target=self.run, daemon=True)
+        self.batcher.start()
+
+    def submit(self, operation, lines, method = DEFAULT_SOLVER, limit = 2, timeout = TIMEOUT, variant = ''):
+        # результаты задач lines в том же порядке
+        start = time.perf_counter()
+        deadline = time.time() + timeout # общий для процессов пула срок
+        request = Request(len(lines))
+        for number, line in enumerate(lines):
+            self.pending.put((request, number, (operation, line, method, limit, variant), deadline))
+        # процесс сам прерывает поиск по сроку, запас - на очередь и пересылку
+        request.done.wait(timeout + 1 + len(lines) * 0.01)
+        results = [result or {'status': Stopper.TIMEOUT} for result in request.results]
+        with self.lock:
+            self.counters['requests'] += 1
+            self.counters['puzzles'] += len(lines)
+            self.counters['timeouts'] += sum(result['status'] == Stopper.TIMEOUT for result in results)
+            self.latencies.append((time.perf_counter() - start) * 1000)
+        return results
+
+    def run(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            batch = [item]
+            window_end = time.perf_counter() + self.batch_window
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.pending.get(timeout=max(window_end - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.pending.put(None) # остановка после отправки собранной пачки
+                    break
+                batch.append(item)
+            self.dispatch(batch)
+
+    def dispatch(self, batch):
+        # пачка делится на посылки не больше PART_SIZE задач, чтобы процессы были заняты все и результаты
+        # возвращались по мере решения; задачи запросов с истекшим сроком процессам не отправляются
+        now = time.time()
+        expired = [item for item in batch if item[3] <= now]
+        batch = [item for item in batch if item[3] > now]
+        with self.lock:
+            self.counters['batches'] += 1
+            self.in_flight += len(batch) + len(expired)
+        if expired:
+            self.complete(expired, [{'status': Stopper.TIMEOUT}] * len(expired))
+        size = min(PART_SIZE, -(-len(batch) // self.jobs)) or 1
+        for k in range(0, len(batch), size):
+            part = batch[k:k + size]
+            tasks = [task + (deadline,) for _, _, task, deadline in part]
+            self.pool.apply_async(run_batch, (tasks,), callback=lambda results, part=part: self.complete(part, results),
+                                    error_callback=lambda error, part=part: self.complete(part, [{'status': 'error', 'error': str(error)}] * len(part)))
+
+    def complete(self, part, results):
+        with self.lock:
+            self.in_flight -= len(part)
+        for (request, number, _, _), result in zip(part, results):
+            request.results[number] = result
+            with self.lock:
+                request.left -= 1
+                left = request.left
+            if not left:
+                request.done.set()
+
+    def metrics(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            metrics = dict(self.counters)
+            metrics['in_flight'] = self.in_flight
+        metrics['queue_depth'] = self.pending.qsize() + metrics['in_flight']
+        metrics['jobs'] = self.jobs
+        metrics['mean_batch'] = round(metrics['puzzles'] / metrics['batches'], 2) if metrics['batches'] else 0
+        metrics['latency_ms'] = {f"p{p}": round(latencies[min(len(latencies) - 1, len(latencies) * p // 100)], 3)
+                                    for p in (50, 90, 99)} if latencies else {}
+        return metrics
+
+    def close(self):
+        self.pending.put(None)
+        self.batcher.join(1)
+        self.pool.terminate()
+        self.pool.join()
+
+class Handler(BaseHTTPRequestHandler):
+    ''' разбор запросов HTTP, решение - в SolveService сервера (server.service) '''
+    protocol_version = 'HTTP/1.1' # соединения не закрываются после ответа
+    quiet = True
+
+    def send_json(self, code, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self.send_json(200, self.server.service.metrics())
+        elif self.path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        else:
+            self.send_json(404, {'error': f"неизвестный путь {self.path}"})
+
+    def do_POST(self):
+        operation = self.path.strip('/')
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(length) or b'{}')
+            if operation not in OPERATIONS:
+                raise ValueError(f"неизвестная операция {operation}, допустимы: {', '.join(OPERATIONS)}")
+            if not isinstance(data, dict) or ('puzzle' in data) == ('puzzles' in data):
+                raise ValueError("нужно поле puzzle (строка) или puzzles (список строк)")
+            lines = [data['puzzle']] if 'puzzle' in data else data['puzzles']
+            if not isinstance(lines, list) or len(lines) > MAX_PUZZLES:
+                raise ValueError(f"puzzles - список не больше {MAX_PUZZLES} строк")
+            method = data.get('method', DEFAULT_SOLVER)
+            if method not in SOLVERS:
+                raise ValueError(f"неизвестный метод {method}, допустимы: {', '.join(SOLVERS)}")
+            limit = int(data.get('limit', 2))
+            timeout = float(data.get('timeout', TIMEOUT))
+            variant = data.get('variant', '')
+            if not isinstance(variant, str):
+                raise ValueError("variant - строка описания ограничений")
+            if limit < 1 or not 0 < timeout <= 3600:
+                raise ValueError("limit - не меньше 1, timeout - от 0 до 3600 секунд")
+        except (ValueError, TypeError) as error: # json.JSONDecodeError - подкласс ValueError
+            self.send_json(400, {'error': str(error)})
+            return
+        results = self.server.service.submit(operation, lines, method, limit, timeout, variant)
+        self.send_json(200, {'result': results[0]} if 'puzzle' in data else {'results': results})
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+def make_server(host = HOST, port = PORT, jobs = None, batch_size = BATCH_SIZE, batch_window = BATCH_WINDOW):
+    # сервер с запущенным пулом процессов, port = 0 - свободный порт (server.server_address)
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.service = SolveService(jobs, batch_size, batch_window)
+    return server
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog="sudoku_server", description="Локальная служба решения судоку по HTTP")
+    parser.add_argument("--host", default=HOST, help="адрес (по умолчанию - только локальный)")
+    parser.add_argument("--port", type=int, default=PORT, help="порт")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="число процессов (по умолчанию - все ядра)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="задач в пачке")
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW * 1000, help="ожидание задач пачки, мс")
+    parser.add_argument("-v", "--verbose", action="store_true", help="журнал запросов в stderr")
+    args = parser.parse_args(argv)
+    Handler.quiet = not args.verbose
+    server = make_server(args.host, args.port, args.jobs, args.batch_size, args.batch_window / 1000)
+    host, port = server.server_address[:2]
+    sys.stderr.write(f"Служба решения судоку: http://{host}:{port}, процессов {server.service.jobs}\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+    return 0
+
+if (__name__ == "__main__"):
+    sys.exit(main())
@@ -0,0 +1,92 @@
+'''
+Параллельный поиск для одной трудной задачи судоку.
+Верхние уровни дерева ветвлений (ячейка и порядок значений - стратегией ветвления решателя, см. BRANCHINGS)
+раскрываются в независимые подзадачи, которые решаются в пуле процессов.
+При поиске решения оставшиеся процессы останавливаются, как только решена одна подзадача,
+при подсчете решений числа решений подзадач складываются, пока не наберется limit.
+Отчет: число подзадач, глубина разбиения и узлы поиска по процессам.
+'''
+import multiprocessing
+import os
+
+from sudoku_core import Board, GraphSolver, SOLVERS, DEFAULT_SOLVER, SYMBOLS
+
+SPLIT_FACTOR = 4 # подзадач на процесс: мелкие подзадачи выравнивают нагрузку между процессами
+MAX_DEPTH = 6 # наибольшая глубина разбиения
+
+def split(line, count, method = DEFAULT_SOLVER):
+    # подзадачи (строки задачи) в порядке обхода дерева ветвлений: уровни раскрываются,
+    # пока подзадач меньше count; возвращает (подзадачи, глубина, число раскрытых узлов)
+    solver = SOLVERS[method]() if issubclass(SOLVERS[method], GraphSolver) else GraphSolver()
+    level = [line]
+    depth = nodes = 0
+    while len(level) < count and depth < MAX_DEPTH:
+        next_level = []
+        expanded = False
+        for line in level:
+            board = Board.from_line(line)
+            if board is None:
+                continue
+            nodes += 1
+            multivalue_cells = solver.propagate(board)
+            if multivalue_cells is None:
+                continue # противоречие - подзадача отбрасывается
+            if not multivalue_cells:
+                next_level.append(board.to_line()) # решена при раскрытии
+                continue
+            idx, values = solver.branch(board, multivalue_cells)
+            for number in values:
+                mark = len(board.trail)
+                board.place(idx, number)
+                next_level.append(board.to_line())
+                board.undo(mark)
+            expanded = True
+        level = next_level
+        if not expanded:
+            break
+        depth += 1
+    return level, depth, nodes
+
+_solver = None # решатель процесса-исполнителя
+
+def init_worker(method):
+    global _solver
+    _solver = SOLVERS[method]()
+
+def split_task(task):
+    # (номер, строка подзадачи, limit) -> (номер, число решений, решение или None, узлы, процесс)
+    number, line, limit = task
+    board = Board.from_line(line)
+    found = _solver.count_solutions(board, limit) if board is not None else 0
+    solution = ''.join(SYMBOLS[number] for number in _solver.solution) if found else None
+    return number, found, solution, _solver.counter if board is not None else 0, os.getpid()
+
+def solve_split(line, method = DEFAULT_SOLVER, jobs = None, limit = 1, count = None):
+    # решение одной задачи в пуле процессов: (число решений не больше limit, первое найденное решение или None, отчет)
+    jobs = jobs or os.cpu_count() or 1
+    subproblems, depth, nodes = split(line, count or jobs * SPLIT_FACTOR, method)
+    report = {'subproblems': len(subproblems), 'depth': depth, 'split_nodes': nodes, 'workers': {}}
+    tasks = [(number, subproblem, limit) for number, subproblem in enumerate(subproblems)]
+    found, solution = 0, None
+    if jobs == 1:
+        init_worker(method)
+        results = map(split_task, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(jobs, initializer=init_worker, initargs=(method,))
+        results = pool.imap_unordered(split_task, tasks)
+    try:
+        for number, sub_found, sub_solution, counter, pid in results:
+            worker = report['workers'].setdefault(pid, {'tasks': 0, 'nodes': 0})
+            worker['tasks'] += 1
+            worker['nodes'] += counter
+            found += sub_found
+            if solution is None:
+                solution = sub_solution
+            if found >= limit:
+                break
+    finally:
+        if pool is not None:
+            pool.terminate() # остальные подзадачи больше не нужны
+            pool.join()
+    return min(found, limit), solution, report
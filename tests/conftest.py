@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# модули программы лежат в корне репозитория без пакета
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
@@ -0,0 +1,30 @@
+'''
+Общие средства тестов: задачи из наборов benchmarks и проверка решений по правилам поля.
+'''
+from pathlib import Path
+
+from sudoku_core import Board, VALUES
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCHMARKS = ROOT / "benchmarks"
+SETS = ('easy', 'hard', '17clue')
+
+def load(name):
+    # задачи набора benchmarks/name.txt (первое поле строки)
+    lines = (line.split(None, 1) for line in (BENCHMARKS / f"{name}.txt").read_text().splitlines())
+    return [fields[0] for fields in lines if fields and not fields[0].startswith('#')]
+
+def is_solution(puzzle, solution, board_class = None):
+    # solution сохраняет подсказки puzzle и выполняет правила поля board_class (по умолчанию - по размеру)
+    if board_class is None:
+        board_class = Board.of_size(round(len(puzzle) ** 0.25))
+    if len(solution) != board_class.CELLS:
+        return False
+    values = [VALUES[char] for char in solution]
+    if any(VALUES[given] and VALUES[given] != value for given, value in zip(puzzle, values)):
+        return False
+    full = set(range(1, board_class.SIZE + 1))
+    if any({values[idx] for idx in unit} != full for unit in board_class.UNITS):
+        return False
+    return all(sum(values[idx] for idx in cells) == total and len({values[idx] for idx in cells}) == len(cells)
+                for cells, total in board_class.CAGES)
@@ -0,0 +1,106 @@
+import io
+import random
+
+import pytest
+
+from sudoku_archive import ArchiveWriter, PuzzleArchive, Record, convert, pack, unpack, read_records, PACKED
+from sudoku_core import Sudoku, SYMBOLS
+from helpers import BENCHMARKS, load, is_solution
+
+@pytest.mark.parametrize('n', [3, 4, 5])
+def test_pack_round_trip(n):
+    rng = random.Random(n)
+    size = n * n
+    lines = ['0' * n ** 4, SYMBOLS[size] * n ** 4] + [''.join(rng.choice(SYMBOLS[:size + 1]) for _ in range(n ** 4)) for _ in range(20)]
+    for line in lines:
+        data = pack(line, n)
+        assert len(data) == PACKED[n]
+        assert unpack(data, n) == line
+
+def write_archive(path, records, n = 3):
+    with ArchiveWriter(path, n) as writer:
+        for record in records:
+            writer.add(record.puzzle, record.solution, record.meta)
+
+def test_archive_round_trip(tmp_path):
+    records = [Record(line.replace('.', '0'), None, f"задача {k}") for k, line in enumerate(load('easy'))]
+    records[1] = records[1]._replace(solution='1' * 81, meta='')
+    path = tmp_path / "set.sdb"
+    write_archive(path, records)
+    with PuzzleArchive(path) as archive:
+        assert len(archive) == len(records)
+        assert list(archive) == records
+        assert archive[7] == records[7]
+        with pytest.raises(IndexError):
+            archive[len(records)]
+
+def test_long_meta_truncated_on_character(tmp_path):
+    path = tmp_path / "meta.sdb"
+    with ArchiveWriter(path) as writer:
+        writer.add('0' * 81, meta='ж' * 200) # 400 байт UTF-8
+        with pytest.raises(ValueError):
+            writer.add('0' * 256)
+    with PuzzleArchive(path) as archive:
+        assert archive[0].meta == 'ж' * 127
+
+def test_corrupt_archives(tmp_path):
+    path = tmp_path / "set.sdb"
+    write_archive(path, [Record(line, None, 'x') for line in load('hard')])
+    data = path.read_bytes()
+    broken = tmp_path / "broken.sdb"
+    for cut in (0, 10, 40, len(data) - 8, len(data) - 1):
+        broken.write_bytes(data[:cut])
+        with pytest.raises(ValueError):
+            with PuzzleArchive(broken) as archive:
+                list(archive)
+        assert Sudoku().open(broken) == "Ошибка чтения архива! Неверный формат или файл не существует!"
+    rng = random.Random(3)
+    for _ in range(200):
+        damaged = bytearray(data)
+        damaged[rng.randrange(len(data))] = rng.randrange(256)
+        broken.write_bytes(bytes(damaged))
+        try:
+            with PuzzleArchive(broken) as archive:
+                list(archive)
+        except ValueError:
+            pass
+        errors = io.StringIO()
+        list(read_records(broken, errors)) # ошибки только сообщаются
+
+def test_open_from_archive(tmp_path):
+    path = tmp_path / "set.sdb"
+    lines = load('hard')
+    write_archive(path, [Record(line.replace('.', '0'), None, '') for line in lines])
+    sudoku = Sudoku()
+    assert sudoku.open(path, 4) is None
+    assert Sudoku.table_to_line(sudoku.table) == lines[4].replace('.', '0')
+    assert sudoku.open(path, len(lines)) == f"В архиве нет задачи с номером {len(lines) + 1}!"
+
+def test_convert_between_formats(tmp_path):
+    errors = io.StringIO()
+    archive = tmp_path / "hard.sdb"
+    assert convert(read_records(BENCHMARKS / "hard.txt", errors), archive, errors, 'dlx') == len(load('hard'))
+    with PuzzleArchive(archive) as records:
+        for line, record in zip(load('hard'), records):
+            assert record.puzzle == line.replace('.', '0') and is_solution(line, record.solution)
+    directory = tmp_path / "sud"
+    assert convert(read_records(archive, errors), directory, errors) == len(load('hard'))
+    text = tmp_path / "hard.txt"
+    assert convert(read_records(directory, errors), text, errors) == len(load('hard'))
+    assert [record.puzzle for _, record in read_records(text, errors)] == [line.replace('.', '0') for line in load('hard')]
+    assert errors.getvalue() == ''
+
+def test_convert_keeps_variants_only_in_sud(tmp_path):
+    sudoku = Sudoku()
+    sudoku.table = Sudoku.table_from_line('0' * 81)
+    assert sudoku.set_variant('diagonal') is None
+    source = tmp_path / "source"
+    source.mkdir()
+    assert sudoku.save(source / "a.sud") is None
+    errors = io.StringIO()
+    assert convert(read_records(source, errors), tmp_path / "out.sdb", errors) == 0
+    assert "задача пропущена" in errors.getvalue()
+    assert convert(read_records(source, errors), tmp_path / "copy", errors) == 1
+    copy = Sudoku()
+    assert copy.open(tmp_path / "copy" / "000001.sud") is None
+    assert copy.variant == sudoku.variant
@@ -0,0 +1,29 @@
+import json
+
+import sudoku_bench
+from helpers import BENCHMARKS
+
+def test_sets_solved_within_baseline_nodes():
+    # число узлов не зависит от машины, поэтому сравнивается с базой точно
+    results = sudoku_bench.run(['easy', 'hard'], ['graph', 'dlx'], 1)
+    baseline = json.loads((BENCHMARKS / "baseline.json").read_text())['results']
+    for name, methods in results.items():
+        for method, result in methods.items():
+            assert result['solved'] == result['count']
+            assert result['nodes'] <= baseline[name][method]['nodes']
+
+def test_compare_reports_regressions():
+    base = {'count': 2, 'solved': 2, 'total_ms': 10.0, 'nodes': 100}
+    baseline = {'easy': {'graph': base}}
+    assert sudoku_bench.compare({'easy': {'graph': dict(base, total_ms=10.5)}}, baseline, 0.1) == []
+    regressions = sudoku_bench.compare({'easy': {'graph': dict(base, total_ms=20.0, nodes=101, solved=1)}}, baseline, 0.1)
+    assert len(regressions) == 3
+    assert all(regression.startswith("easy/graph") for regression in regressions)
+    assert sudoku_bench.compare({'hard': {'graph': base}}, baseline) == [] # набора нет в базе
+
+def test_report_written(tmp_path):
+    output = tmp_path / "report.json"
+    assert sudoku_bench.main(['solve', '--sets', 'easy', '--methods', 'dlx', '--repeat', '1', '-o', str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report['results']['easy']['dlx']['solved'] == 20
+    assert report['grade']['easy']['count'] == 20
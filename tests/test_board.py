@@ -0,0 +1,50 @@
+from sudoku_core import Board, Sudoku, SOLVERS
+from helpers import load, is_solution
+
+def test_line_round_trip():
+    for line in load('easy') + load('hard'):
+        board = Board.from_line(line)
+        assert board is not None
+        assert board.to_line() == line.replace('.', '0')
+
+def test_conflicting_givens_rejected():
+    line = '11' + '.' * 79
+    assert Board.from_line(line) is None
+    assert Board.from_line('5' + '.' * 8 + '5' + '.' * 71) is None # столбец
+    assert Board.from_line('5' + '.' * 9 + '5' + '.' * 70) is None # квадрат
+
+def test_place_and_undo_restore_masks():
+    board = Board.from_line(load('hard')[0])
+    before = (board.cells[:], board.rows[:], board.columns[:], board.squares[:], board.allowed[:])
+    mark = len(board.trail)
+    idx = board.cells.index(0)
+    number = Board.digits(board.candidates(idx))[0]
+    board.place(idx, number)
+    board.eliminate(idx + 1, board.candidates(idx + 1))
+    assert not board.candidates(idx) & (1 << (number - 1))
+    board.undo(mark)
+    assert (board.cells, board.rows, board.columns, board.squares, board.allowed) == before
+
+def test_candidates_exclude_peers():
+    board = Board.from_line(load('easy')[0])
+    for idx in range(81):
+        if board.cells[idx]:
+            continue
+        used = {board.cells[peer] for peer in Board.PEERS[idx]}
+        assert set(Board.digits(board.candidates(idx))) == set(range(1, 10)) - used
+
+def test_solve_sudoku_keeps_table():
+    line = load('hard')[1]
+    sudoku = Sudoku()
+    table = Sudoku.table_from_line(line)
+    solution = sudoku.solve_sudoku(table, 'graph')
+    assert Sudoku.table_to_line(table) == line.replace('.', '0')
+    assert is_solution(line, Sudoku.table_to_line(solution))
+    assert [[cell.constant for cell in row] for row in solution] == [[cell.constant for cell in row] for row in table]
+
+def test_graph_solver_on_benchmarks():
+    solver = SOLVERS['graph']()
+    for line in load('easy') + load('hard'):
+        board = Board.from_line(line)
+        assert solver.solve(board)
+        assert is_solution(line, board.to_line())
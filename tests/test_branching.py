@@ -0,0 +1,53 @@
+import pytest
+
+import sudoku_cli
+from sudoku_core import Board, Branching, BRANCHINGS, SOLVERS
+from helpers import BENCHMARKS, load, is_solution
+
+def loosened(line):
+    # задача без первой подсказки - несколько сотен решений
+    first = next(idx for idx, value in enumerate(line) if value not in '0.')
+    return line[:first] + '.' + line[first + 1:]
+
+@pytest.mark.parametrize('method', ['graph', 'logic'])
+def test_strategies_agree(method):
+    lines = load('hard') + load('17clue')
+    results = {}
+    for branching in sorted(BRANCHINGS):
+        solver = SOLVERS[method]()
+        solver.set_branching(branching)
+        solutions = []
+        for line in lines:
+            board = Board.from_line(line)
+            assert solver.solve(board)
+            assert is_solution(line, board.to_line())
+            solutions.append(board.to_line())
+        counts = [solver.count_solutions(Board.from_line(loosened(line)), 1000) for line in load('hard')[:1]]
+        results[branching] = solutions, counts
+    assert len({repr(result) for result in results.values()}) == 1
+
+@pytest.mark.parametrize('branching', sorted(BRANCHINGS))
+def test_choice_is_a_candidate_cell(branching):
+    # стратегия выбирает одну из предложенных ячеек и перебирает все её значения
+    strategy = BRANCHINGS[branching]()
+    choices = []
+    class Checked(Branching):
+        def choose(self, board, multivalue_cells):
+            idx, values = strategy.choose(board, multivalue_cells)
+            choices.append((idx, values, dict(multivalue_cells)))
+            return idx, values
+    solver = SOLVERS['graph']()
+    solver.branching = Checked()
+    for line in load('hard'):
+        assert solver.solve(Board.from_line(line))
+    assert choices
+    for idx, values, cells in choices:
+        assert idx in cells and sorted(values) == list(Board.digits(cells[idx]))
+
+def test_cli_branching(tmp_path, capsys):
+    output = tmp_path / "out.txt"
+    assert sudoku_cli.main(['solve', str(BENCHMARKS / "hard.txt"), '-j', '1', '-b', 'lcv', '-o', str(output)]) == 0
+    solutions = [line.split('\t')[1] for line in output.read_text().splitlines()]
+    assert all(is_solution(line, solution) for line, solution in zip(load('hard'), solutions))
+    assert sudoku_cli.main(['solve', str(BENCHMARKS / "hard.txt"), '-m', 'dlx', '-b', 'lcv']) == 2
+    assert "--branching" in capsys.readouterr().err
@@ -0,0 +1,78 @@
+import random
+
+from sudoku_cache import SolutionCache, canonical
+from sudoku_core import Board, SOLVERS
+from helpers import load
+
+def values(line):
+    return [0 if char in '0.' else int(char) for char in line]
+
+def transform(cells, rng):
+    # случайное преобразование из учитываемых кэшем: значения, полосы, стопки, отражения, транспонирование
+    relabel = [0] + rng.sample(range(1, 10), 9)
+    bands, stacks = rng.sample(range(3), 3), rng.sample(range(3), 3)
+    rows = [band * 3 + k for band in bands for k in range(3)]
+    columns = [stack * 3 + k for stack in stacks for k in range(3)]
+    if rng.random() < 0.5:
+        rows.reverse()
+    if rng.random() < 0.5:
+        columns.reverse()
+    grid = [[relabel[cells[row * 9 + column]] for column in columns] for row in rows]
+    if rng.random() < 0.5:
+        grid = [list(row) for row in zip(*grid)]
+    return [value for row in grid for value in row]
+
+def solve(cells):
+    board = Board.from_cells(cells)
+    assert SOLVERS['graph']().solve(board)
+    return board.cells[:]
+
+def test_canonical_form_invariant():
+    rng = random.Random(1)
+    for line in load('hard') + load('17clue'):
+        cells = values(line)
+        key = canonical(cells)[0]
+        for _ in range(5):
+            assert canonical(transform(cells, rng))[0] == key
+
+def test_solution_of_transformed_puzzle():
+    rng = random.Random(2)
+    cache = SolutionCache()
+    for line in load('hard'):
+        cells = values(line)
+        cache.put(cells, solve(cells))
+        other = transform(cells, rng)
+        assert cache.get(other) == solve(other)
+    assert (cache.hits, cache.misses) == (len(load('hard')), 0)
+
+def test_no_solution_and_miss():
+    cache = SolutionCache()
+    cells = values('.' + '12345678' + '9' + '.' * 71)
+    assert cache.get(cells) is None
+    cache.put(cells, None)
+    assert cache.get(cells) == SolutionCache.NO_SOLUTION
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_lru_eviction():
+    cache = SolutionCache(size=2)
+    first, second, third = (values(line) for line in load('hard')[:3])
+    for cells in (first, second):
+        cache.put(cells, solve(cells))
+    assert cache.get(first) is not None # first становится последним использованным
+    cache.put(third, solve(third))
+    assert cache.get(second) is None
+    assert cache.get(first) == solve(first) and cache.get(third) == solve(third)
+
+def test_disk_store_survives_reopen(tmp_path):
+    filename = str(tmp_path / "cache")
+    cache = SolutionCache(size=1, filename=filename)
+    lines = load('hard')[:3]
+    for line in lines:
+        cache.put(values(line), solve(values(line)))
+    cache.close()
+    cache = SolutionCache(size=1, filename=filename)
+    try:
+        for line in lines:
+            assert cache.get(values(line)) == solve(values(line))
+    finally:
+        cache.close()
@@ -0,0 +1,47 @@
+import sudoku_cli
+from sudoku_core import Sudoku
+from helpers import BENCHMARKS, load, is_solution
+
+def read_results(path):
+    return [line.split('\t') for line in path.read_text().splitlines()]
+
+def write_sud(path, line, variant = ''):
+    sudoku = Sudoku(n = round(len(line) ** 0.25))
+    sudoku.table = Sudoku.table_from_line(line)
+    if variant:
+        assert sudoku.set_variant(variant) is None
+    assert sudoku.save(path) is None
+
+def test_solve_file_in_order(tmp_path):
+    output = tmp_path / "out.txt"
+    assert sudoku_cli.main(['solve', str(BENCHMARKS / "easy.txt"), '-j', '1', '-o', str(output)]) == 0
+    results = read_results(output)
+    puzzles = load('easy')
+    assert [source for source, *_ in results] == [f"{BENCHMARKS / 'easy.txt'}:{number}" for number in range(2, len(puzzles) + 2)]
+    for puzzle, (_, solution, *_) in zip(puzzles, results):
+        assert is_solution(puzzle, solution)
+
+def test_pool_matches_single_process(tmp_path):
+    tasks = list(sudoku_cli.read_tasks([BENCHMARKS / "hard.txt"], None))
+    single = [result[:2] for result in sudoku_cli.solve_all(tasks, jobs=1)]
+    pooled = [result[:2] for result in sudoku_cli.solve_all(tasks, jobs=2, chunksize=2)]
+    assert single == pooled
+    assert all(is_solution(line, solution) for (_, line, _), (_, solution) in zip(tasks, pooled))
+
+def test_sud_directory_and_unsolvable(tmp_path, capsys):
+    write_sud(tmp_path / "a.sud", load('hard')[0])
+    write_sud(tmp_path / "b.sud", '.' + '12345678' + '9' + '.' * 71)
+    output = tmp_path / "out.txt"
+    assert sudoku_cli.main(['solve', str(tmp_path), '-j', '1', '-o', str(output)]) == 1
+    (first, solution, *_), (second, missing, *_) = read_results(output)
+    assert first.endswith("a.sud") and is_solution(load('hard')[0], solution)
+    assert second.endswith("b.sud") and missing == sudoku_cli.NO_SOLUTION
+    assert "Решено 1 из 2" in capsys.readouterr().err
+
+def test_bad_lines_reported(tmp_path, capsys):
+    source = tmp_path / "mixed.txt"
+    source.write_text(load('easy')[0] + "\nnot a puzzle\n")
+    output = tmp_path / "out.txt"
+    assert sudoku_cli.main(['solve', str(source), '-j', '1', '-o', str(output)]) == 0
+    assert len(read_results(output)) == 1
+    assert f"{source}:2: неверная строка задачи" in capsys.readouterr().err
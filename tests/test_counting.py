@@ -0,0 +1,63 @@
+import pytest
+
+import sudoku_cli
+from sudoku_core import Board, Sudoku, SOLVERS
+from helpers import BENCHMARKS, load
+
+UNSOLVABLE = '.' + '12345678' + '9' + '.' * 71
+
+def two_solutions():
+    # из решенной задачи убираются четыре ячейки прямоугольника a b / b a - решений становится два
+    board = Board.from_line(load('easy')[0])
+    assert SOLVERS['graph']().solve(board)
+    cells = board.cells
+    for r1 in range(9):
+        for r2 in range(r1 + 1, 9):
+            if r1 // 3 != r2 // 3:
+                continue
+            for c1 in range(9):
+                for c2 in range(c1 + 1, 9):
+                    if c1 // 3 == c2 // 3:
+                        continue
+                    a, b = cells[r1 * 9 + c1], cells[r1 * 9 + c2]
+                    if cells[r2 * 9 + c1] == b and cells[r2 * 9 + c2] == a:
+                        line = list(board.to_line())
+                        for idx in (r1 * 9 + c1, r1 * 9 + c2, r2 * 9 + c1, r2 * 9 + c2):
+                            line[idx] = '.'
+                        return ''.join(line)
+    pytest.skip("в решении нет прямоугольника для двух решений")
+
+@pytest.mark.parametrize('method', sorted(SOLVERS))
+def test_counts(method):
+    solver = SOLVERS[method]()
+    for line in load('hard'):
+        assert solver.count_solutions(Board.from_line(line), 2) == 1
+    assert solver.count_solutions(Board.from_line(UNSOLVABLE), 2) == 0
+    assert solver.count_solutions(Board.from_line(two_solutions()), 5) == 2
+    assert solver.count_solutions(Board.from_line('.' * 81), 7) == 7
+
+@pytest.mark.parametrize('method', sorted(SOLVERS))
+def test_count_leaves_board(method):
+    line = two_solutions()
+    board = Board.from_line(line)
+    SOLVERS[method]().count_solutions(board, 2)
+    assert board.to_line() == line.replace('.', '0')
+
+def test_sudoku_count_solutions():
+    sudoku = Sudoku()
+    assert sudoku.count_solutions(Sudoku.table_from_line(load('hard')[0])) == 1
+    assert sudoku.count_solutions(Sudoku.table_from_line(two_solutions())) == 2
+
+def test_cli_unique_column(tmp_path):
+    source = tmp_path / "tasks.txt"
+    source.write_text(f"{load('hard')[0]}\n{two_solutions()}\n")
+    output = tmp_path / "out.txt"
+    sudoku_cli.main(['solve', str(source), '-j', '1', '-u', '-o', str(output)])
+    assert [line.split('\t')[-1] for line in output.read_text().splitlines()] == ['1', '2']
+
+def test_rejected_options_keep_output(tmp_path):
+    # ошибка в ключах не должна стирать прежний файл результатов
+    output = tmp_path / "out.txt"
+    output.write_text("прежние результаты\n")
+    assert sudoku_cli.main(['solve', str(BENCHMARKS / "easy.txt"), '-u', '--numpy', '-o', str(output)]) == 2
+    assert output.read_text() == "прежние результаты\n"
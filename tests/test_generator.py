@@ -0,0 +1,27 @@
+import pytest
+
+import sudoku_generator
+from sudoku_core import Board, SOLVERS
+from sudoku_grader import Grader
+
+@pytest.mark.parametrize('difficulty', ['easy', 'medium'])
+def test_puzzle_unique_with_target_level(difficulty):
+    generator = sudoku_generator.Generator(seed=7)
+    cells, level = generator.puzzle(difficulty)
+    board = Board.from_cells(cells)
+    assert board is not None
+    assert SOLVERS['dlx']().count_solutions(board, 2) == 1
+    assert level == difficulty == Grader().grade(Board.from_cells(cells)).level
+
+def test_full_grid_is_solution():
+    cells = sudoku_generator.Generator(seed=1).full_grid()
+    assert 0 not in cells
+    assert Board.from_cells(cells) is not None
+
+def test_generate_many_reproducible():
+    first = [line for _, line, _, _ in sudoku_generator.generate_many(3, jobs=1, seed=11)]
+    second = [line for _, line, _, _ in sudoku_generator.generate_many(3, jobs=2, seed=11)]
+    assert first == second
+    assert len(set(first)) == 3
+    for line in first:
+        assert SOLVERS['graph']().count_solutions(Board.from_line(line), 2) == 1
@@ -0,0 +1,47 @@
+import pytest
+
+import sudoku_cli
+from sudoku_archive import PuzzleArchive
+from sudoku_core import Board
+from sudoku_grader import Grader, grade_all, LEVELS
+from helpers import BENCHMARKS, load, is_solution
+
+def test_easy_set_needs_only_singles():
+    grader = Grader()
+    for line in load('easy'):
+        board = Board.from_line(line)
+        grade = grader.grade(board)
+        assert grade.level == 'easy' and grade.nodes == 0
+        assert is_solution(line, board.to_line()) # поле дорешивается
+
+def test_levels_follow_scores():
+    grader = Grader()
+    grades = [grader.grade_line(line) for name in ('hard', '17clue') for line in load(name)]
+    assert 'hard' in {grade.level for grade in grades}
+    for grade in grades:
+        assert grade.level == next(level for bound, level in LEVELS if grade.score < bound)
+        assert (grade.level == 'hard') == (grade.nodes > 0)
+    easy = max(grader.grade_line(line).score for line in load('easy'))
+    assert max(grade.score for grade in grades) > easy
+
+def test_invalid_puzzles():
+    grader = Grader()
+    assert grader.grade_line('.' + '12345678' + '9' + '.' * 71) is None
+    assert grader.grade_line('11' + '.' * 79) is None
+    assert grader.grade_line('1' * 80) is None
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_grade_all_keeps_order(jobs):
+    tasks = [(f"hard:{k}", line, '') for k, line in enumerate(load('hard'))]
+    results = list(grade_all(tasks, jobs, 2))
+    assert [result[:3] for result in results] == tasks
+    grader = Grader()
+    assert [grade for *_, grade in results] == [grader.grade_line(line) for line in load('hard')]
+
+def test_grade_cli_archive(tmp_path):
+    target = tmp_path / "graded.sdb"
+    assert sudoku_cli.main(['grade', str(BENCHMARKS / "easy.txt"), '-j', '1', '-o', str(target)]) == 0
+    with PuzzleArchive(target) as archive:
+        records = list(archive)
+    assert [record.puzzle for record in records] == [line.replace('.', '0') for line in load('easy')]
+    assert all(record.meta.startswith('easy ') for record in records)
@@ -0,0 +1,110 @@
+'''
+Рисование поля без дисплея: методы App вызываются на объекте с холстом, который только записывает элементы.
+'''
+import random
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('tkinter')
+pytest.importorskip('PIL')
+import sudoku_gui
+from sudoku_core import Sudoku, LiveBoard, SYMBOLS
+from helpers import load
+
+class FakeCanvas():
+    ''' холст, который хранит элементы и их параметры '''
+
+    def __init__(self, width = 600, height = 500):
+        self.width, self.height = width, height
+        self.items = {}
+        self.next_id = 0
+
+    def create(self, kind, *coords, **options):
+        self.next_id += 1
+        self.items[self.next_id] = dict(options, kind=kind, coords=coords)
+        return self.next_id
+
+    def create_rectangle(self, *coords, **options):
+        return self.create('rectangle', *coords, **options)
+
+    def create_text(self, *coords, **options):
+        return self.create('text', *coords, **options)
+
+    def create_line(self, *coords, **options):
+        return self.create('line', *coords, **options)
+
+    def delete(self, tag):
+        assert tag == "all"
+        self.items.clear()
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def coords(self, item, *coords):
+        self.items[item]['coords'] = coords
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def get_center(self):
+        return self.width / 2, self.height / 2
+
+def make_app(n = 3):
+    app = sudoku_gui.App.__new__(sudoku_gui.App)
+    app.__dict__.update(screen=FakeCanvas(), polling=None, grid_size=None, cell_items=[], box_items=[], show_candidates=True,
+                        font="Lucida Console", colors={sudoku_gui.C_EMPTY_CELL: "White", sudoku_gui.С_DATA_CELL: "Light Sky Blue",
+                                                        sudoku_gui.С_CURSOR_CELL: "Green", sudoku_gui.C_CONFLICT_CELL: "Light Salmon"},
+                        cell_font=SimpleNamespace(configure=lambda **options: None),
+                        pencil_font=SimpleNamespace(configure=lambda **options: None))
+    app.reset_data(n)
+    return app
+
+def cell_texts(app):
+    return ''.join(app.screen.items[text]['text'] or '0' for row in app.cell_items for _, text, _ in row)
+
+@pytest.mark.parametrize('n', [3, 4, 5])
+def test_items_reused(n):
+    app = make_app(n)
+    app.draw_table()
+    size = n * n
+    count = len(app.screen.find_all())
+    assert count == 1 + 3 * size * size + 2 * (n - 1)
+    rng = random.Random(n)
+    keys = [SimpleNamespace(keycode=keycode, char='') for keycode in (39, 40, 37, 38, 32)]
+    keys += [SimpleNamespace(keycode=0, char=symbol) for symbol in SYMBOLS[1:size + 1]]
+    for k in range(500):
+        app.key_pressed(rng.choice(keys))
+        if k % 10 == 0:
+            app.screen.width, app.screen.height = rng.randrange(300, 900), rng.randrange(300, 900)
+            app.place_grid()
+    assert len(app.screen.find_all()) == count
+    assert cell_texts(app) == Sudoku.table_to_line(app.sudoku.table)
+
+def test_cells_show_table_and_conflicts():
+    app = make_app()
+    line = load('easy')[0].replace('.', '0')
+    app.sudoku.table = Sudoku.table_from_line(line)
+    app.live = LiveBoard.from_table(app.sudoku.table)
+    app.draw_table()
+    assert cell_texts(app) == line
+    empty = line.index('0')
+    number = next(line[peer] for peer in app.live.peers(empty) if line[peer] != '0')
+    app.cursor_position = list(divmod(empty, 9))
+    app.key_pressed(SimpleNamespace(keycode=0, char=number)) # повтор значения в группе ячейки
+    conflicts = [idx for idx in range(81) if app.live.conflict(idx)]
+    assert empty in conflicts
+    for idx in conflicts:
+        _, text, _ = app.cell_items[idx // 9][idx % 9]
+        assert app.screen.items[text]['fill'] == 'red'
+    app.key_pressed(SimpleNamespace(keycode=32, char=' '))
+    assert not any(app.live.conflict(idx) for idx in range(81))
+    assert all(app.screen.items[text]['fill'] == 'black' for row in app.cell_items for _, text, _ in row)
+
+def test_size_change_rebuilds_grid():
+    app = make_app(3)
+    app.draw_table()
+    app.reset_data(4)
+    app.place_grid() # изменение размера окна после смены размера поля
+    assert app.grid_size == 16
+    assert len(app.screen.find_all()) == 1 + 3 * 256 + 2 * 3
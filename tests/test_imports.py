@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+import pytest
+
+from helpers import ROOT
+
+def loaded_modules(statement):
+    # модули, загруженные в чистом процессе после statement
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+@pytest.mark.parametrize('statement', ["import sudoku_core", "import sudoku", "import sudoku_cli",
+                                        "import sudoku; sudoku.Board.from_line('.' * 81)"])
+def test_core_imports_without_gui(statement):
+    modules = loaded_modules(statement)
+    assert 'tkinter' not in modules
+    assert 'PIL' not in modules
+    assert 'sudoku_gui' not in modules
+
+def test_sudoku_reexports_core():
+    import sudoku
+    import sudoku_core
+    assert sudoku.Sudoku is sudoku_core.Sudoku
+    assert sudoku.SOLVERS is sudoku_core.SOLVERS
@@ -0,0 +1,45 @@
+import io
+
+from sudoku_io import iter_records, parse_line, read_lines, write_lines, SKIP
+from helpers import BENCHMARKS, load
+
+def test_parse_line():
+    line = load('hard')[0]
+    assert parse_line(line.encode()) == line
+    assert parse_line(f"{line}\thard 12\n".encode()) == line
+    assert parse_line(b'   \n') == SKIP and parse_line(b'# comment\n') == SKIP
+    assert parse_line(b'12345\n') is None
+    assert parse_line(b'A' + b'0' * 80) is None # знак вне поля 9x9
+    assert parse_line(b'g' + b'0' * 255) == 'g' + '0' * 255
+    assert parse_line(b'q' + b'0' * 624) is None
+
+def test_benchmark_file():
+    errors = io.StringIO()
+    records = list(read_lines(BENCHMARKS / "easy.txt", errors))
+    assert [line for _, line in records] == load('easy')
+    assert errors.getvalue() == ''
+
+def test_bad_lines_numbered(tmp_path):
+    first, second = load('hard')[:2]
+    source = tmp_path / "mixed.txt"
+    source.write_text(f"# задачи\n{first} 1\n\nnot a puzzle\n{second}")
+    errors = io.StringIO()
+    assert list(read_lines(source, errors)) == [(f"{source}:2", first), (f"{source}:5", second)]
+    assert errors.getvalue() == f"{source}:4: неверная строка задачи\n"
+    assert list(iter_records(source)) == [(2, first, '1'), (4, None, 'a puzzle'), (5, second, '')]
+
+def test_empty_and_missing_files(tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_text('')
+    errors = io.StringIO()
+    assert list(read_lines(empty, errors)) == []
+    assert list(read_lines(tmp_path / "missing.txt", errors)) == []
+    assert errors.getvalue() == f"{tmp_path / 'missing.txt'}: ошибка чтения файла!\n"
+
+def test_write_lines_round_trip(tmp_path):
+    target = tmp_path / "out.txt"
+    lines = load('17clue')
+    assert write_lines(target, (line if k % 2 else (line, 'мета', k) for k, line in enumerate(lines))) == len(lines)
+    records = list(iter_records(target))
+    assert [line for _, line, _ in records] == lines
+    assert records[0][2] == 'мета\t0'
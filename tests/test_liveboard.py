@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from sudoku_core import Board, LiveBoard, Sudoku, SOLVERS
+from helpers import load
+
+VARIANTS = ['', 'diagonal', 'windoku', 'diagonal;cages=15@0.1.2,10@40.41,17@79.80']
+
+def expected(live):
+    # конфликты, кандидаты и корректность, посчитанные по всему полю заново
+    board_class, cells = live.board_class, live.cells
+    conflicts = set()
+    bad = False
+    for group in list(board_class.UNITS) + list(board_class.HOUSES):
+        for idx in group:
+            if cells[idx] and sum(cells[other] == cells[idx] for other in group) > 1:
+                conflicts.add(idx)
+    for group, total in board_class.CAGES:
+        values = [cells[idx] for idx in group]
+        if sum(values) > total or (all(values) and sum(values) != total):
+            conflicts.update(idx for idx in group if cells[idx])
+            bad = True
+        for idx in group:
+            if cells[idx] and values.count(cells[idx]) > 1:
+                conflicts.add(idx)
+    # значение самой ячейки тоже занято в её группах
+    candidates = [board_class.ALL & ~sum({1 << (cells[peer] - 1) for peer in board_class.PEERS[idx] + (idx,) if cells[peer]})
+                    for idx in range(board_class.CELLS)]
+    return conflicts, candidates, not conflicts and not bad
+
+@pytest.mark.parametrize('n', [3, 4])
+@pytest.mark.parametrize('variant', VARIANTS)
+def test_incremental_matches_full_recount(n, variant):
+    if n == 4 and 'cages' in variant:
+        variant = 'diagonal;cages=20@0.1.2'
+    rng = random.Random(f"{n}{variant}")
+    live = LiveBoard(n, variant)
+    size = n * n
+    for step in range(1500):
+        live.set(rng.randrange(size * size), rng.choice([0, 0] + list(range(1, size + 1))))
+        if step % 50 == 0:
+            conflicts, candidates, valid = expected(live)
+            assert {idx for idx in range(size * size) if live.conflict(idx)} == conflicts
+            assert [live.candidates(idx) for idx in range(size * size)] == candidates
+            assert live.valid == valid
+
+def test_to_board_matches_line():
+    for line in load('hard'):
+        live = LiveBoard.from_table(Sudoku.table_from_line(line))
+        assert live.valid
+        board, expected_board = live.to_board(), Board.from_line(line)
+        for name in ('cells', 'rows', 'columns', 'squares', 'trail'):
+            assert getattr(board, name) == getattr(expected_board, name)
+        assert SOLVERS['graph']().solve(board) and SOLVERS['graph']().solve(expected_board)
+        assert board.cells == expected_board.cells
+
+def test_conflict_blocks_board():
+    line = load('hard')[0].replace('.', '0')
+    live = LiveBoard.from_table(Sudoku.table_from_line(line))
+    empty = line.index('0')
+    number = next(live.cells[peer] for peer in live.peers(empty) if live.cells[peer])
+    live.set(empty, number)
+    assert not live.valid and live.conflict(empty) and live.to_board() is None
+    live.set(empty, 0)
+    assert live.valid and live.to_board() is not None
+
+def test_cage_sum_conflict():
+    live = LiveBoard(3, 'cages=5@0.1')
+    live.set(0, 1)
+    assert live.valid # клетка ещё не заполнена
+    live.set(1, 3)
+    assert not live.valid and live.conflict(0) and live.conflict(1)
+    live.set(1, 4)
+    assert live.valid
+    board = live.to_board()
+    assert board is not None and SOLVERS['dlx']().solve(board)
+    assert board.cells[0] + board.cells[1] == 5
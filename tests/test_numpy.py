@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from sudoku_core import Board
+from helpers import SETS, load, is_solution
+
+np = pytest.importorskip('numpy')
+sudoku_numpy = pytest.importorskip('sudoku_numpy')
+
+def test_batch_matches_core_solver():
+    lines = [line for name in SETS for line in load(name)]
+    unsolvable = '.' + '12345678' + '9' + '.' * 71
+    solutions, state, _ = sudoku_numpy.solve_batch(sudoku_numpy.from_lines(lines + [unsolvable]))
+    for line, solution, result in zip(lines, sudoku_numpy.to_lines(solutions), state):
+        assert result in (sudoku_numpy.SOLVED, sudoku_numpy.SEARCHED)
+        assert is_solution(line, solution)
+    assert state[-1] == sudoku_numpy.NO_SOLUTION
+
+def test_easy_set_needs_no_search():
+    _, state, counters = sudoku_numpy.solve_batch(sudoku_numpy.from_lines(load('easy')))
+    assert (state == sudoku_numpy.SOLVED).all()
+    assert not counters.any()
+
+def test_consistency_matches_board():
+    # случайные повреждения задач: пакетная проверка совпадает с построением поля ядра
+    rng = random.Random(5)
+    lines = []
+    for line in load('hard') * 20:
+        cells = list(line)
+        cells[rng.randrange(81)] = str(rng.randrange(1, 10))
+        lines.append(''.join(cells))
+    consistent = sudoku_numpy.data_consistency(sudoku_numpy.from_lines(lines))
+    assert list(consistent) == [Board.from_line(line) is not None for line in lines]
+    assert 0 < consistent.sum() < len(lines)
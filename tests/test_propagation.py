@@ -0,0 +1,43 @@
+import pytest
+
+from sudoku_core import Board, GraphSolver, LogicSolver, Propagator
+from helpers import SETS, load, is_solution
+
+def solved(line):
+    board = Board.from_line(line)
+    assert GraphSolver().solve(board)
+    return board.cells
+
+@pytest.mark.parametrize('technique', Propagator.TECHNIQUES)
+def test_technique_never_removes_solution(technique):
+    # приём до неподвижной точки оставляет значение решения среди кандидатов каждой пустой ячейки
+    propagator = Propagator([technique])
+    for line in [line for name in SETS for line in load(name)]:
+        solution = solved(line)
+        board = Board.from_line(line)
+        while propagator.apply(board) > 0:
+            pass
+        for idx, number in enumerate(board.cells):
+            if not number:
+                assert board.candidates(idx) & (1 << (solution[idx] - 1))
+    assert propagator.hits[technique] > 0
+
+@pytest.mark.parametrize('technique', Propagator.TECHNIQUES)
+def test_solver_with_single_technique(technique):
+    solver = GraphSolver()
+    solver.set_techniques([technique])
+    for line in load('hard'):
+        board = Board.from_line(line)
+        assert solver.solve(board)
+        assert is_solution(line, board.to_line())
+
+def test_logic_solver_searches_less():
+    graph, logic = GraphSolver(), LogicSolver()
+    graph_nodes = logic_nodes = 0
+    for line in load('hard'):
+        for solver in (graph, logic):
+            assert solver.solve(Board.from_line(line))
+        graph_nodes += graph.counter
+        logic_nodes += logic.counter
+    assert logic_nodes < graph_nodes
+    assert sum(logic.propagator.hits.values()) > 0
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip('PIL')
+from PIL import Image
+
+import sudoku_cli
+import sudoku_render
+from sudoku_core import Board, SOLVERS
+from helpers import BENCHMARKS, load
+
+def solved(line):
+    board = Board.from_line(line)
+    assert SOLVERS['dlx']().solve(board)
+    return board.to_line()
+
+def dark_pixels(image, i, j, cell):
+    # число темных точек внутри ячейки (i, j), без её границ
+    x, y = (j + 1) * cell, (i + 1) * cell
+    box = image.crop((x + 4, y + 4, x + cell - 4, y + cell - 4)).convert('L')
+    return sum(box.histogram()[:100])
+
+@pytest.mark.parametrize('n', [3, 4])
+def test_image_layout(n):
+    size = n * n
+    line = load('hard')[0] if n == 3 else '1' + '0' * (size ** 2 - 1)
+    cell = 40
+    image = sudoku_render.render(line, solved(line), cell=cell, data_color="#ff0000")
+    assert image.size == ((size + 2) * cell, (size + 2) * cell)
+    given = next(idx for idx, value in enumerate(line) if value not in '0.')
+    empty = next(idx for idx, value in enumerate(line) if value in '0.')
+    i, j = divmod(given, size)
+    assert image.getpixel(((j + 1) * cell + 3, (i + 1) * cell + 3)) == (255, 0, 0)
+    i, j = divmod(empty, size)
+    assert image.getpixel(((j + 1) * cell + 3, (i + 1) * cell + 3)) == (255, 255, 255)
+    assert dark_pixels(image, i, j, cell) > 0 # значение решения
+    assert dark_pixels(sudoku_render.render(line, None, cell=cell), i, j, cell) == 0
+
+def test_save_format():
+    assert sudoku_render.save_format('png') == 'PNG'
+    assert sudoku_render.save_format('JPG') == 'JPEG'
+    assert sudoku_render.save_format('txt') is None
+
+def test_render_cli(tmp_path, capsys):
+    output = tmp_path / "images"
+    assert sudoku_cli.main(['render', str(BENCHMARKS / "hard.txt"), '-o', str(output), '-j', '1', '--cell', '20']) == 0
+    files = sorted(output.iterdir())
+    assert [path.name for path in files] == [f"{number:06d}.png" for number in range(1, len(load('hard')) + 1)]
+    with Image.open(files[0]) as image:
+        assert image.size == (220, 220)
+
+def test_render_cli_bad_format(tmp_path, capsys):
+    output = tmp_path / "images"
+    assert sudoku_cli.main(['render', str(BENCHMARKS / "hard.txt"), '-o', str(output), '--format', 'txt']) == 2
+    assert not output.exists()
+    assert "Формат картинок txt не поддерживается" in capsys.readouterr().err
+
+def test_render_unsolvable(tmp_path, capsys):
+    source = tmp_path / "bad.txt"
+    source.write_text('.' + '12345678' + '9' + '.' * 71 + '\n')
+    output = tmp_path / "images"
+    assert sudoku_cli.main(['render', str(source), '-o', str(output), '-j', '1']) == 1
+    assert (output / "000001.png").exists()
+    assert "нет решения" in capsys.readouterr().err
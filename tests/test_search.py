@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from sudoku_core import Board, SOLVERS, Search
+from helpers import load, is_solution
+
+def direct(method, line, limit):
+    solver, board = SOLVERS[method](), Board.from_line(line)
+    found = solver.count_solutions(board, limit) if limit > 1 else int(solver.solve(board))
+    return found, solver.solution, solver.counter
+
+@pytest.mark.parametrize('method', ['graph', 'logic'])
+@pytest.mark.parametrize('limit', [1, 2])
+def test_resumed_search_matches_direct(method, limit):
+    # поиск порциями узлов с сохранением состояния в json после каждой порции
+    for line in load('hard'):
+        solver = SOLVERS[method]()
+        search = Search(solver, Board.from_line(line), limit)
+        while not search.step(25):
+            search = Search.resume(SOLVERS[method](), json.loads(json.dumps(search.state())))
+        assert (search.found, search.solution, search.counter) == direct(method, line, limit)
+        assert is_solution(line, ''.join(map(str, search.solution)))
+        if limit == 1:
+            assert search.board.to_line() == ''.join(map(str, search.solution))
+        else:
+            assert search.board.to_line() == line.replace('.', '0') # поле откатывается
+
+def test_interleaved_searches():
+    lines = load('hard')[:3]
+    solver = SOLVERS['graph']()
+    searches = [Search(solver, Board.from_line(line)) for line in lines]
+    while not all([search.step(3) for search in searches]):
+        pass
+    for line, search in zip(lines, searches):
+        assert (search.found, search.solution, search.counter) == direct('graph', line, 1)
+
+def test_count_on_empty_grid():
+    search = Search(SOLVERS['graph'](), Board.from_line('0' * 81), 5)
+    while not search.step(7):
+        pass
+    assert search.found == 5
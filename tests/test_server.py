@@ -0,0 +1,90 @@
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+import sudoku_server
+from sudoku_server import SolveService, make_server, run_task
+from helpers import load, is_solution
+
+EMPTY = '0' * 81
+
+@pytest.fixture(scope='module')
+def service():
+    service = SolveService(jobs=2)
+    yield service
+    service.close()
+
+def test_run_task_in_process():
+    sudoku_server.init_worker()
+    line = load('hard')[0]
+    result = run_task(('solve', line, 'dlx', 2, '', time.time() + 10))
+    assert result['status'] == 'solved' and is_solution(line, result['solution'])
+    assert run_task(('solve', line, 'dlx', 2, '', time.time() - 1)) == {'status': 'timeout'}
+    assert run_task(('count', EMPTY, 'graph', 10 ** 9, '', time.time() + 0.1))['status'] == 'timeout'
+    assert run_task(('count', line, 'graph', 2, '', time.time() + 10))['count'] == 1
+
+def test_solve_count_validate(service):
+    lines = load('hard')
+    results = service.submit('solve', lines, 'graph')
+    assert all(result['status'] == 'solved' and is_solution(line, result['solution']) for line, result in zip(lines, results))
+    assert [result['count'] for result in service.submit('count', [lines[0], EMPTY], 'dlx', 5)] == [1, 5]
+    unsolvable = '.' + '12345678' + '9' + '.' * 71
+    assert service.submit('solve', [unsolvable])[0]['status'] == 'no_solution'
+    checks = service.submit('validate', [lines[0], '11' + '0' * 79, '0' * 16, '0' * 10 ** 6, None])
+    assert [check['valid'] for check in checks] == [True, False, False, False, False]
+    assert service.submit('solve', ['0' * 16])[0]['status'] == 'invalid'
+
+def test_variants(service):
+    # сумма клетки 5 уже нарушена подсказками 1 и 2
+    assert service.submit('validate', ['12' + '0' * 79], variant='cages=5@0.1')[0]['valid'] is False
+    assert service.submit('validate', ['14' + '0' * 79], variant='cages=5@0.1')[0]['valid'] is True
+    assert service.submit('validate', [EMPTY], variant='bad')[0]['valid'] is False
+    result = service.submit('solve', [EMPTY], 'dlx', variant='diagonal;cages=5@0.1')[0]
+    solution = [int(char) for char in result['solution']]
+    assert solution[0] + solution[1] == 5
+    assert len({solution[k * 10] for k in range(9)}) == 9 and len({solution[k * 8 + 8] for k in range(9)}) == 9
+
+def test_deadline_covers_whole_request(service):
+    # задачи, которые не решаются за срок: запрос завершается по сроку, остальные задачи не решаются
+    timeout = 0.5
+    start = time.perf_counter()
+    results = service.submit('count', [EMPTY] * 40, 'graph', 10 ** 9, timeout)
+    elapsed = time.perf_counter() - start
+    assert all(result['status'] == 'timeout' for result in results)
+    assert elapsed < timeout + 1
+    start = time.perf_counter()
+    assert service.submit('validate', [EMPTY])[0]['valid']
+    assert time.perf_counter() - start < 0.5 # процессы не заняты задачами прежнего запроса
+    assert service.metrics()['timeouts'] >= 40
+
+def test_http():
+    server = make_server(port=0, jobs=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        def call(method, path, body = None):
+            connection.request(method, path, json.dumps(body) if body is not None else None, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        line = load('hard')[1]
+        status, data = call('POST', '/solve', {'puzzle': line, 'method': 'dlx'})
+        assert status == 200 and is_solution(line, data['result']['solution'])
+        status, data = call('POST', '/count', {'puzzles': [line, EMPTY], 'limit': 3})
+        assert status == 200 and [result['count'] for result in data['results']] == [1, 3]
+        assert call('POST', '/solve', {'puzzle': line, 'method': 'nope'})[0] == 400
+        assert call('POST', '/unknown', {'puzzle': line})[0] == 400
+        assert call('POST', '/solve', {'puzzles': line})[0] == 400
+        assert call('GET', '/health') == (200, {'status': 'ok'})
+        status, metrics = call('GET', '/metrics')
+        assert status == 200 and metrics['requests'] == 2 and metrics['puzzles'] == 3
+        assert call('GET', '/nothing')[0] == 404
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.service.close()
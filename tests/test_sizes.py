@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from sudoku_core import Board, Sudoku, SOLVERS, SYMBOLS
+from helpers import is_solution
+
+def puzzle(n, seed, keep = 0.5):
+    # задача размера n: заполненное поле с перестановкой значений, из которого удалена часть ячеек
+    rng = random.Random(seed)
+    board_class = Board.of_size(n)
+    board = board_class.from_line('0' * board_class.CELLS)
+    assert SOLVERS['graph']().solve(board)
+    relabel = [0] + rng.sample(range(1, board_class.SIZE + 1), board_class.SIZE)
+    return ''.join(SYMBOLS[relabel[value]] if rng.random() < keep else '0' for value in board.cells)
+
+@pytest.mark.parametrize('n', [3, 4, 5])
+def test_geometry(n):
+    board_class = Board.of_size(n)
+    size = n * n
+    assert (board_class.SIZE, board_class.CELLS) == (size, size * size)
+    assert len(board_class.UNITS) == 3 * size and all(len(unit) == size for unit in board_class.UNITS)
+    assert all(len(peers) == 3 * size - 2 * n - 1 for peers in board_class.PEERS)
+    assert Board.of_size(n) is board_class
+
+@pytest.mark.parametrize('n', [4, 5])
+def test_solvers_agree(n):
+    line = puzzle(n, n, 0.6)
+    board_class = Board.of_size(n)
+    assert Board.from_variant(line).__class__ is board_class
+    assert board_class.from_line(line).to_line() == line
+    counts = set()
+    for method in sorted(SOLVERS):
+        board = board_class.from_line(line)
+        assert SOLVERS[method]().solve(board)
+        assert is_solution(line, board.to_line())
+        counts.add(SOLVERS[method]().count_solutions(board_class.from_line(line), 3))
+    assert len(counts) == 1
+
+def test_wrong_size_rejected():
+    assert Board.from_variant('0' * 100) is None
+    assert Board.of_size(4).from_line('1' + '0' * 15 + '1' + '0' * 239) is None # повтор в столбце
+
+def test_sud_round_trip(tmp_path):
+    line = puzzle(4, 1)
+    sudoku = Sudoku(n=4)
+    sudoku.table = Sudoku.table_from_line(line)
+    assert sudoku.save(tmp_path / "big.sud") is None
+    other = Sudoku()
+    assert other.open(tmp_path / "big.sud") is None
+    assert Sudoku.table_to_line(other.table) == line
+    solution = other.solve_sudoku(other.table, 'dlx')
+    assert is_solution(line, Sudoku.table_to_line(solution))
@@ -0,0 +1,39 @@
+import pytest
+
+from sudoku_core import Board, SOLVERS
+from helpers import SETS, load, is_solution
+
+@pytest.mark.parametrize('name', SETS)
+def test_dlx_agrees_with_graph(name):
+    # задачи наборов имеют единственное решение, поэтому решения всех методов совпадают
+    graph, dlx = SOLVERS['graph'](), SOLVERS['dlx']()
+    for line in load(name):
+        expected, board = Board.from_line(line), Board.from_line(line)
+        assert graph.solve(expected)
+        assert dlx.solve(board)
+        assert board.to_line() == expected.to_line()
+        assert is_solution(line, board.to_line())
+
+@pytest.mark.parametrize('method', sorted(SOLVERS))
+def test_no_solution_leaves_board(method):
+    # ячейка 0 согласована с подсказками, но для неё не остается значений
+    line = '.' + '12345678' + '9' + '.' * 71
+    board = Board.from_line(line)
+    assert board is not None
+    assert not SOLVERS[method]().solve(board)
+    assert board.to_line() == line.replace('.', '0')
+
+@pytest.mark.parametrize('method', sorted(SOLVERS))
+def test_solver_reuse(method):
+    # один решатель решает задачи подряд без влияния предыдущих
+    solver = SOLVERS[method]()
+    lines = load('hard')[:3]
+    first = []
+    for line in lines:
+        board = Board.from_line(line)
+        assert solver.solve(board)
+        first.append(board.to_line())
+    for line, solution in zip(reversed(lines), reversed(first)):
+        board = Board.from_line(line)
+        assert solver.solve(board)
+        assert board.to_line() == solution
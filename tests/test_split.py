@@ -0,0 +1,35 @@
+import pytest
+
+from sudoku_core import Board, SOLVERS
+from sudoku_split import solve_split, split
+from helpers import load, is_solution
+
+def loosened(line):
+    # задача набора без первой подсказки - у нее несколько сотен решений
+    first = next(idx for idx, value in enumerate(line) if value not in '0.')
+    return line[:first] + '.' + line[first + 1:]
+
+def count(line, limit):
+    return SOLVERS['dlx']().count_solutions(Board.from_line(line), limit)
+
+def test_subproblems_partition_solutions():
+    line = loosened(load('hard')[0])
+    subproblems, depth, _ = split(line, 16)
+    assert len(subproblems) >= 16 and depth > 0
+    assert sum(count(subproblem, 1000) for subproblem in subproblems) == count(line, 1000)
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_split_matches_direct_solver(jobs):
+    for line in load('hard')[:3]:
+        found, solution, report = solve_split(line, 'dlx', jobs)
+        assert found == 1 and is_solution(line, solution)
+        assert report['subproblems'] > 1
+    line = loosened(load('hard')[0])
+    for limit in (1, 10, 1000):
+        found, solution, _ = solve_split(line, 'graph', jobs, limit)
+        assert found == count(line, limit)
+        assert is_solution(line, solution)
+
+def test_no_solution():
+    found, solution, _ = solve_split('.' + '12345678' + '9' + '.' * 71, 'graph', 1, 2)
+    assert (found, solution) == (0, None)
@@ -0,0 +1,49 @@
+import pytest
+
+from sudoku_core import Board, SOLVERS, EventLog, SolverStats, TracerGroup
+from helpers import load
+
+def trace(method, line):
+    solver = SOLVERS[method]()
+    log, stats = EventLog(), SolverStats()
+    solver.tracer = TracerGroup(log, stats)
+    board = Board.from_line(line)
+    assert solver.solve(board)
+    return solver, log.events, stats
+
+@pytest.mark.parametrize('method', sorted(SOLVERS))
+def test_tried_values_come_from_branch(method):
+    # каждое пробуемое значение - один из вариантов последнего ветвления своей глубины
+    line = load('hard')[0]
+    givens = {idx for idx, value in enumerate(line) if value not in '0.'}
+    _, events, _ = trace(method, line)
+    options = {}
+    for name, depth, data in events:
+        if name == 'branch':
+            if 'column' in data:
+                assert 'cell' not in data
+                options[depth] = {tuple(option) for option in data['options']}
+            else:
+                options[depth] = {(data['cell'], number) for number in data['values']}
+            assert options[depth] and all(idx not in givens and 1 <= number <= 9 for idx, number in options[depth])
+        elif name in ('try', 'backtrack'):
+            assert (data['cell'], data['number']) in options[depth]
+
+@pytest.mark.parametrize('method', sorted(SOLVERS))
+def test_stats_match_events(method):
+    solver, events, stats = trace(method, load('hard')[1])
+    names = [name for name, *_ in events]
+    assert stats.nodes == names.count('node')
+    assert stats.tried == names.count('try')
+    assert stats.backtracks == names.count('backtrack')
+    assert sum(stats.branching.values()) == names.count('branch')
+    assert stats.solutions == names.count('solution') == 1
+    assert stats.as_dict()['tried'] == stats.tried
+
+def test_tracer_does_not_change_search():
+    for method in sorted(SOLVERS):
+        for line in load('hard'):
+            plain, board = SOLVERS[method](), Board.from_line(line)
+            assert plain.solve(board)
+            traced, _, _ = trace(method, line)
+            assert traced.counter == plain.counter
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+import sudoku_cli
+from sudoku_core import Board, Sudoku, SOLVERS
+from helpers import load, is_solution
+
+def solved(line, spec = ''):
+    board = Board.from_variant(line, spec)
+    assert SOLVERS['dlx']().solve(board)
+    return board.to_line()
+
+def killer_spec():
+    # клетки из пар соседних ячеек строк с суммами по решению задачи набора
+    solution = solved(load('hard')[0])
+    cages = [(row * 9 + 2 * k, row * 9 + 2 * k + 1) for row in range(9) for k in range(4)]
+    return 'cages=' + ','.join(f"{int(solution[a]) + int(solution[b])}@{a}.{b}" for a, b in cages), solution
+
+def variant_puzzle(spec, seed, keep):
+    # задача из заполненного поля с ограничениями: остается доля keep ячеек
+    rng = random.Random(seed)
+    solution = killer_spec()[1] if spec.startswith('cages') else solved('0' * 81, spec)
+    return ''.join(value if rng.random() < keep else '0' for value in solution)
+
+SPECS = {'diagonal': 'diagonal', 'windoku': 'windoku', 'killer': killer_spec()[0]}
+
+@pytest.mark.parametrize('name', sorted(SPECS))
+def test_solvers_agree(name):
+    spec = SPECS[name]
+    board_class = Board.variant(spec)
+    for seed in range(3):
+        line = variant_puzzle(spec, seed, 0.3 if 'cages' in spec else 0.4)
+        counts = set()
+        for method in sorted(SOLVERS):
+            board = Board.from_variant(line, spec)
+            assert board.__class__ is board_class
+            assert SOLVERS[method]().solve(board)
+            assert is_solution(line, board.to_line(), board_class)
+            counts.add(SOLVERS[method]().count_solutions(Board.from_variant(line, spec), 3))
+        assert len(counts) == 1
+
+def test_from_variant_checks_cages():
+    assert Board.from_variant('12' + '0' * 79, 'cages=5@0.1') is None
+    assert Board.from_variant('14' + '0' * 79, 'cages=5@0.1') is not None
+    assert Board.from_variant('1' + '0' * 9 + '1' + '0' * 70, 'diagonal') is None
+    assert Board.from_variant('0' * 81, 'cages=5@80.81') is None # ячейка за полем
+    assert Board.from_variant('0' * 81, 'unknown') is None
+    assert Board.from_variant('0' * 80, 'diagonal') is None
+
+def test_data_consistency():
+    table = Sudoku.table_from_line('12' + '0' * 79)
+    assert Sudoku.data_consistency(table)
+    assert not Sudoku.data_consistency(table, 'cages=5@0.1')
+    assert Sudoku.data_consistency(table, 'cages=3@0.1')
+
+def write_sud(path, line, variant):
+    sudoku = Sudoku(n = round(len(line) ** 0.25))
+    sudoku.table = Sudoku.table_from_line(line)
+    assert sudoku.set_variant(variant) is None
+    assert sudoku.save(path) is None
+
+def test_cli_sud_variant_unique(tmp_path):
+    spec = 'diagonal'
+    line = variant_puzzle(spec, 7, 0.6)
+    assert SOLVERS['dlx']().count_solutions(Board.from_variant(line, spec), 2) == 1
+    write_sud(tmp_path / "a.sud", line, spec)
+    output = tmp_path / "out.txt"
+    assert sudoku_cli.main(['solve', str(tmp_path / "a.sud"), '-j', '1', '--unique', '-o', str(output)]) == 0
+    (_, solution, *rest), = [row.split('\t') for row in output.read_text().splitlines()]
+    assert is_solution(line, solution, Board.variant(spec))
+    assert solution == solved(line, spec)
+
+def test_cli_variant_for_other_sizes(tmp_path, capsys):
+    # клетка с ячейкой 100 подходит к полю 16x16, но не к 9x9
+    source = tmp_path / "mixed.txt"
+    small, large = load('hard')[0], '0' * 256
+    source.write_text(f"{small}\n{large}\n")
+    output = tmp_path / "out.txt"
+    assert sudoku_cli.main(['solve', str(source), '-j', '1', '--variant', 'cages=3@100.101', '-o', str(output)]) == 0
+    results = [row.split('\t') for row in output.read_text().splitlines()]
+    assert [source_name for source_name, *_ in results] == [f"{source}:2"]
+    solution = results[0][1]
+    assert is_solution(large, solution, Board.variant('cages=3@100.101', 4))
+    assert f"{source}:1: ограничения не подходят к полю 9x9" in capsys.readouterr().err
+
+def test_cli_validate_variant(tmp_path, capsys):
+    source = tmp_path / "tasks.txt"
+    source.write_text('12' + '0' * 79 + '\n' + '14' + '0' * 79 + '\n')
+    assert sudoku_cli.main(['validate', str(source), '--variant', 'cages=5@0.1']) == 1
+    out = capsys.readouterr().out
+    assert f"{source}:1\t" in out and f"{source}:2\t" not in out
+    assert sudoku_cli.main(['validate', str(source)]) == 0
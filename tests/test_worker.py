@@ -0,0 +1,95 @@
+import threading
+import time
+
+from sudoku_cache import SolutionCache
+from sudoku_core import Sudoku, SolveWorker
+from helpers import load, is_solution
+
+EMPTY = '0' * 81
+
+def wait(worker, timeout = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = worker.poll()
+        if result is not None:
+            return result
+        time.sleep(0.005)
+    raise AssertionError("нет результата от потока")
+
+def table(line):
+    return Sudoku.table_from_line(line)
+
+def test_solve_and_count():
+    worker = SolveWorker()
+    try:
+        line = load('hard')[0]
+        worker.submit(table(line), 'dlx')
+        solution, state, counter, _ = wait(worker)
+        assert state == SolveWorker.SOLVED and counter > 0
+        assert is_solution(line, Sudoku.table_to_line(solution))
+        worker.count(table(line), 2, 'graph')
+        assert wait(worker)[:2] == [1, SolveWorker.COUNTED]
+        worker.submit(table('.' + '12345678' + '9' + '.' * 71))
+        assert wait(worker)[:2] == [False, SolveWorker.NO_SOLUTION]
+    finally:
+        worker.close()
+
+def test_cancel_then_resubmit():
+    # отмена длинного подсчета не должна задеть задачу, поставленную сразу после неё
+    worker = SolveWorker()
+    try:
+        worker.count(table(EMPTY), 10 ** 9)
+        worker.cancel()
+        line = load('hard')[1]
+        worker.submit(table(line))
+        solution, state, *_ = wait(worker)
+        assert state == SolveWorker.SOLVED and is_solution(line, Sudoku.table_to_line(solution))
+        worker.count(table(EMPTY), 10 ** 9, timeout=0.1)
+        assert wait(worker)[1] == SolveWorker.TIMEOUT
+    finally:
+        worker.close()
+
+def test_errors_keep_thread_alive():
+    worker = SolveWorker()
+    try:
+        worker.submit(table(EMPTY), 'no-such-method')
+        message, state, *_ = wait(worker)
+        assert state == SolveWorker.ERROR and message.startswith("KeyError")
+        worker.submit(table(EMPTY), 'graph', board=object())
+        assert wait(worker)[1] == SolveWorker.ERROR
+        line = load('hard')[2]
+        worker.submit(table(line), 'graph')
+        solution, state, *_ = wait(worker)
+        assert state == SolveWorker.SOLVED and is_solution(line, Sudoku.table_to_line(solution))
+        assert worker.thread.is_alive()
+    finally:
+        worker.close()
+
+class ThreadCache(SolutionCache):
+    ''' кэш, который можно использовать только в создавшем его потоке, как dbm '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.thread = threading.current_thread()
+
+    def lookup(self, key):
+        assert threading.current_thread() is self.thread
+        return super().lookup(key)
+
+    def put(self, cells, solution):
+        assert threading.current_thread() is self.thread
+        super().put(cells, solution)
+
+def test_cache_lives_in_worker_thread(tmp_path):
+    worker = SolveWorker(lambda: ThreadCache(filename=str(tmp_path / "cache")))
+    cache = worker.cache
+    assert cache.thread is worker.thread
+    line = load('hard')[3]
+    for _ in range(2):
+        worker.submit(table(line))
+        solution, state, *_ = wait(worker)
+        assert state == SolveWorker.SOLVED and is_solution(line, Sudoku.table_to_line(solution))
+    assert (cache.hits, cache.misses) == (1, 1)
+    worker.close()
+    assert not worker.thread.is_alive()
+    assert cache.store is None # кэш закрыт потоком